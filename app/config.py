@@ -32,12 +32,143 @@ class Settings(BaseSettings):
         default= os.getenv("GOOGLE_SHEET_RANGE_NAMES", "Sheet1!A1:A40"),
         description = "Just the name list, so that we dont have to read 2years of redundent information"
     )
+    google_sheet_auto_tabs: bool = Field(
+        default=os.getenv("GOOGLE_SHEET_AUTO_TABS", "false").lower() == "true",
+        description="Read each date from the tab covering it (e.g. one tab per year) instead of GOOGLE_SHEET_RANGE",
+    )
+    sheet_metadata_ttl: float = Field(
+        default=float(os.getenv("SHEET_METADATA_TTL", "3600")),
+        description="Seconds the tab list and their dates are cached before being read again",
+    )
+    sheet_window_days: int = Field(
+        default=int(os.getenv("SHEET_WINDOW_DAYS", "0")),
+        description="Days around the target date read from a tab (0 reads the whole tab)",
+    )
     
-    # Active staff rows configuration
-    # These are the row numbers (1-indexed) in the Google Sheet for active staff members
-    active_staff_rows: List[int] = Field(
-        default=[6, 7, 9, 10, 11, 12, 13, 15, 17, 18, 20, 21, 22, 23, 24, 25, 26, 27, 28, 30, 31, 35, 36, 37],
-        description="Row numbers (1-indexed) of active staff members in the Google Sheet",
+    google_sheets_api_endpoint: str = Field(
+        default=os.getenv("GOOGLE_SHEETS_API_ENDPOINT", ""),
+        description="Override of the Sheets API endpoint, e.g. a local fake server (no credentials used)",
+    )
+    google_sheets_timeout: float = Field(
+        default=float(os.getenv("GOOGLE_SHEETS_TIMEOUT", "10")),
+        description="Seconds to wait for a Google Sheets fetch before using the local snapshot",
+    )
+    sheet_snapshot_path: str = Field(
+        default=os.getenv("SHEET_SNAPSHOT_PATH", "data/sheet_snapshot.bin"),
+        description="Local file holding the last good Google Sheet snapshot",
+    )
+    di_list_path: str = Field(
+        default=os.getenv("DI_LIST_PATH", "data/di_list.txt"),
+        description="Local file holding the last /DI LIST post, reloaded at startup (empty to disable)",
+    )
+
+    # Deadlines and circuit breakers
+    command_deadline: float = Field(
+        default=float(os.getenv("COMMAND_DEADLINE", "15")),
+        description="Seconds a /draft or /send may spend fetching data",
+    )
+    sheets_deadline_share: float = Field(
+        default=float(os.getenv("SHEETS_DEADLINE_SHARE", "0.7")),
+        description="Fraction of the command deadline given to the Google Sheets fetch",
+    )
+    circuit_failure_threshold: int = Field(
+        default=int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3")),
+        description="Consecutive failures before a dependency's circuit breaker opens",
+    )
+    circuit_reset_timeout: float = Field(
+        default=float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30")),
+        description="Seconds an open circuit breaker waits before a half-open probe",
+    )
+
+    # Active staff, matched by name against the names column (GOOGLE_SHEET_RANGE_NAMES)
+    active_staff_file: str = Field(
+        default=os.getenv("ACTIVE_STAFF_FILE", "active_staff.json"),
+        description="JSON list of active staff in parade order, with optional synonyms per name "
+        "(relative to the project directory; empty or missing lists every named row)",
+    )
+    ranks: str = Field(
+        default=os.getenv("RANKS", "ME1,ME2,ME3,ME4,ME5,ME6,ME7,ME8,2LT,LTA,CPT,MAJ,LTC,SLTC,COL"),
+        description="Comma-separated ranks recognized in front of names in the names column",
+    )
+    position_titles: str = Field(
+        default=os.getenv("POSITION_TITLES", "Sch Comd,OC,CC"),
+        description="Comma-separated position titles shown instead of the name (e.g. OC MECH)",
+    )
+
+    # Parade state message
+    include_status_breakdown: bool = Field(
+        default=os.getenv("INCLUDE_STATUS_BREAKDOWN", "false").lower() == "true",
+        description="Append per-status AM/PM counts (e.g. OL, CSE, MC) to the parade state message",
+    )
+    parade_state_format: str = Field(
+        default=os.getenv("PARADE_STATE_FORMAT", "markdown_v2"),
+        description="Markup of the sent parade state: markdown_v2, html or plain (names are escaped for it)",
+    )
+    render_cache_size: int = Field(
+        default=int(os.getenv("RENDER_CACHE_SIZE", "64")),
+        description="Rendered parade state messages kept per report content and format",
+    )
+    draft_snapshot_first: bool = Field(
+        default=os.getenv("DRAFT_SNAPSHOT_FIRST", "true").lower() == "true",
+        description="Show /draft from the last sheet snapshot while the fresh one is fetched",
+    )
+    status_index_max_age: float = Field(
+        default=float(os.getenv("STATUS_INDEX_MAX_AGE", "900")),
+        description="Seconds /who and /whereis answer from the last parsed sheet before fetching it again",
+    )
+
+    # Sheet change watcher
+    sheet_watch_interval: float = Field(
+        default=float(os.getenv("SHEET_WATCH_INTERVAL", "0")),
+        description="Seconds between checks of today's sheet columns for changes posted to the chat (0 disables)",
+    )
+    sheet_watch_max_interval: float = Field(
+        default=float(os.getenv("SHEET_WATCH_MAX_INTERVAL", "1800")),
+        description="Longest wait between checks while Google Sheets or Telegram is failing",
+    )
+    sheet_watch_jitter: float = Field(
+        default=float(os.getenv("SHEET_WATCH_JITTER", "0.2")),
+        description="Fraction of the check interval added or removed at random",
+    )
+
+    # Attendance archive
+    attendance_archive_path: str = Field(
+        default=os.getenv("ATTENDANCE_ARCHIVE_PATH", ""),
+        description="Directory of the memory-mapped attendance archive (empty disables it)",
+    )
+    attendance_archive_capacity: int = Field(
+        default=int(os.getenv("ATTENDANCE_ARCHIVE_CAPACITY", "64")),
+        description="Staff slots per day in a new attendance archive, doubled when full",
+    )
+
+    # Parade state history
+    parade_history_path: str = Field(
+        default=os.getenv("PARADE_HISTORY_PATH", "data/parade_history.sqlite3"),
+        description="SQLite archive of generated and sent parade states for /history (empty to disable)",
+    )
+
+    # Metrics
+    metrics_host: str = Field(
+        default=os.getenv("METRICS_HOST", "127.0.0.1"),
+        description="Interface of the Prometheus metrics endpoint",
+    )
+    metrics_port: int = Field(
+        default=int(os.getenv("METRICS_PORT", "0")),
+        description="Port of the Prometheus metrics endpoint (0 to disable)",
+    )
+
+    # Profiling
+    profile_dir: str = Field(
+        default=os.getenv("PROFILE_DIR", "logs/profiles"),
+        description="Directory for CPU/allocation profile reports",
+    )
+    profile_sort: str = Field(
+        default=os.getenv("PROFILE_SORT", "cumulative"),
+        description="pstats sort key of the profile text report",
+    )
+    profile_runs: int = Field(
+        default=int(os.getenv("PROFILE_RUNS", "3")),
+        description="Runs profiled by /profile when no count is given",
     )
 
     # Telegram Bot
@@ -49,16 +180,106 @@ class Settings(BaseSettings):
         default=os.getenv("TELEGRAM_CHAT_ID", ""),
         description="Telegram chat ID where parade state will be sent",
     )
+    telegram_api_base_url: str = Field(
+        default=os.getenv("TELEGRAM_API_BASE_URL", ""),
+        description="Override of the Bot API base URL, e.g. http://127.0.0.1:8089/bot",
+    )
+    admin_user_ids: str = Field(
+        default=os.getenv("ADMIN_USER_IDS", ""),
+        description="Comma-separated Telegram user IDs allowed to run admin commands",
+    )
+
+    # Webhook mode (long polling when TELEGRAM_WEBHOOK_URL is empty)
+    telegram_webhook_url: str = Field(
+        default=os.getenv("TELEGRAM_WEBHOOK_URL", ""),
+        description="Public HTTPS URL Telegram posts updates to, e.g. https://bot.example.com/telegram",
+    )
+    webhook_listen: str = Field(
+        default=os.getenv("WEBHOOK_LISTEN", "127.0.0.1"),
+        description="Interface of the local webhook server (behind a TLS reverse proxy)",
+    )
+    webhook_port: int = Field(
+        default=int(os.getenv("WEBHOOK_PORT", "8443")),
+        description="Port of the local webhook server",
+    )
+    webhook_path: str = Field(
+        default=os.getenv("WEBHOOK_PATH", "/telegram"),
+        description="Path updates are posted to",
+    )
+    webhook_secret_token: str = Field(
+        default=os.getenv("WEBHOOK_SECRET_TOKEN", ""),
+        description="Secret Telegram echoes in X-Telegram-Bot-Api-Secret-Token (required in webhook mode)",
+    )
+    webhook_max_connections: int = Field(
+        default=int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "40")),
+        description="Simultaneous connections Telegram may open to the webhook (1-100)",
+    )
+    concurrent_updates: int = Field(
+        default=int(os.getenv("CONCURRENT_UPDATES", "4")),
+        description="Updates handled at the same time (each chat's updates are still handled in order)",
+    )
+    max_in_flight_updates: int = Field(
+        default=int(os.getenv("MAX_IN_FLIGHT_UPDATES", "32")),
+        description="Updates accepted (running or waiting) before replying that the bot is busy",
+    )
 
     # Application settings
     log_level: str = Field(
         default=os.getenv("LOG_LEVEL", "INFO"),
         description="Logging level",
     )
+    log_file: str = Field(
+        default=os.getenv("LOG_FILE", "logs/parade_state_{time}.log"),
+        description="Rotating log file path (empty to log to stderr only)",
+    )
+    log_retention: str = Field(
+        default=os.getenv("LOG_RETENTION", "30 days"),
+        description="How long rotated log files are kept",
+    )
+    log_json: bool = Field(
+        default=os.getenv("LOG_JSON", "false").lower() == "true",
+        description="Write structured JSON log records instead of text",
+    )
+    log_rate_limit: int = Field(
+        default=int(os.getenv("LOG_RATE_LIMIT", "50")),
+        description="Records per call site and window logged in full (0 disables rate limiting)",
+    )
+    log_rate_window: float = Field(
+        default=float(os.getenv("LOG_RATE_WINDOW", "60")),
+        description="Rate limiting window in seconds",
+    )
+    log_sample_every: int = Field(
+        default=int(os.getenv("LOG_SAMPLE_EVERY", "100")),
+        description="Past the rate limit, keep one in this many records from a call site (0 drops them)",
+    )
     timezone: str = Field(
         default=os.getenv("TIMEZONE", "Asia/Singapore"),
         description="Timezone for date calculations",
     )
+    weekend_days: str = Field(
+        default=os.getenv("WEEKEND_DAYS", "5,6"),
+        description="Comma-separated weekdays off (0=Monday, 6=Sunday); public holidays come from PH in the sheet",
+    )
+
+    @property
+    def rank_list(self) -> List[str]:
+        """Ranks recognized in front of names."""
+        return [rank.strip() for rank in self.ranks.split(",") if rank.strip()]
+
+    @property
+    def position_title_list(self) -> List[str]:
+        """Position titles shown instead of the name."""
+        return [title.strip() for title in self.position_titles.split(",") if title.strip()]
+
+    @property
+    def weekend_day_list(self) -> List[int]:
+        """Weekdays off (0=Monday, 6=Sunday)."""
+        return [int(day) for day in self.weekend_days.split(",") if day.strip()]
+
+    @property
+    def admin_ids(self) -> List[int]:
+        """Telegram user IDs allowed to run admin commands."""
+        return [int(user_id) for user_id in self.admin_user_ids.split(",") if user_id.strip()]
 
     class Config:
         """Pydantic config."""
@@ -1,37 +1,35 @@
 """Main entry point for the Parade State Bot application."""
 import asyncio
 import os
+import sys
 import argparse
 from datetime import date, datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional
 
 from dotenv import load_dotenv
 from loguru import logger
 
 from app.config import settings
 from app.models.parade_state import ParadeState
+from app.services.attendance_archive import AttendanceArchive
 from app.services.google_sheets import GoogleSheetsService
 from app.services.message_builder import MessageBuilderService
+from app.services.parade_history import ParadeHistory
 from app.services.telegram_service import TelegramService
-from app.utils.date_helpers import get_local_date
+from app.utils.date_helpers import get_date_range, get_local_date
+from app.utils.logging_setup import setup_logging
+from app.utils.profiling import profiler
 
 # Load environment variables
 load_dotenv()
 
-# Set up logging
-logger.add(
-    "logs/parade_state_{time}.log",
-    rotation="1 day",
-    level=settings.log_level,
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
-)
 
-
-async def send_parade_state(target_date: Optional[date] = None) -> None:
+async def send_parade_state(target_date: Optional[date] = None, working_days_only: bool = False) -> None:
     """Send the parade state message.
 
     Args:
         target_date: The date for the parade state, defaults to today
+        working_days_only: Send nothing on weekends and public holidays (scheduled runs)
     """
     try:
         # Use current date if not specified
@@ -46,13 +44,28 @@ async def send_parade_state(target_date: Optional[date] = None) -> None:
         message_builder_service = MessageBuilderService(
             google_sheets_service=google_sheets_service,
             telegram_service=telegram_service,
+            attendance_archive=AttendanceArchive() if settings.attendance_archive_path else None,
+            parade_history=ParadeHistory() if settings.parade_history_path else None,
         )
 
-        # Generate the parade state message
-        message = await message_builder_service.generate_message(target_date)
+        # Weekends are known up front; public holidays once the sheet has been read
+        if working_days_only and not google_sheets_service.work_calendar.is_working_day(target_date):
+            logger.info(f"{target_date} is not a working day, nothing sent")
+            return
+
+        # Generate the parade state, archiving it only once it is known to be sent
+        parade_state = await message_builder_service.generate_parade_state(
+            target_date, archive=not working_days_only
+        )
+
+        if working_days_only:
+            if not google_sheets_service.work_calendar.is_working_day(target_date):
+                logger.info(f"{target_date} is a public holiday, nothing sent or archived")
+                return
+            await message_builder_service.archive(parade_state)
 
         # Send the message to Telegram
-        await telegram_service.send_message(message)
+        await message_builder_service.send_parade_state(parade_state)
 
         logger.success(f"Parade state sent successfully for {target_date}")
 
@@ -83,6 +96,8 @@ async def generate_draft_parade_state(target_date: Optional[date] = None) -> str
         message_builder_service = MessageBuilderService(
             google_sheets_service=google_sheets_service,
             telegram_service=telegram_service,
+            attendance_archive=AttendanceArchive() if settings.attendance_archive_path else None,
+            parade_history=ParadeHistory() if settings.parade_history_path else None,
         )
 
         # Generate the parade state message
@@ -96,13 +111,70 @@ async def generate_draft_parade_state(target_date: Optional[date] = None) -> str
         raise
 
 
+async def generate_draft_parade_states(first_date: date, last_date: date) -> Dict[date, str]:
+    """Generate draft parade state messages for a range of dates from one sheet read.
+
+    Args:
+        first_date: First date (inclusive)
+        last_date: Last date (inclusive)
+
+    Returns:
+        Formatted parade state message of each date
+    """
+    logger.info(f"Generating draft parade states for {first_date} to {last_date}")
+
+    google_sheets_service = GoogleSheetsService()
+    message_builder_service = MessageBuilderService(
+        google_sheets_service=google_sheets_service,
+        telegram_service=TelegramService(),
+        parade_history=ParadeHistory() if settings.parade_history_path else None,
+    )
+    return await message_builder_service.generate_messages(get_date_range(first_date, last_date))
+
+
+def export_history(path: str) -> int:
+    """Stream the parade state history archive to a JSONL file.
+
+    Args:
+        path: Output file, or "-" for stdout
+
+    Returns:
+        Number of parade states written
+    """
+    if not settings.parade_history_path:
+        raise ValueError("PARADE_HISTORY_PATH is not set")
+    history = ParadeHistory()
+    try:
+        if path == "-":
+            return history.export_jsonl(sys.stdout)
+        with open(path, "w", encoding="utf-8") as out:
+            return history.export_jsonl(out)
+    finally:
+        history.close()
+
+
+def validate_sheet(target_date: Optional[date] = None) -> bool:
+    """Scan the whole sheet for status cells the parser cannot read reliably and print the report.
+
+    Args:
+        target_date: Date whose tab is scanned when GOOGLE_SHEET_AUTO_TABS is set, defaults to today
+
+    Returns:
+        True if no problem values were found
+    """
+    report = GoogleSheetsService().lint(target_date=target_date or get_local_date())
+    print("\n".join(report.format_lines(max_cells=10)))
+    return not report.issues
+
+
 async def main() -> None:
     """Main entry point for the application."""
+    setup_logging()
     parser = argparse.ArgumentParser(description="Parade State Bot")
     parser.add_argument(
         "--date", 
         type=str, 
-        help="Target date in DD/MM/YYYY format (default: today)"
+        help="Target date in DD/MM/YYYY format (default: today), or a DD/MM/YYYY-DD/MM/YYYY range of drafts"
     )
     parser.add_argument(
         "--draft", 
@@ -114,21 +186,70 @@ async def main() -> None:
         action="store_true", 
         help="Run in debug mode (prints to console)"
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Send today's parade state even on a weekend or public holiday"
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Report unrecognized or ambiguous status cells in the whole sheet (exit code 1 if any)"
+    )
+    parser.add_argument(
+        "--export-history",
+        metavar="FILE",
+        help="Write every archived parade state as JSON lines to FILE (- for stdout)"
+    )
+    parser.add_argument(
+        "--profile",
+        type=int,
+        nargs="?",
+        const=1,
+        metavar="N",
+        help="Profile the next N message generations (CPU, allocations, flamegraph stacks)"
+    )
     
     args = parser.parse_args()
     
-    # Parse target date if provided
+    # Parse target date (or range of dates) if provided
     target_date = None
+    last_date = None
     if args.date:
         try:
-            target_date = datetime.strptime(args.date, "%d/%m/%Y").date()
+            first, _, last = args.date.partition("-")
+            target_date = datetime.strptime(first.strip(), "%d/%m/%Y").date()
+            if last:
+                last_date = datetime.strptime(last.strip(), "%d/%m/%Y").date()
         except ValueError:
             logger.error(f"Invalid date format: {args.date}. Use DD/MM/YYYY format.")
             return
+        if last_date is not None and not (args.draft or args.debug):
+            logger.error("A range of dates can only be drafted, add --draft")
+            return
+
+    if args.profile:
+        profiler.arm(args.profile)
     
+    if args.export_history:
+        count = export_history(args.export_history)
+        logger.info(f"Exported {count} parade states to {args.export_history}")
+        return
+
+    if args.validate:
+        if not validate_sheet(target_date):
+            raise SystemExit(1)
+        return
+
     # Run in draft or send mode
     try:
-        if args.draft or args.debug:
+        if last_date is not None:
+            messages = await generate_draft_parade_states(target_date, last_date)
+            for message in messages.values():
+                print("\n" + "=" * 50)
+                print(message)
+            print("=" * 50 + "\n")
+        elif args.draft or args.debug:
             message = await generate_draft_parade_state(target_date)
             print("\n" + "=" * 50)
             print("DRAFT PARADE STATE:")
@@ -136,7 +257,8 @@ async def main() -> None:
             print(message)
             print("=" * 50 + "\n")
         else:
-            await send_parade_state(target_date)
+            # Scheduled runs (no --date) skip weekends and public holidays
+            await send_parade_state(target_date, working_days_only=target_date is None and not args.force)
     except Exception as e:
         logger.error(f"Application error: {e}")
         if args.debug:
@@ -0,0 +1,166 @@
+"""Models for run-length encoded staff status history."""
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from app.models.staff import StatusType
+
+# Sort order of the half-day periods within a date
+PERIODS = ("AM", "PM")
+PERIOD_INDEX = {period: index for index, period in enumerate(PERIODS)}
+
+SlotKey = Tuple[date, int]
+
+
+@dataclass(frozen=True, slots=True)
+class StatusSegment:
+    """A run of consecutive half-day slots sharing the same status and location."""
+
+    status_type: StatusType
+    location: Optional[str]
+    start: date
+    end: date
+    start_period: str = "AM"
+    end_period: str = "PM"
+
+    @property
+    def start_key(self) -> SlotKey:
+        """Sortable key of the first slot in the run."""
+        return (self.start, PERIOD_INDEX[self.start_period])
+
+    @property
+    def end_key(self) -> SlotKey:
+        """Sortable key of the last slot in the run."""
+        return (self.end, PERIOD_INDEX[self.end_period])
+
+    def format_span(self) -> str:
+        """Format the status and dates of the run, e.g. "OL @ Japan 18/10(PM)-25/10"."""
+        status = self.status_type.value
+        if self.location:
+            status += f" @ {self.location}"
+        if self.start == self.end:
+            half = f"({self.start_period})" if self.start_period == self.end_period else ""
+            return f"{status} {self.start:%d/%m}{half}"
+        start = f"{self.start:%d/%m}" + ("(PM)" if self.start_period == "PM" else "")
+        end = f"{self.end:%d/%m}" + ("(AM)" if self.end_period == "AM" else "")
+        return f"{status} {start}-{end}"
+
+
+class StatusHistory:
+    """Run-length encoded status history of a single staff row."""
+
+    __slots__ = ("segments", "_start_keys", "_end_keys")
+
+    def __init__(self, segments: Iterable[StatusSegment] = ()):
+        """Initialize the history.
+
+        Args:
+            segments: Segments in chronological order
+        """
+        self.segments: Tuple[StatusSegment, ...] = tuple(segments)
+        self._start_keys: List[SlotKey] = [segment.start_key for segment in self.segments]
+        self._end_keys: List[SlotKey] = [segment.end_key for segment in self.segments]
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    @classmethod
+    def from_slots(
+        cls, slots: Iterable[Tuple[date, str, StatusType, Optional[str]]]
+    ) -> "StatusHistory":
+        """Compress chronological half-day slots into segments.
+
+        Args:
+            slots: (date, period, status type, location) tuples in sheet order
+
+        Returns:
+            StatusHistory with one segment per run
+        """
+        segments: List[StatusSegment] = []
+        run = None
+        for slot_date, period, status_type, location in slots:
+            if run is not None and run[0] == status_type and run[1] == location:
+                run[3], run[5] = slot_date, period
+                continue
+            if run is not None:
+                segments.append(StatusSegment(*run))
+            run = [status_type, location, slot_date, slot_date, period, period]
+        if run is not None:
+            segments.append(StatusSegment(*run))
+        return cls(segments)
+
+    @classmethod
+    def from_slot_values(
+        cls,
+        slot_keys: Sequence[Tuple[date, str]],
+        values: Sequence[Tuple[StatusType, Optional[str]]],
+    ) -> "StatusHistory":
+        """Compress the (status type, location) of each half-day slot into segments.
+
+        Same result as ``from_slots``, for callers that already hold the slot
+        keys and values as parallel lists.
+
+        Args:
+            slot_keys: (date, period) of each slot in sheet order
+            values: (status type, location) of each slot
+
+        Returns:
+            StatusHistory with one segment per run
+        """
+        segments: List[StatusSegment] = []
+        start = 0
+        count = len(values)
+        for index in range(1, count + 1):
+            if index == count or values[index] != values[start]:
+                (start_date, start_period), (end_date, end_period) = slot_keys[start], slot_keys[index - 1]
+                status_type, location = values[start]
+                segments.append(StatusSegment(status_type, location, start_date, end_date, start_period, end_period))
+                start = index
+        return cls(segments)
+
+    def segment_at(self, target_date: date, period: str = "AM") -> Optional[StatusSegment]:
+        """Find the segment covering a half-day slot in O(log n).
+
+        Args:
+            target_date: Date to look up
+            period: Period to look up ("AM" or "PM")
+
+        Returns:
+            The covering StatusSegment, or None if the slot is outside the history
+        """
+        key = (target_date, PERIOD_INDEX.get(period, 0))
+        index = bisect_left(self._end_keys, key)
+        if index < len(self.segments) and self._start_keys[index] <= key:
+            return self.segments[index]
+        return None
+
+    def segments_between(self, start: date, end: date) -> List[StatusSegment]:
+        """Get the segments overlapping a date range in O(log n + k).
+
+        Args:
+            start: First date of the range (inclusive)
+            end: Last date of the range (inclusive)
+
+        Returns:
+            Overlapping segments in chronological order
+        """
+        index = bisect_left(self._end_keys, (start, 0))
+        overlapping = []
+        while index < len(self.segments) and self.segments[index].start <= end:
+            overlapping.append(self.segments[index])
+            index += 1
+        return overlapping
+
+    def run_end(self, target_date: date, period: str = "AM") -> Optional[date]:
+        """Get the last date of the run covering a slot.
+
+        Args:
+            target_date: Date to look up
+            period: Period to look up ("AM" or "PM")
+
+        Returns:
+            End date of the current run, or None if the slot is not covered
+        """
+        segment = self.segment_at(target_date, period)
+        return segment.end if segment else None
@@ -1,62 +1,118 @@
 """Models for the parade state report."""
-from datetime import date
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_serializer, field_validator
 
 from app.models.duty import DutyInstructor
-from app.models.staff import StaffList, StaffMember
+from app.models.report import ParadeReport, ReportRow
+from app.models.staff import StaffList, StaffRoster, StatusBreakdown, StatusType
 
 
 class ParadeState(BaseModel):
     """Model representing a parade state report."""
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     report_date: date
-    staff_list: StaffList
+    staff_list: StaffRoster
     current_di: Optional[DutyInstructor] = None
     next_di: Optional[DutyInstructor] = None
     am_count: int = 0
     pm_count: int = 0
+    as_of: Optional[datetime] = None
+    as_of_note: str = "Google Sheets unavailable"
+
+    _breakdown: Optional[StatusBreakdown] = PrivateAttr(default=None)
+    _reports: Dict[bool, ParadeReport] = PrivateAttr(default_factory=dict)
 
     def __init__(self, **data):
         """Initialize the parade state and calculate attendance counts."""
         super().__init__(**data)
         self.calculate_counts()
 
+    @field_validator("staff_list", mode="before")
+    @classmethod
+    def _coerce_staff_list(cls, value: Any) -> Any:
+        """Accept the Pydantic StaffList at the boundary and keep a compact roster."""
+        if isinstance(value, StaffList):
+            return value.to_roster()
+        return value
+
+    @field_serializer("staff_list")
+    def _serialize_staff_list(self, roster: StaffRoster) -> dict:
+        """Serialize the roster through its Pydantic model."""
+        return roster.to_staff_list().model_dump()
+
+    @property
+    def breakdown(self) -> StatusBreakdown:
+        """Per-status AM/PM counts, aggregated once and cached."""
+        if self._breakdown is None:
+            self._breakdown = self.staff_list.breakdown()
+        return self._breakdown
+
     def calculate_counts(self) -> None:
         """Calculate the present counts for AM and PM."""
-        self.am_count = self.staff_list.count_present(period="AM")
-        self.pm_count = self.staff_list.count_present(period="PM")
-
-    def format_message(self) -> str:
-        """Format the complete parade state message."""
-        # Get day name
-        day_name = self.report_date.strftime("%A")
-
-        # Format the header
-        header = [
-            f"Parade State for {self.report_date.strftime('%d/%m/%Y')}",
-            day_name,
-            "",
-        ]
-
-        # Add DI information
-        di_info = []
+        self._breakdown = None
+        self._reports = {}
+        self.am_count = self.breakdown.count(StatusType.PRESENT, period="AM")
+        self.pm_count = self.breakdown.count(StatusType.PRESENT, period="PM")
+
+    def to_report(self, include_breakdown: bool = False) -> ParadeReport:
+        """Resolve the statuses and counts into a format-independent report, once per state.
+
+        Args:
+            include_breakdown: Whether to add the per-status breakdown section
+
+        Returns:
+            ParadeReport rendered by every output format
+        """
+        report = self._reports.get(include_breakdown)
+        if report is not None:
+            return report
+
+        di_lines = []
         if self.current_di:
-            di_info.append(f"Today's DI: {self.current_di}")
+            di_lines.append(f"Today's DI: {self.current_di}")
         if self.next_di:
-            di_info.append(f"Next DI: {self.next_di}")
-        di_info.append("")
+            di_lines.append(f"Next DI: {self.next_di}")
+
+        rows = []
+        for position, record in enumerate(self.staff_list, 1):
+            status = record.status
+            rows.append(
+                ReportRow(
+                    position=position,
+                    label=record.display or record.position or str(record),
+                    status=status.format_status(),
+                    am_status=status.status_for("AM").value,
+                    pm_status=status.status_for("PM").value,
+                    am_location=status.location_for("AM"),
+                    pm_location=status.location_for("PM"),
+                    end_date=status.end_date,
+                )
+            )
+
+        report = ParadeReport(
+            report_date=self.report_date,
+            rows=tuple(rows),
+            am_count=self.am_count,
+            pm_count=self.pm_count,
+            # Marks reports built from an offline snapshot
+            as_of_line=f"(as of {self.as_of.strftime('%d/%m/%Y %H:%M')}, {self.as_of_note})" if self.as_of else None,
+            di_lines=tuple(di_lines),
+            breakdown_lines=tuple(self.breakdown.format_lines()) if include_breakdown else (),
+        )
+        self._reports[include_breakdown] = report
+        return report
 
-        # Format staff list
-        staff_entries = []
-        for i, staff in enumerate(self.staff_list.staff, 1):
-            staff_entries.append(f"{i}. {staff.get_parade_state_entry()}")
-        staff_entries.append("")
+    def format_message(self, include_breakdown: bool = False) -> str:
+        """Format the complete parade state message.
 
-        # Add attendance counts
-        counts = [f"Today's number: {self.am_count}(AM), {self.pm_count}(PM)"]
+        Args:
+            include_breakdown: Whether to add the per-status breakdown section
 
-        # Combine all sections
-        message_parts = header + di_info + staff_entries + counts
-        return "\n".join(message_parts)
+        Returns:
+            Formatted parade state message
+        """
+        return self.to_report(include_breakdown).to_plain()
@@ -0,0 +1,149 @@
+"""Format-independent representation of a parade state report and its renderers.
+
+``ParadeState.to_report`` resolves every status and count into a
+``ParadeReport`` once; each output format is then a single pass over it,
+escaping sheet text (names, locations, details) for the target markup.
+"""
+import csv
+import html
+import io
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, Optional, Tuple
+
+PLAIN = "plain"
+MARKDOWN_V2 = "markdown_v2"
+HTML = "html"
+CSV = "csv"
+
+# Characters Telegram MarkdownV2 requires escaping outside entities
+MARKDOWN_V2_SPECIAL = re.compile(r"([_*\[\]()~`>#+\-=|{}.!\\])")
+
+CSV_COLUMNS = (
+    "report_date",
+    "position",
+    "label",
+    "status",
+    "am_status",
+    "pm_status",
+    "am_location",
+    "pm_location",
+    "end_date",
+)
+
+
+def escape_markdown_v2(text: str) -> str:
+    """Escape text for Telegram MarkdownV2."""
+    return MARKDOWN_V2_SPECIAL.sub(r"\\\1", text)
+
+
+def escape_html(text: str) -> str:
+    """Escape text for Telegram HTML (only <, > and & are special)."""
+    return html.escape(text, quote=False)
+
+
+@dataclass(frozen=True, slots=True)
+class ReportRow:
+    """A staff member's line of the report."""
+
+    position: int
+    label: str
+    status: str
+    am_status: str
+    pm_status: str
+    am_location: Optional[str] = None
+    pm_location: Optional[str] = None
+    end_date: Optional[date] = None
+
+
+@dataclass(frozen=True, slots=True)
+class ParadeReport:
+    """Everything a parade state message shows, with statuses already formatted.
+
+    Frozen and hashable: equal reports hash equally, so rendered outputs can
+    be cached by report content. The hash covers every row, so it is
+    computed once when the report is built.
+    """
+
+    report_date: date
+    rows: Tuple[ReportRow, ...]
+    am_count: int
+    pm_count: int
+    as_of_line: Optional[str] = None
+    di_lines: Tuple[str, ...] = ()
+    breakdown_lines: Tuple[str, ...] = ()
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        content = (self.report_date, self.rows, self.am_count, self.pm_count, self.as_of_line, self.di_lines, self.breakdown_lines)
+        object.__setattr__(self, "_hash", hash(content))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    @property
+    def title(self) -> str:
+        return f"Parade State for {self.report_date.strftime('%d/%m/%Y')}"
+
+    @property
+    def counts_line(self) -> str:
+        return f"Today's number: {self.am_count}(AM), {self.pm_count}(PM)"
+
+    def body(self) -> str:
+        """Lay out everything below the title as unescaped plain text."""
+        lines = [self.report_date.strftime("%A")]
+        if self.as_of_line:
+            lines.append(self.as_of_line)
+        lines.append("")
+        lines.extend(self.di_lines)
+        lines.append("")
+        lines.extend(f"{row.position}. {row.label} - {row.status}" for row in self.rows)
+        lines.append("")
+        lines.append(self.counts_line)
+        if self.breakdown_lines:
+            lines.extend(["", "Breakdown:"])
+            lines.extend(self.breakdown_lines)
+        return "\n".join(lines)
+
+    def to_plain(self) -> str:
+        """Render as plain text (the chat message and draft format)."""
+        return f"{self.title}\n{self.body()}"
+
+    def to_markdown_v2(self) -> str:
+        """Render as Telegram MarkdownV2 with a bold title, escaping the text in one pass."""
+        return f"*{escape_markdown_v2(self.title)}*\n{escape_markdown_v2(self.body())}"
+
+    def to_html(self) -> str:
+        """Render as Telegram HTML with a bold title, escaping the text in one pass."""
+        return f"<b>{escape_html(self.title)}</b>\n{escape_html(self.body())}"
+
+    def to_csv(self) -> str:
+        """Render the staff rows as CSV, one row per staff member."""
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(CSV_COLUMNS)
+        report_date = self.report_date.isoformat()
+        writer.writerows(
+            (
+                report_date,
+                row.position,
+                row.label,
+                row.status,
+                row.am_status,
+                row.pm_status,
+                row.am_location or "",
+                row.pm_location or "",
+                row.end_date.isoformat() if row.end_date else "",
+            )
+            for row in self.rows
+        )
+        return out.getvalue()
+
+
+RENDERERS: Dict[str, Callable[[ParadeReport], str]] = {
+    PLAIN: ParadeReport.to_plain,
+    MARKDOWN_V2: ParadeReport.to_markdown_v2,
+    HTML: ParadeReport.to_html,
+    CSV: ParadeReport.to_csv,
+}
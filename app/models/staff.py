@@ -1,7 +1,15 @@
-"""Models for staff members and their status."""
+"""Models for staff members and their status.
+
+The pipeline works on the compact ``*Record`` classes (frozen, slotted
+dataclasses). The Pydantic models are kept for the API and serialization
+boundary and convert to and from records with ``to_record``/``from_record``.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import date
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Dict, Any, Iterator, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -31,19 +39,20 @@ class StatusType(str, Enum):
     OTHERS = "OTHERS"  # Catch-all for unrecognized status
 
 
-class StaffSynonym(BaseModel):
-    """Dictionary representing a synonyms for a staff member. Used for lookup when not found."""
+# Interned status codes: every StatusType maps to a small, stable integer
+STATUS_TYPES: Tuple[StatusType, ...] = tuple(StatusType)
+STATUS_CODES: Dict[StatusType, int] = {status: code for code, status in enumerate(STATUS_TYPES)}
+STATUS_BY_VALUE: Dict[str, StatusType] = {status.value: status for status in STATUS_TYPES}
 
-    name: str
-    synonyms: List[str] = Field(default_factory=list)
 
-    def __str__(self) -> str:
-        """String representation of staff synonym."""
-        return f"{self.name} ({', '.join(self.synonyms)})"
+def status_candidates(text: str) -> List[StatusType]:
+    """Status types whose code occurs in a status string, in the order the decoder tries them."""
+    return [status for status in STATUS_TYPES if status.value in text]
 
 
-class LocationDetail(BaseModel):
-    """Model representing a location or specific detail for a status."""
+@dataclass(frozen=True, slots=True)
+class LocationRecord:
+    """Compact record of a location or specific detail for a status."""
 
     location: Optional[str] = None
     detail: Optional[str] = None
@@ -59,30 +68,69 @@ class LocationDetail(BaseModel):
         return ""
 
 
-class StaffStatus(BaseModel):
-    """Model representing a staff member's status."""
+@dataclass(frozen=True, slots=True)
+class StatusRecord:
+    """Compact record of a staff member's status."""
 
     status_type: StatusType
     end_date: Optional[date] = None
     details: Optional[str] = None
-    location: Optional[LocationDetail] = None
+    location: Optional[LocationRecord] = None
     am_pm_split: bool = False
     am_status: Optional[StatusType] = None
-    am_location: Optional[LocationDetail] = None
+    am_location: Optional[LocationRecord] = None
     pm_status: Optional[StatusType] = None
-    pm_location: Optional[LocationDetail] = None
+    pm_location: Optional[LocationRecord] = None
+
+    @property
+    def code(self) -> int:
+        """Interned integer code of the overall status type."""
+        return STATUS_CODES[self.status_type]
+
+    def status_for(self, period: Optional[str] = None) -> StatusType:
+        """Get the effective status type for a period.
+
+        Args:
+            period: Optional period ("AM" or "PM")
+
+        Returns:
+            The status type that applies to the period
+        """
+        if self.am_pm_split:
+            if period == "AM":
+                return self.am_status or self.status_type
+            if period == "PM":
+                return self.pm_status or self.status_type
+        return self.status_type
+
+    def location_for(self, period: Optional[str] = None) -> Optional[str]:
+        """Get the effective location for a period.
+
+        Args:
+            period: Optional period ("AM" or "PM")
+
+        Returns:
+            The location string that applies to the period, if any
+        """
+        location = self.location
+        if self.am_pm_split:
+            if period == "AM":
+                location = self.am_location
+            elif period == "PM":
+                location = self.pm_location
+        return location.location if location else None
 
     def format_status(self) -> str:
         """Format the status for display in the parade state message."""
         if not self.am_pm_split:
             # Simple status - no AM/PM split
             if self.status_type == StatusType.PRESENT:
-                result = f"{self.status_type}"
+                result = self.status_type.value
                 if self.details:
                     result += f" {self.details}"
                 return result
 
-            result = f"{self.status_type}"
+            result = self.status_type.value
             if self.location:
                 result += f" {self.location}"
             if self.details:
@@ -92,23 +140,281 @@ class StaffStatus(BaseModel):
             return result
 
         # Handle AM/PM split
-        am_part = f"{self.am_status or self.status_type}"
+        am_part = (self.am_status or self.status_type).value
         if self.am_location:
             am_part += f" {self.am_location}"
 
-        pm_part = f"{self.pm_status or self.status_type}"
+        pm_part = (self.pm_status or self.status_type).value
         if self.pm_location:
             pm_part += f" {self.pm_location}"
 
         result = f"{am_part}(AM), {pm_part}(PM)"
-        
+
         # Add end date if applicable
         if self.end_date:
             result += f" TILL {self.end_date.strftime('%d/%m')}"
-            
+
         return result
 
 
+@dataclass(frozen=True, slots=True)
+class StaffIdentity:
+    """Name, rank and position parsed from a names-column cell, with its display string."""
+
+    name: str
+    rank: Optional[str] = None
+    position: Optional[str] = None
+    display: str = ""
+
+
+# Positions shown instead of rank and name when a record has no display string
+COMMAND_POSITIONS = ("Sch Comd", "OC", "CC")
+
+
+@dataclass(frozen=True, slots=True)
+class StaffRecord:
+    """Compact record of a staff member and their status."""
+
+    id: int
+    name: str
+    status: StatusRecord
+    rank: Optional[str] = None
+    position: Optional[str] = None
+    display: Optional[str] = None
+
+    def __str__(self) -> str:
+        """String representation of staff member."""
+        if self.rank:
+            return f"{self.rank} {self.name}"
+        return self.name
+
+    def get_parade_state_entry(self) -> str:
+        """Get formatted entry for parade state message."""
+        if self.display:
+            name_display = self.display
+        elif self.position and any(pos in self.position for pos in COMMAND_POSITIONS):
+            name_display = self.position
+        else:
+            name_display = str(self)
+        return f"{name_display} - {self.status.format_status()}"
+
+
+def _read_only(counts: Counter) -> Mapping:
+    """Wrap a Counter in a read-only view that still reads missing keys as 0.
+
+    MappingProxyType looks keys up with ``__getitem__``, so the Counter's
+    ``__missing__`` still applies, but the view has no setters.
+    """
+    return MappingProxyType(counts)
+
+
+@dataclass(frozen=True, slots=True)
+class StatusBreakdown:
+    """AM/PM counts per status type and per (status type, location) bucket.
+
+    The counts are read-only views of Counters (missing keys read as 0), so a
+    cached breakdown cannot be changed by its callers.
+    """
+
+    am: Mapping[StatusType, int] = field(default_factory=lambda: _read_only(Counter()))
+    pm: Mapping[StatusType, int] = field(default_factory=lambda: _read_only(Counter()))
+    am_locations: Mapping[Tuple[StatusType, Optional[str]], int] = field(default_factory=lambda: _read_only(Counter()))
+    pm_locations: Mapping[Tuple[StatusType, Optional[str]], int] = field(default_factory=lambda: _read_only(Counter()))
+
+    @classmethod
+    def from_records(cls, records: Iterator[StaffRecord]) -> "StatusBreakdown":
+        """Aggregate staff records in a single pass.
+
+        Args:
+            records: Staff records to aggregate
+
+        Returns:
+            StatusBreakdown for the records
+        """
+        am, pm, am_locations, pm_locations = Counter(), Counter(), Counter(), Counter()
+        for record in records:
+            status = record.status
+            am_status = status.status_for("AM")
+            pm_status = status.status_for("PM")
+            am[am_status] += 1
+            pm[pm_status] += 1
+            am_locations[(am_status, status.location_for("AM"))] += 1
+            pm_locations[(pm_status, status.location_for("PM"))] += 1
+        return cls(_read_only(am), _read_only(pm), _read_only(am_locations), _read_only(pm_locations))
+
+    @classmethod
+    def combine(cls, breakdowns: Iterator["StatusBreakdown"]) -> "StatusBreakdown":
+        """Merge breakdowns (e.g. from several units) into a new one.
+
+        Args:
+            breakdowns: Breakdowns to merge
+
+        Returns:
+            Combined StatusBreakdown
+        """
+        am, pm, am_locations, pm_locations = Counter(), Counter(), Counter(), Counter()
+        for breakdown in breakdowns:
+            am.update(breakdown.am)
+            pm.update(breakdown.pm)
+            am_locations.update(breakdown.am_locations)
+            pm_locations.update(breakdown.pm_locations)
+        return cls(_read_only(am), _read_only(pm), _read_only(am_locations), _read_only(pm_locations))
+
+    def count(self, status_type: StatusType, period: str = "AM") -> int:
+        """Get the count for a status type in a period.
+
+        Args:
+            status_type: Status type to count
+            period: Period to count ("AM" or "PM")
+
+        Returns:
+            Number of staff with the status in the period
+        """
+        counts = self.pm if period == "PM" else self.am
+        return counts[status_type]
+
+    def format_lines(self) -> List[str]:
+        """Format the non-present statuses as message lines."""
+        locations_by_status: Dict[StatusType, set] = {}
+        for bucket_status, location in (*self.am_locations, *self.pm_locations):
+            if location:
+                locations_by_status.setdefault(bucket_status, set()).add(location)
+
+        lines = []
+        for status_type in STATUS_TYPES:
+            if status_type == StatusType.PRESENT:
+                continue
+            am_count, pm_count = self.am[status_type], self.pm[status_type]
+            if not am_count and not pm_count:
+                continue
+            lines.append(f"{status_type.value}: {am_count}(AM), {pm_count}(PM)")
+
+            for location in sorted(locations_by_status.get(status_type, ())):
+                lines.append(
+                    f"  @ {location}: {self.am_locations[(status_type, location)]}(AM), "
+                    f"{self.pm_locations[(status_type, location)]}(PM)"
+                )
+        return lines
+
+
+@dataclass(frozen=True, slots=True)
+class StaffRoster:
+    """Compact, immutable collection of staff records."""
+
+    staff: Tuple[StaffRecord, ...] = ()
+
+    def __iter__(self) -> Iterator[StaffRecord]:
+        return iter(self.staff)
+
+    def __len__(self) -> int:
+        return len(self.staff)
+
+    def count_present(self, period: Optional[str] = None) -> int:
+        """Count the number of present staff members.
+
+        Args:
+            period: Optional period to count ("AM" or "PM")
+
+        Returns:
+            Number of present staff members
+        """
+        return sum(1 for member in self.staff if member.status.status_for(period) == StatusType.PRESENT)
+
+    def breakdown(self) -> StatusBreakdown:
+        """Aggregate AM/PM counts per status and location in one pass."""
+        return StatusBreakdown.from_records(self.staff)
+
+    def to_staff_list(self) -> "StaffList":
+        """Convert the roster to its Pydantic model for serialization."""
+        return StaffList.from_roster(self)
+
+
+class StaffSynonym(BaseModel):
+    """Dictionary representing a synonyms for a staff member. Used for lookup when not found."""
+
+    name: str
+    synonyms: List[str] = Field(default_factory=list)
+
+    def __str__(self) -> str:
+        """String representation of staff synonym."""
+        return f"{self.name} ({', '.join(self.synonyms)})"
+
+
+class LocationDetail(BaseModel):
+    """Model representing a location or specific detail for a status."""
+
+    location: Optional[str] = None
+    detail: Optional[str] = None
+
+    def __str__(self) -> str:
+        """String representation of location detail."""
+        if self.location and self.detail:
+            return f"@ {self.location} ({self.detail})"
+        elif self.location:
+            return f"@ {self.location}"
+        elif self.detail:
+            return f"({self.detail})"
+        return ""
+
+    def to_record(self) -> LocationRecord:
+        """Convert to a compact location record."""
+        return LocationRecord(location=self.location, detail=self.detail)
+
+    @classmethod
+    def from_record(cls, record: Optional[LocationRecord]) -> Optional["LocationDetail"]:
+        """Build the Pydantic model from a location record."""
+        if record is None:
+            return None
+        return cls.model_construct(location=record.location, detail=record.detail)
+
+
+class StaffStatus(BaseModel):
+    """Model representing a staff member's status."""
+
+    status_type: StatusType
+    end_date: Optional[date] = None
+    details: Optional[str] = None
+    location: Optional[LocationDetail] = None
+    am_pm_split: bool = False
+    am_status: Optional[StatusType] = None
+    am_location: Optional[LocationDetail] = None
+    pm_status: Optional[StatusType] = None
+    pm_location: Optional[LocationDetail] = None
+
+    def format_status(self) -> str:
+        """Format the status for display in the parade state message."""
+        return self.to_record().format_status()
+
+    def to_record(self) -> StatusRecord:
+        """Convert to a compact status record."""
+        return StatusRecord(
+            status_type=self.status_type,
+            end_date=self.end_date,
+            details=self.details,
+            location=self.location.to_record() if self.location else None,
+            am_pm_split=self.am_pm_split,
+            am_status=self.am_status,
+            am_location=self.am_location.to_record() if self.am_location else None,
+            pm_status=self.pm_status,
+            pm_location=self.pm_location.to_record() if self.pm_location else None,
+        )
+
+    @classmethod
+    def from_record(cls, record: StatusRecord) -> "StaffStatus":
+        """Build the Pydantic model from a status record."""
+        return cls.model_construct(
+            status_type=record.status_type,
+            end_date=record.end_date,
+            details=record.details,
+            location=LocationDetail.from_record(record.location),
+            am_pm_split=record.am_pm_split,
+            am_status=record.am_status,
+            am_location=LocationDetail.from_record(record.am_location),
+            pm_status=record.pm_status,
+            pm_location=LocationDetail.from_record(record.pm_location),
+        )
+
+
 class StaffMember(BaseModel):
     """Model representing a staff member."""
 
@@ -116,6 +422,7 @@ class StaffMember(BaseModel):
     name: str
     rank: Optional[str] = None
     position: Optional[str] = None
+    display: Optional[str] = None
     status: StaffStatus
 
     def __str__(self) -> str:
@@ -126,8 +433,30 @@ class StaffMember(BaseModel):
 
     def get_parade_state_entry(self) -> str:
         """Get formatted entry for parade state message."""
-        name_display = self.position if self.position and any(pos in self.position for pos in ["Sch Comd", "OC", "CC"]) else str(self)
-        return f"{name_display} - {self.status.format_status()}"
+        return self.to_record().get_parade_state_entry()
+
+    def to_record(self) -> StaffRecord:
+        """Convert to a compact staff record."""
+        return StaffRecord(
+            id=self.id,
+            name=self.name,
+            rank=self.rank,
+            position=self.position,
+            display=self.display,
+            status=self.status.to_record(),
+        )
+
+    @classmethod
+    def from_record(cls, record: StaffRecord) -> "StaffMember":
+        """Build the Pydantic model from a staff record."""
+        return cls.model_construct(
+            id=record.id,
+            name=record.name,
+            rank=record.rank,
+            position=record.position,
+            display=record.display,
+            status=StaffStatus.from_record(record.status),
+        )
 
 
 class StaffList(BaseModel):
@@ -144,14 +473,13 @@ class StaffList(BaseModel):
         Returns:
             Number of present staff members
         """
-        count = 0
-        for member in self.staff:
-            if period == "AM" and member.status.am_pm_split:
-                if member.status.am_status == StatusType.PRESENT:
-                    count += 1
-            elif period == "PM" and member.status.am_pm_split:
-                if member.status.pm_status == StatusType.PRESENT:
-                    count += 1
-            elif not member.status.am_pm_split and member.status.status_type == StatusType.PRESENT:
-                count += 1
-        return count
\ No newline at end of file
+        return self.to_roster().count_present(period)
+
+    def to_roster(self) -> StaffRoster:
+        """Convert to a compact staff roster."""
+        return StaffRoster(staff=tuple(member.to_record() for member in self.staff))
+
+    @classmethod
+    def from_roster(cls, roster: StaffRoster) -> "StaffList":
+        """Build the Pydantic model from a staff roster."""
+        return cls.model_construct(staff=[StaffMember.from_record(record) for record in roster.staff])
@@ -0,0 +1,302 @@
+"""Compact, memory-mapped archive of daily staff attendance."""
+import json
+import os
+import threading
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from app.config import settings
+from app.models.staff import (
+    STATUS_CODES,
+    STATUS_TYPES,
+    LocationRecord,
+    StaffRoster,
+    StatusRecord,
+)
+
+PERIODS = ("AM", "PM")
+
+# Status code 0 marks a slot with no archived data; StatusType codes are stored +1
+NO_DATA = 0
+
+# Column files, each shaped (days, capacity, periods)
+COLUMNS = {
+    "status": np.uint8,
+    "location": np.uint32,
+    "detail": np.uint32,
+}
+
+
+class AttendanceArchive:
+    """Day-major archive of decoded attendance backed by memory-mapped arrays.
+
+    Each day is one fixed-size row per column file, so day and range queries
+    only touch the pages for those days. Locations and details are stored as
+    ids into a string table kept in the metadata file. When more staff are
+    archived than the rows have slots for, the column files are rewritten
+    with twice the slots.
+    """
+
+    def __init__(self, path: str = None, capacity: int = None):
+        """Initialize the archive.
+
+        Args:
+            path: Directory holding the archive files
+            capacity: Staff slots per day of a new archive, doubled when full
+        """
+        self.path = path or settings.attendance_archive_path
+        os.makedirs(self.path, exist_ok=True)
+
+        self._meta_path = os.path.join(self.path, "meta.json")
+        meta = self._load_meta()
+        self.start: Optional[date] = date.fromisoformat(meta["start"]) if meta.get("start") else None
+        self.days: int = meta.get("days", 0)
+        self.capacity: int = meta.get("capacity") or capacity or settings.attendance_archive_capacity
+        self.staff: List[str] = meta.get("staff", [])
+        self.strings: List[str] = meta.get("strings", [""])
+
+        self._staff_index: Dict[str, int] = {name: idx for idx, name in enumerate(self.staff)}
+        self._string_index: Dict[str, int] = {value: idx for idx, value in enumerate(self.strings)}
+        self._arrays: Dict[str, np.memmap] = {}
+        # Appends run on worker threads and replace the memory maps
+        self._lock = threading.Lock()
+
+    def _load_meta(self) -> dict:
+        """Load the archive metadata, if present."""
+        if not os.path.exists(self._meta_path):
+            return {}
+        with open(self._meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_meta(self) -> None:
+        """Atomically write the archive metadata."""
+        meta = {
+            "start": self.start.isoformat() if self.start else None,
+            "days": self.days,
+            "capacity": self.capacity,
+            "staff": self.staff,
+            "strings": self.strings,
+        }
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def _column_path(self, column: str) -> str:
+        return os.path.join(self.path, f"{column}.bin")
+
+    def _row_shape(self) -> Tuple[int, int]:
+        return (self.capacity, len(PERIODS))
+
+    def _array(self, column: str) -> Optional[np.memmap]:
+        """Get the read-only memory map of a column file."""
+        if self.days == 0:
+            return None
+        if column not in self._arrays:
+            self._arrays[column] = np.memmap(
+                self._column_path(column),
+                dtype=COLUMNS[column],
+                mode="r",
+                shape=(self.days, *self._row_shape()),
+            )
+        return self._arrays[column]
+
+    def _intern(self, value: Optional[str]) -> int:
+        """Get the string table id of a value, adding it if new."""
+        if not value:
+            return 0
+        idx = self._string_index.get(value)
+        if idx is None:
+            idx = len(self.strings)
+            self.strings.append(value)
+            self._string_index[value] = idx
+        return idx
+
+    def _staff_slot(self, name: str) -> int:
+        """Get the slot of a staff member, assigning a new one if needed."""
+        idx = self._staff_index.get(name)
+        if idx is None:
+            idx = len(self.staff)
+            self.staff.append(name)
+            self._staff_index[name] = idx
+        return idx
+
+    def _grow(self, needed: int) -> None:
+        """Rewrite the column files with enough staff slots for `needed` staff."""
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        self._arrays.clear()
+        if self.days:
+            tmp_paths = {}
+            for column, dtype in COLUMNS.items():
+                old = np.fromfile(self._column_path(column), dtype=dtype).reshape(self.days, *self._row_shape())
+                grown = np.zeros((self.days, capacity, len(PERIODS)), dtype=dtype)
+                grown[:, : self.capacity] = old
+                tmp_paths[column] = self._column_path(column) + ".tmp"
+                grown.tofile(tmp_paths[column])
+            for column, tmp_path in tmp_paths.items():
+                os.replace(tmp_path, self._column_path(column))
+        logger.info(f"Attendance archive grown from {self.capacity} to {capacity} staff slots")
+        self.capacity = capacity
+        self._save_meta()
+
+    def _day_index(self, day: date) -> int:
+        return (day - self.start).days
+
+    def append(self, day: date, roster: StaffRoster) -> None:
+        """Write the attendance of a day, replacing any existing entry.
+
+        Args:
+            day: Date of the attendance
+            roster: Staff roster returned by GoogleSheetsService.get_staff_list
+        """
+        with self._lock:
+            self._append(day, roster)
+
+    def _append(self, day: date, roster: StaffRoster) -> None:
+        """Write the attendance of a day, holding the archive lock."""
+        if self.start is None:
+            self.start = day
+        if day < self.start:
+            raise ValueError(f"Cannot archive {day} before archive start {self.start}")
+
+        slots = [self._staff_slot(record.name) for record in roster]
+        if len(self.staff) > self.capacity:
+            self._grow(len(self.staff))
+
+        shape = self._row_shape()
+        rows = {column: np.zeros(shape, dtype=dtype) for column, dtype in COLUMNS.items()}
+        for slot, record in zip(slots, roster):
+            status = record.status
+            for period_idx, period in enumerate(PERIODS):
+                rows["status"][slot, period_idx] = STATUS_CODES[status.status_for(period)] + 1
+                rows["location"][slot, period_idx] = self._intern(status.location_for(period))
+                rows["detail"][slot, period_idx] = self._intern(status.details)
+
+        day_idx = self._day_index(day)
+        days = max(self.days, day_idx + 1)
+        for column, dtype in COLUMNS.items():
+            row_bytes = rows[column].nbytes
+            column_path = self._column_path(column)
+            if not os.path.exists(column_path):
+                open(column_path, "wb").close()
+            with open(column_path, "r+b") as f:
+                f.truncate(days * row_bytes)
+                f.seek(day_idx * row_bytes)
+                f.write(rows[column].tobytes())
+
+        self.days = days
+        self._arrays.clear()
+        self._save_meta()
+        logger.info(f"Archived attendance for {day} ({len(roster)} staff)")
+
+    def _decode(self, codes: np.ndarray, locations: np.ndarray, details: np.ndarray) -> Optional[StatusRecord]:
+        """Decode one staff slot (AM and PM) into a StatusRecord."""
+        if codes[0] == NO_DATA:
+            return None
+
+        am_status, pm_status = STATUS_TYPES[codes[0] - 1], STATUS_TYPES[codes[1] - 1]
+        am_location = LocationRecord(location=self.strings[locations[0]]) if locations[0] else None
+        pm_location = LocationRecord(location=self.strings[locations[1]]) if locations[1] else None
+        detail = self.strings[details[0]] or None
+
+        if am_status == pm_status and am_location == pm_location:
+            return StatusRecord(status_type=am_status, location=am_location, details=detail)
+        return StatusRecord(
+            status_type=am_status,
+            details=detail,
+            am_pm_split=True,
+            am_status=am_status,
+            am_location=am_location,
+            pm_status=pm_status,
+            pm_location=pm_location,
+        )
+
+    def _clamp(self, start: date, end: date) -> Tuple[int, int]:
+        """Convert a date range into a slice of archived day indices."""
+        if self.start is None:
+            return 0, 0
+        first = max(self._day_index(start), 0)
+        last = min(self._day_index(end) + 1, self.days)
+        return first, max(first, last)
+
+    def get_range(self, start: date, end: date) -> Dict[date, Dict[str, StatusRecord]]:
+        """Get the archived attendance of every staff member in a date range.
+
+        Args:
+            start: First date (inclusive)
+            end: Last date (inclusive)
+
+        Returns:
+            Mapping of date to {staff name: StatusRecord}
+        """
+        with self._lock:
+            return self._get_range(start, end)
+
+    def _get_range(self, start: date, end: date) -> Dict[date, Dict[str, StatusRecord]]:
+        """Get the archived attendance of a date range, holding the archive lock."""
+        first, last = self._clamp(start, end)
+        if first >= last:
+            return {}
+
+        codes = self._array("status")[first:last]
+        locations = self._array("location")[first:last]
+        details = self._array("detail")[first:last]
+
+        result: Dict[date, Dict[str, StatusRecord]] = {}
+        for offset in range(last - first):
+            day_result = {}
+            for slot, name in enumerate(self.staff):
+                status = self._decode(codes[offset, slot], locations[offset, slot], details[offset, slot])
+                if status is not None:
+                    day_result[name] = status
+            if day_result:
+                result[self.start + timedelta(days=first + offset)] = day_result
+        return result
+
+    def get_day(self, day: date) -> Dict[str, StatusRecord]:
+        """Get the archived attendance of every staff member on a date.
+
+        Args:
+            day: Date to look up
+
+        Returns:
+            Mapping of staff name to StatusRecord
+        """
+        return self.get_range(day, day).get(day, {})
+
+    def get_person(self, name: str, start: date, end: date) -> List[Tuple[date, StatusRecord]]:
+        """Get the archived attendance of one staff member in a date range.
+
+        Args:
+            name: Staff name as stored in the roster
+            start: First date (inclusive)
+            end: Last date (inclusive)
+
+        Returns:
+            Chronological (date, StatusRecord) pairs
+        """
+        with self._lock:
+            return self._get_person(name, start, end)
+
+    def _get_person(self, name: str, start: date, end: date) -> List[Tuple[date, StatusRecord]]:
+        """Get the archived attendance of one staff member, holding the archive lock."""
+        slot = self._staff_index.get(name)
+        first, last = self._clamp(start, end)
+        if slot is None or first >= last:
+            return []
+
+        codes = self._array("status")[first:last, slot]
+        locations = self._array("location")[first:last, slot]
+        details = self._array("detail")[first:last, slot]
+
+        result = []
+        for offset in range(last - first):
+            status = self._decode(codes[offset], locations[offset], details[offset])
+            if status is not None:
+                result.append((self.start + timedelta(days=first + offset), status))
+        return result
@@ -1,16 +1,31 @@
 """Telegram bot command handler."""
 import asyncio
+import re
+import signal
+import time
 from datetime import date
-from typing import Optional
+from functools import wraps
+from typing import Awaitable, Callable, List, Optional, Tuple
 
 from loguru import logger
 from telegram import Update
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.constants import ChatAction
+from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters
 
 from app.config import settings
+from app.models.history import StatusSegment
+from app.models.staff import STATUS_BY_VALUE, StatusType
+from app.services.attendance_archive import AttendanceArchive
 from app.services.message_builder import MessageBuilderService
+from app.services.parade_history import ParadeHistory
 from app.services.google_sheets import GoogleSheetsService
+from app.services.sheet_watcher import SheetWatcher
+from app.services.status_index import StatusIndex
 from app.services.telegram_service import TelegramService
+from app.services.update_processor import ChatOrderedUpdateProcessor
+from app.utils.date_helpers import get_local_date, parse_day_range
+from app.utils.metrics import metrics, start_metrics_server
+from app.utils.profiling import profiler
 
 class BotHandler:
     """Handler for Telegram bot commands."""
@@ -19,39 +34,123 @@ class BotHandler:
         """Initialize the bot handler."""
         self.token = settings.telegram_bot_token
         self.chat_id = settings.telegram_chat_id
-        self.application = Application.builder().token(self.token).build()
+        builder = Application.builder().token(self.token)
+        if settings.telegram_api_base_url:
+            builder = builder.base_url(settings.telegram_api_base_url)
+        self.update_processor = ChatOrderedUpdateProcessor(
+            workers=settings.concurrent_updates,
+            max_in_flight=settings.max_in_flight_updates,
+            on_reject=self._reply_busy,
+        )
+        builder = builder.concurrent_updates(self.update_processor)
+        self.application = builder.build()
+        self._stop_event = asyncio.Event()
+        self._fresh_draft: Optional[asyncio.Task] = None
         
         # Set up services
         self.google_sheets_service = GoogleSheetsService()
         self.telegram_service = TelegramService()
         self.message_builder = MessageBuilderService(
             google_sheets_service=self.google_sheets_service,
-            telegram_service=self.telegram_service
+            telegram_service=self.telegram_service,
+            attendance_archive=AttendanceArchive() if settings.attendance_archive_path else None,
+            parade_history=ParadeHistory() if settings.parade_history_path else None,
         )
+        self.sheet_watcher: Optional[SheetWatcher] = None
+        if settings.sheet_watch_interval > 0:
+            self.sheet_watcher = SheetWatcher(
+                self.google_sheets_service,
+                self.telegram_service,
+                interval=settings.sheet_watch_interval,
+                max_interval=settings.sheet_watch_max_interval,
+                jitter=settings.sheet_watch_jitter,
+            )
         
         # Register command handlers
-        self.application.add_handler(CommandHandler("draft", self.handle_draft))
-        self.application.add_handler(CommandHandler("send", self.handle_send))
-        self.application.add_handler(CommandHandler("help", self.handle_help))
+        self._add_command("draft", self.handle_draft)
+        self._add_command("send", self.handle_send)
+        self._add_command("whereis", self.handle_whereis)
+        self._add_command("who", self.handle_who)
+        self._add_command("lint", self.handle_lint)
+        self._add_command("history", self.handle_history)
+        self._add_command("status", self.handle_status)
+        self._add_command("metrics", self.handle_metrics)
+        self._add_command("profile", self.handle_profile)
+        self._add_command("help", self.handle_help)
+
+        # DI lists are read from the incoming posts; getUpdates is left to the updater (or unusable with a webhook)
+        self.telegram_service.receives_updates = True
+        self.application.add_handler(
+            MessageHandler(filters.Regex(re.compile(r"/DI LIST", re.IGNORECASE)), self.telegram_service.handle_di_message)
+        )
+
+    def _add_command(
+        self,
+        command: str,
+        handler: Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[None]],
+    ) -> None:
+        """Register a command handler that records its latency.
+
+        Args:
+            command: Command name without the leading slash
+            handler: Handler coroutine function
+        """
+
+        @wraps(handler)
+        async def timed_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+            metrics.increment("commands_total", command=command)
+            with metrics.timer(f"command_{command}"):
+                await handler(update, context)
+
+        self.application.add_handler(CommandHandler(command, timed_handler))
+
+    @staticmethod
+    async def _reply_busy(update: object) -> None:
+        """Answer an update rejected by admission control."""
+        if isinstance(update, Update) and update.effective_message is not None:
+            await update.effective_message.reply_text("⏳ The bot is busy right now, please try again in a moment.")
+
+    async def _fresh_draft_message(self) -> str:
+        """Generate today's parade state, sharing one generation between concurrent drafts."""
+        if self._fresh_draft is None or self._fresh_draft.done():
+            self._fresh_draft = asyncio.create_task(self.message_builder.generate_message())
+        # Shielded so one impatient caller cannot cancel the others' result
+        return await asyncio.shield(self._fresh_draft)
 
     async def handle_draft(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        """Handle /draft command - generate a parade state draft."""
+        """Handle /draft command - reply at once, then edit the reply into the parade state draft."""
+        received = time.perf_counter()
+        chat_id = update.effective_chat.id
+        logger.info(f"Draft command received from chat {chat_id}")
+
+        typing = asyncio.create_task(context.bot.send_chat_action(chat_id=chat_id, action=ChatAction.TYPING))
         try:
-            chat_id = update.effective_chat.id
-            logger.info(f"Draft command received from chat {chat_id}")
-            
-            # Generate the parade state message
-            message = await self.message_builder.generate_message()
-            
-            # Send as a reply
-            await update.message.reply_text(
-                text="📋 Draft Parade State:\n\n" + message
-            )
-            
-            logger.info(f"Draft sent to chat {chat_id}")
-        except Exception as e:
-            logger.error(f"Error handling draft command: {e}")
-            await update.message.reply_text(f"Error generating draft: {str(e)}")
+            placeholder = await update.message.reply_text("⏳ Generating parade state draft...")
+            metrics.observe("draft_first_response", time.perf_counter() - received)
+
+            # Show the last snapshot while the fresh data is fetched
+            shown = None
+            if settings.draft_snapshot_first and self.google_sheets_service.snapshot is not None:
+                try:
+                    shown = await self.message_builder.generate_message(from_snapshot=True)
+                    await placeholder.edit_text("📋 Draft Parade State:\n\n" + shown)
+                except Exception as e:
+                    logger.warning(f"Could not show draft from snapshot: {e}")
+                    shown = None
+
+            try:
+                message = await self._fresh_draft_message()
+                if message != shown:
+                    await placeholder.edit_text("📋 Draft Parade State:\n\n" + message)
+                logger.info(f"Draft sent to chat {chat_id}")
+            except Exception as e:
+                logger.error(f"Error handling draft command: {e}")
+                if shown is not None:
+                    await placeholder.edit_text(f"📋 Draft Parade State:\n\n{shown}\n\n⚠️ Could not refresh: {e}")
+                else:
+                    await placeholder.edit_text(f"Error generating draft: {str(e)}")
+        finally:
+            await asyncio.gather(typing, return_exceptions=True)
 
     async def handle_send(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /send command - send parade state to configured chat."""
@@ -59,11 +158,11 @@ class BotHandler:
             chat_id = update.effective_chat.id
             logger.info(f"Send command received from chat {chat_id}")
             
-            # Generate the parade state message
-            message = await self.message_builder.generate_message()
+            # Generate the parade state
+            parade_state = await self.message_builder.generate_parade_state()
             
             # Send to configured chat
-            await self.telegram_service.send_message(message)
+            await self.message_builder.send_parade_state(parade_state, timeout=settings.command_deadline)
             
             # Confirm to the user
             await update.message.reply_text("✅ Parade state sent to the configured channel.")
@@ -73,6 +172,238 @@ class BotHandler:
             logger.error(f"Error handling send command: {e}")
             await update.message.reply_text(f"Error sending parade state: {str(e)}")
 
+    def _status_index(self, start: Optional[date] = None, end: Optional[date] = None) -> StatusIndex:
+        """Get the status index, parsing the sheet again if it is older than STATUS_INDEX_MAX_AGE.
+
+        The sheet is also read again (around ``start``) when the index does not
+        span the requested days, e.g. after a SHEET_WINDOW_DAYS read of another date.
+        Blocks on the fetch, so call it from a worker thread and query the index
+        while holding ``google_sheets_service.lock``.
+        """
+        service = self.google_sheets_service
+        index = service.status_index
+        start = start or get_local_date()
+        end = end or start
+        if (
+            index.refreshed_at is None
+            or time.monotonic() - index.refreshed_at > settings.status_index_max_age
+            or not index.covers(start, end)
+        ):
+            # Falls back to the snapshot if Sheets is unavailable
+            service.get_staff_list(target_date=start, timeout=settings.command_deadline)
+        return index
+
+    @staticmethod
+    def _split_day_range(args: List[str]) -> Tuple[List[str], date, date]:
+        """Split an optional trailing day or range off command arguments (default today)."""
+        today = get_local_date()
+        if args:
+            try:
+                return args[:-1], *parse_day_range(args[-1], today)
+            except ValueError:
+                pass
+        return args, today, today
+
+    @staticmethod
+    def _describe_segment(segment: Optional[StatusSegment]) -> str:
+        if segment is None:
+            return "no sheet data for this day"
+        if segment.status_type == StatusType.PRESENT:
+            return "Present"
+        return segment.format_span()
+
+    async def handle_whereis(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle /whereis <name> [day] command - show a staff member's status on a day."""
+        words, day, _ = self._split_day_range(context.args or [])
+        if not words:
+            await update.message.reply_text("Usage: /whereis <name> [today|tomorrow|DD/MM]")
+            return
+
+        service = self.google_sheets_service
+
+        def lookup() -> List[Tuple[str, Optional[StatusSegment], Optional[StatusSegment]]]:
+            index = self._status_index(day)
+            with service.lock:
+                matches = service.name_lookup.search(" ".join(words), limit=5)
+                # Equally good matches are all shown, e.g. a surname shared by several staff
+                return [(m.key, *index.where(m.key, day)) for m in matches if m.score == matches[0].score]
+
+        try:
+            found = await profiler.to_thread(lookup)
+        except Exception as e:
+            logger.error(f"Error loading statuses for /whereis: {e}")
+            await update.message.reply_text(f"Error reading the sheet: {str(e)}")
+            return
+
+        if not found:
+            await update.message.reply_text(f"No staff found matching '{' '.join(words)}'.")
+            return
+
+        lines = []
+        for key, am, pm in found:
+            if am == pm:
+                lines.append(f"{key}: {self._describe_segment(am)}")
+            else:
+                lines.append(f"{key}: {self._describe_segment(am)} (AM), {self._describe_segment(pm)} (PM)")
+        await update.message.reply_text(f"📍 {day.strftime('%d/%m/%Y')}\n" + "\n".join(lines))
+
+    async def handle_who(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle /who <status> [location] [day|range] command - list staff with a status."""
+        words, start, end = self._split_day_range(context.args or [])
+        status_type = STATUS_BY_VALUE.get(words[0].upper()) if words else None
+        if status_type is None:
+            await update.message.reply_text(
+                "Usage: /who <status> [location] [today|tomorrow|week|nextweek|DD/MM|DD/MM-DD/MM]\n"
+                f"Statuses: {', '.join(STATUS_BY_VALUE)}"
+            )
+            return
+        location = " ".join(words[1:]) or None
+
+        service = self.google_sheets_service
+
+        def lookup() -> Tuple[List[Tuple[str, List[StatusSegment]]], Optional[str]]:
+            index = self._status_index(start, end)
+            with service.lock:
+                found = index.who(status_type, start, end, location=location)
+                if index.covers(start, end):
+                    return found, None
+                if not index.dates:
+                    return found, "any day"
+                return found, f"{index.dates[0].strftime('%d/%m')}-{index.dates[-1].strftime('%d/%m')}"
+
+        try:
+            found, covered = await profiler.to_thread(lookup)
+        except Exception as e:
+            logger.error(f"Error loading statuses for /who: {e}")
+            await update.message.reply_text(f"Error reading the sheet: {str(e)}")
+            return
+
+        days = start.strftime("%d/%m") if start == end else f"{start.strftime('%d/%m')}-{end.strftime('%d/%m')}"
+        title = f"{status_type.value}{f' @ {location}' if location else ''} on {days}: {len(found)}"
+        lines = [
+            f"- {name}: {', '.join(segment.format_span() for segment in segments)}"
+            for name, segments in found
+        ]
+        if covered is not None:
+            lines.append(f"No sheet data outside {covered}")
+        await update.message.reply_text("\n".join([title, *lines]))
+
+    async def handle_lint(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle /lint command - report status cells the parser cannot read reliably."""
+        try:
+            report = await profiler.to_thread(
+                self.google_sheets_service.lint, timeout=settings.command_deadline, target_date=get_local_date()
+            )
+        except Exception as e:
+            logger.error(f"Error handling lint command: {e}")
+            await update.message.reply_text(f"Error scanning the sheet: {str(e)}")
+            return
+
+        if not report.issues:
+            await update.message.reply_text("✅ " + report.format_lines()[0])
+            return
+        # Telegram messages are limited to 4096 characters
+        text = "\n".join(report.format_lines())
+        if len(text) > 4000:
+            text = text[:4000].rsplit("\n", 1)[0] + "\n..."
+        await update.message.reply_text(text)
+
+    async def handle_history(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle /history <day|range|name> command - show archived parade states."""
+        history = self.message_builder.parade_history
+        if history is None:
+            await update.message.reply_text("Parade state history is disabled (set PARADE_HISTORY_PATH).")
+            return
+        query = " ".join(context.args or []).strip()
+        if not query:
+            await update.message.reply_text("Usage: /history <today|DD/MM[/YYYY]|DD/MM-DD/MM|name>")
+            return
+
+        try:
+            start, end = parse_day_range(query, get_local_date(), prefer_past=True)
+        except ValueError:
+            start = end = None
+
+        if start is not None and start == end:
+            state = history.state_for(start)
+            text = (
+                f"🗂 {state.format_summary()}\n\n{state.text}"
+                if state
+                else f"No parade state archived for {start.strftime('%d/%m/%Y')}."
+            )
+        elif start is not None:
+            states = history.states_between(start, end)
+            days = f"{start.strftime('%d/%m/%Y')}-{end.strftime('%d/%m/%Y')}"
+            text = (
+                "\n".join([f"🗂 {days}: {len(states)} archived day(s)", *(state.format_summary() for state in states)])
+                if states
+                else f"No parade states archived for {days}."
+            )
+        else:
+            entries = history.search_name(query)
+            text = (
+                "\n".join([f"🗂 '{query}' in the last {len(entries)} archived entries:", *(e.format_line() for e in entries)])
+                if entries
+                else f"No archived parade state mentions '{query}'."
+            )
+
+        # Telegram messages are limited to 4096 characters
+        if len(text) > 4000:
+            text = text[:4000].rsplit("\n", 1)[0] + "\n..."
+        await update.message.reply_text(text)
+
+    async def handle_status(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle /status command - show dependency health."""
+        snapshot = self.google_sheets_service.snapshot
+        snapshot_line = (
+            f"Sheet snapshot: as of {snapshot.fetched_at.strftime('%d/%m/%Y %H:%M')}"
+            if snapshot
+            else "Sheet snapshot: none"
+        )
+        status_text = "\n".join([
+            "Bot status:",
+            "",
+            self.google_sheets_service.breaker.describe(),
+            *(breaker.describe() for breaker in self.telegram_service.breakers.values()),
+            snapshot_line,
+            self.update_processor.describe(),
+            self.sheet_watcher.describe() if self.sheet_watcher else "Sheet watcher: off",
+        ])
+        await update.message.reply_text(status_text)
+
+    async def handle_metrics(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle /metrics command - show stage latency metrics."""
+        await update.message.reply_text(metrics.summary())
+
+    async def handle_profile(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle /profile [N|off] command - profile the next N parade state generations (admin only)."""
+        user = update.effective_user
+        if user is None or user.id not in settings.admin_ids:
+            await update.message.reply_text("⛔ /profile is restricted to admins.")
+            return
+
+        args = context.args or []
+        if args and args[0].lower() == "off":
+            profiler.disarm()
+            await update.message.reply_text("Profiling disabled.")
+            return
+        if profiler.armed and not args:
+            profiler.disarm()
+            await update.message.reply_text("Profiling disabled.")
+            return
+
+        try:
+            runs = int(args[0]) if args else settings.profile_runs
+        except ValueError:
+            await update.message.reply_text("Usage: /profile [N|off]")
+            return
+
+        profiler.arm(runs)
+        last = f"\nLast report: {profiler.last_reports[0]}" if profiler.last_reports else ""
+        await update.message.reply_text(
+            f"Profiling the next {runs} run(s). Reports go to {profiler.output_dir}.{last}"
+        )
+
     async def handle_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /help command - show available commands."""
         help_text = """
@@ -80,24 +411,93 @@ Available commands:
 
 /draft - Generate and see a draft of today's parade state
 /send - Send today's parade state to the configured channel
+/whereis <name> [day] - Show where a staff member is (today by default)
+/who <status> [location] [day|week] - List staff with a status, e.g. /who OL week
+/lint - Report unrecognized or ambiguous status cells in the sheet
+/history <day|range|name> - Show an archived parade state, a summary of each day in a range, or a staff member's past entries
+/status - Show Google Sheets and Telegram health and the update queue
+/metrics - Show fetch, parse, render and send latencies
+/profile [N|off] - Profile the next N parade state generations (admins only)
 /help - Show this help message
         """
         await update.message.reply_text(help_text)
 
+    def stop(self) -> None:
+        """Ask a running bot to shut down."""
+        self._stop_event.set()
+
+    def _install_signal_handlers(self) -> list:
+        """Stop the bot on SIGINT/SIGTERM.
+
+        Returns:
+            Signals whose handlers were installed
+        """
+        loop = asyncio.get_running_loop()
+        installed = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+                installed.append(sig)
+            except (NotImplementedError, RuntimeError):
+                # Not supported on this platform or outside the main thread;
+                # Ctrl+C then surfaces as KeyboardInterrupt/CancelledError
+                pass
+        return installed
+
     async def run(self) -> None:
-        """Run the bot."""
+        """Run the bot until stop() is called or SIGINT/SIGTERM is received.
+
+        Receives updates through the updater's webhook server when
+        TELEGRAM_WEBHOOK_URL is set, and by long polling otherwise.
+        """
         logger.info("Starting Telegram bot...")
+        if settings.telegram_webhook_url and not settings.webhook_secret_token:
+            raise ValueError("WEBHOOK_SECRET_TOKEN is required with TELEGRAM_WEBHOOK_URL")
+
+        installed_signals = self._install_signal_handlers()
         await self.application.initialize()
         await self.application.start()
-        await self.application.updater.start_polling()
-        
+
+        metrics_server = None
+        watcher_task = None
         try:
-            # Keep the bot running
-            while True:
-                await asyncio.sleep(1)
-        except (KeyboardInterrupt, SystemExit):
-            logger.info("Stopping Telegram bot...")
+            if settings.telegram_webhook_url:
+                # Registers the webhook and rejects posts without the secret token
+                await self.application.updater.start_webhook(
+                    listen=settings.webhook_listen,
+                    port=settings.webhook_port,
+                    url_path=settings.webhook_path,
+                    webhook_url=settings.telegram_webhook_url,
+                    secret_token=settings.webhook_secret_token,
+                    max_connections=max(1, min(100, settings.webhook_max_connections)),
+                    allowed_updates=Update.ALL_TYPES,
+                )
+                logger.info(f"Receiving updates via webhook {settings.telegram_webhook_url}")
+            else:
+                await self.application.updater.start_polling()
+                logger.info("Receiving updates via long polling")
+
+            if settings.metrics_port:
+                metrics_server = await start_metrics_server(metrics, settings.metrics_host, settings.metrics_port)
+
+            if self.sheet_watcher is not None:
+                watcher_task = asyncio.create_task(self.sheet_watcher.run(self._stop_event))
+
+            await self._stop_event.wait()
+        except (KeyboardInterrupt, SystemExit, asyncio.CancelledError):
+            pass
         finally:
-            await self.application.updater.stop()
+            logger.info("Stopping Telegram bot...")
+            loop = asyncio.get_running_loop()
+            for sig in installed_signals:
+                loop.remove_signal_handler(sig)
+            if watcher_task is not None:
+                watcher_task.cancel()
+                await asyncio.gather(watcher_task, return_exceptions=True)
+            if metrics_server is not None:
+                metrics_server.close()
+                await metrics_server.wait_closed()
+            if self.application.updater.running:
+                await self.application.updater.stop()
             await self.application.stop()
             await self.application.shutdown()
\ No newline at end of file
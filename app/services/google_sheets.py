@@ -1,40 +1,84 @@
 """Google Sheets service for fetching staff attendance data."""
+import hashlib
+import json
 import os
-import re
-from datetime import datetime, date
+import sys
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime, date, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 
 import pandas as pd
 import numpy as np
+import httplib2
 from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from loguru import logger
 
 from app.config import settings
+from app.models.history import StatusHistory
 from app.models.staff import (
-    StaffMember,
-    StaffList,
-    StaffStatus,
+    STATUS_BY_VALUE,
+    LocationRecord,
+    StaffIdentity,
+    StaffRecord,
+    StaffRoster,
+    StaffSynonym,
+    StatusRecord,
     StatusType,
-    LocationDetail
+    status_candidates,
 )
+from app.services.sheet_lint import LintReport, lint_cells
+from app.services.sheet_snapshot import SheetSnapshot, SheetSnapshotStore, values_digest
+from app.services.sheet_tabs import (
+    HEADER_ROWS,
+    SheetTab,
+    SheetTabIndex,
+    column_letter,
+    parse_header_dates,
+    quote_title,
+)
+from app.services.name_lookup import NameEntry, NameLookupService
+from app.services.staff_index import RANK_PATTERN, StaffIndex, load_active_staff, parse_identity, range_rows
+from app.services.status_index import StatusIndex
+from app.services.work_calendar import WorkCalendar, find_holidays
+from app.utils.metrics import metrics
+from app.utils.resilience import CircuitBreaker, Deadline
 
 
 class GoogleSheetsService:
     """Service for interacting with Google Sheets API."""
 
-    def __init__(self, credentials_file: str = None, active_staff_rows: List[int] = None):
+    def __init__(
+        self,
+        credentials_file: str = None,
+        active_staff: Optional[List[StaffSynonym]] = None,
+        service: Any = None,
+    ):
         """Initialize the Google Sheets service.
 
         Args:
             credentials_file: Path to the credentials JSON file
-            active_staff_rows: List of row numbers (1-indexed) for active staff members
+            active_staff: Active staff in parade order, defaults to the active staff file
+                (every named row in the names column if ACTIVE_STAFF_FILE is empty or missing)
+            service: Pre-built Sheets API client, skips credential loading (benchmarks, tests)
         """
         self.credentials_file = credentials_file or settings.google_credentials_file
         self.sheet_id = settings.google_sheet_id
         self.range = settings.google_sheet_range
-        self.active_staff_rows = active_staff_rows or settings.active_staff_rows
-        self.service = self._create_service()
+        self.active_staff = active_staff if active_staff is not None else load_active_staff(settings.active_staff_file)
+        if self.active_staff is None:
+            logger.info("No active staff file, listing every named row of the sheet")
+        # httplib2 is not thread-safe: requests built on this client run on
+        # the fetch worker threads, each with its own HTTP connection
+        self._credentials = None
+        self._http_local = threading.local()
+        self._per_thread_http = service is None
+        self.service = service if service is not None else self._create_service()
         
         # Status mappings based on logic_google_sheets.md
         self.status_mappings = {
@@ -49,6 +93,67 @@ class GoogleSheetsService:
         self.am_col_idx = 0
         self.pm_col_idx = 0
 
+        # Dated columns, indexed once per fetch and rebuilt only when the header rows change
+        self._date_columns: List[Tuple[date, int]] = []
+        self._date_column_lookup: Dict[date, int] = {}
+        self._date_header_key: Optional[Tuple[Tuple[Any, ...], Tuple[Any, ...]]] = None
+        self._date_columns_generation = -1
+        # (date, period) and column of every dated half-day slot, in sheet order
+        self._slot_keys: List[Tuple[date, str]] = []
+        self._slot_columns: List[int] = []
+        # Run-length status histories of the current fetch by DataFrame row
+        self._history_cache: Dict[int, StatusHistory] = {}
+        self._history_generation = -1
+        # (status type, location) of each status cell value seen, shared by all rows
+        self._decoded_cells: Dict[str, Tuple[StatusType, Optional[str]]] = {}
+
+        # Header and raw value rows of the last DataFrame, aligned with its positional
+        # index; the generation counts the DataFrames seen, i.e. the fetches
+        self._rows_frame: Optional[weakref.ref] = None
+        self._header: List[Any] = []
+        self._rows: List[List[Any]] = []
+        self._generation = 0
+        # Digest of the header and rows, computed on first use per fetch
+        self._digest: Optional[bytes] = None
+
+        # Name -> row index over the names column, rebuilt when the column changes
+        self.names_first_row, self.names_last_row = range_rows(settings.google_sheet_range_names)
+        self.staff_index: Optional[StaffIndex] = None
+        self._staff_rows: List[int] = []
+        self._staff_names: List[str] = []
+        # Name, rank, position and display of each resolved row, parsed once per names column
+        self._identities: List[StaffIdentity] = []
+
+        # Fuzzy name search over the resolved staff, updated with the name index
+        self.name_lookup = NameLookupService()
+        # Who has which status on which days, refreshed with every parsed sheet
+        self.status_index = StatusIndex()
+        # Working days (weekends only until the sheet's PH days are read)
+        today = date.today()
+        self.work_calendar = WorkCalendar(today.year, today.year, weekend_days=settings.weekend_day_list)
+        self._calendar_digest: Optional[bytes] = None
+
+        # Tabs by the dates they cover, when each date is read from its own tab
+        self.tab_index: Optional[SheetTabIndex] = None
+        self._tab_index_loaded_at: Optional[float] = None
+
+        # Last good sheet snapshot, loaded at startup and used when Sheets is unavailable.
+        # A fetch that misses its deadline keeps its worker until the socket
+        # timeout (GOOGLE_SHEETS_TIMEOUT) ends it.
+        self.fetch_timeout = settings.google_sheets_timeout
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sheets")
+        self.snapshot_store = SheetSnapshotStore()
+        self.snapshot: Optional[SheetSnapshot] = self.snapshot_store.load()
+        self._thread_state = threading.local()
+        # Guards the per-fetch parse state; fetches run outside it, so the bot
+        # can call the service from several worker threads at once
+        self.lock = threading.RLock()
+        self.breaker = CircuitBreaker(
+            "Google Sheets",
+            failure_threshold=settings.circuit_failure_threshold,
+            reset_timeout=settings.circuit_reset_timeout,
+        )
+
     def _create_service(self):
         """Create and return the Google Sheets service.
 
@@ -56,52 +161,416 @@ class GoogleSheetsService:
             Google Sheets API service
         """
         try:
+            # A local endpoint (e.g. the fake API server) is used without credentials
+            if settings.google_sheets_api_endpoint:
+                logger.info(f"Using Google Sheets API endpoint {settings.google_sheets_api_endpoint}")
+                return build(
+                    "sheets",
+                    "v4",
+                    http=self._new_http(),
+                    client_options={"api_endpoint": settings.google_sheets_api_endpoint},
+                    cache_discovery=False,
+                )
+
             # Check if the credentials file exists
             if not os.path.exists(self.credentials_file):
                 logger.error(f"Credentials file not found: {self.credentials_file}")
                 raise FileNotFoundError(f"Credentials file not found: {self.credentials_file}")
 
             # Create credentials from the service account file
-            credentials = service_account.Credentials.from_service_account_file(
+            self._credentials = service_account.Credentials.from_service_account_file(
                 self.credentials_file,
                 scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"],
             )
 
             # Build the service
-            service = build("sheets", "v4", credentials=credentials)
+            service = build("sheets", "v4", http=self._new_http(), cache_discovery=False)
             return service
 
         except Exception as e:
             logger.error(f"Error creating Google Sheets service: {e}")
             raise
 
-    def get_sheet_data(self) -> pd.DataFrame:
+    @property
+    def data_as_of(self) -> Optional[datetime]:
+        """Fetch time of the snapshot the calling thread last read, None for live data."""
+        return getattr(self._thread_state, "data_as_of", None)
+
+    @data_as_of.setter
+    def data_as_of(self, value: Optional[datetime]) -> None:
+        self._thread_state.data_as_of = value
+
+    def _new_http(self) -> httplib2.Http:
+        """Create an HTTP client with the fetch timeout, authorized with the credentials if any."""
+        http = httplib2.Http(timeout=settings.google_sheets_timeout)
+        if self._credentials is not None:
+            return AuthorizedHttp(self._credentials, http=http)
+        return http
+
+    def _thread_http(self) -> httplib2.Http:
+        """Get the HTTP client of the calling worker thread, creating it on first use."""
+        http = getattr(self._http_local, "http", None)
+        if http is None:
+            http = self._http_local.http = self._new_http()
+        return http
+
+    def _execute(self, request: Any, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Execute a Sheets API request through the circuit breaker.
+
+        Args:
+            request: Prepared API request
+            timeout: Seconds to wait, capped at the configured fetch timeout
+
+        Returns:
+            Response body
+        """
+        self.breaker.check()
+        timeout = self.fetch_timeout if timeout is None else min(timeout, self.fetch_timeout)
+        try:
+            if self._per_thread_http:
+                future = self._executor.submit(lambda: request.execute(http=self._thread_http()))
+            else:
+                future = self._executor.submit(request.execute)
+            result = future.result(timeout=timeout)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.record_abandoned()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def _fetch_values(self, timeout: Optional[float] = None, target_date: Optional[date] = None) -> List[List[str]]:
+        """Fetch the raw cell values through the circuit breaker.
+
+        Args:
+            timeout: Seconds to wait, capped at the configured fetch timeout
+            target_date: Date whose tab is read when GOOGLE_SHEET_AUTO_TABS is set, defaults to today
+
+        Returns:
+            Raw cell values as returned by the Sheets API
+        """
+        if settings.google_sheet_auto_tabs:
+            target_date = target_date or date.today()
+            return self._fetch_tab_values([target_date], timeout)[target_date]
+
+        with metrics.timer("sheets_fetch"):
+            request = self.service.spreadsheets().values().get(spreadsheetId=self.sheet_id, range=self.range)
+            result = self._execute(request, timeout)
+        return result.get("values", [])
+
+    def get_tab_index(self, target_dates: List[date] = (), timeout: Optional[float] = None) -> SheetTabIndex:
+        """Get the date -> tab index, reading the spreadsheet metadata when needed.
+
+        The index is read again once SHEET_METADATA_TTL has passed, or when a
+        date falls past every tab (a new tab may have been added since), at
+        most once a minute.
+
+        Args:
+            target_dates: Dates the index must cover
+            timeout: Seconds the metadata reads may take in total
+
+        Returns:
+            SheetTabIndex of the spreadsheet
+        """
+        now = time.monotonic()
+        age = None if self._tab_index_loaded_at is None else now - self._tab_index_loaded_at
+        stale = age is None or age > settings.sheet_metadata_ttl
+        uncovered = any(not self.tab_index.covers(day) for day in target_dates) if not stale else False
+        if not stale and not (uncovered and age > 60):
+            return self.tab_index
+
+        deadline = Deadline(self.fetch_timeout if timeout is None else timeout)
+        with metrics.timer("sheets_metadata"):
+            request = self.service.spreadsheets().get(
+                spreadsheetId=self.sheet_id,
+                fields="sheets(properties(title,gridProperties(rowCount,columnCount)))",
+            )
+            sheets = [sheet["properties"] for sheet in self._execute(request, deadline.remaining()).get("sheets", [])]
+
+            # Header rows of every tab in one call
+            header_ranges = [
+                f"{quote_title(props['title'])}!A1:"
+                f"{column_letter(max(props['gridProperties'].get('columnCount', 1) - 1, 0))}{HEADER_ROWS}"
+                for props in sheets
+            ]
+            request = self.service.spreadsheets().values().batchGet(spreadsheetId=self.sheet_id, ranges=header_ranges)
+            value_ranges = self._execute(request, deadline.remaining()).get("valueRanges", [])
+
+        tabs = [
+            SheetTab(
+                title=props["title"],
+                row_count=props["gridProperties"].get("rowCount", 0),
+                column_count=props["gridProperties"].get("columnCount", 0),
+                date_columns=tuple(parse_header_dates(value_range.get("values", []))),
+            )
+            for props, value_range in zip(sheets, value_ranges)
+        ]
+        self.tab_index = SheetTabIndex(tabs)
+        self._tab_index_loaded_at = now
+        logger.info(
+            "Indexed {} dated tabs: {}",
+            len(self.tab_index),
+            ", ".join(f"{tab.title} ({tab.first_date:%d/%m/%Y}-{tab.last_date:%d/%m/%Y})" for tab in tabs if tab.date_columns),
+        )
+        return self.tab_index
+
+    def _fetch_tab_values(self, target_dates: List[date], timeout: Optional[float] = None) -> Dict[date, List[List[str]]]:
+        """Read the tabs covering some dates in one batched call.
+
+        Each tab is read from column A to the end of its grid, or with
+        SHEET_WINDOW_DAYS set, only the names column and the columns of the
+        requested dates +/- the window; skipped columns are left empty so the
+        column positions match the tab.
+
+        Args:
+            target_dates: Dates to read
+            timeout: Seconds the reads may take in total
+
+        Returns:
+            Raw cell values of the tab covering each date
+        """
+        deadline = Deadline(self.fetch_timeout if timeout is None else timeout)
+        tab_index = self.get_tab_index(target_dates, deadline.remaining())
+
+        dates_by_tab: Dict[str, List[date]] = {}
+        for day in target_dates:
+            tab = tab_index.tab_for(day)
+            if tab is None:
+                raise LookupError(f"No tab of the spreadsheet has dates (looking for {day:%d/%m/%Y})")
+            dates_by_tab.setdefault(tab.title, []).append(day)
+
+        # (tab, first column of the window, index of its names range or None)
+        plan: List[Tuple[SheetTab, int, Optional[int]]] = []
+        ranges: List[str] = []
+        window = timedelta(days=settings.sheet_window_days)
+        for title, days in dates_by_tab.items():
+            tab = tab_index.tabs[title]
+            first_col, last_col = 0, max(tab.column_count - 1, 0)
+            if settings.sheet_window_days > 0:
+                first_col, last_col = tab.column_window(min(days) - window, max(days) + window)
+            names_range = None
+            if first_col > 1:
+                names_range = len(ranges)
+                ranges.append(f"{quote_title(title)}!A1:A{tab.row_count}")
+            else:
+                first_col = 0
+            plan.append((tab, first_col, names_range))
+            ranges.append(f"{quote_title(title)}!{column_letter(first_col)}1:{column_letter(last_col)}{tab.row_count}")
+
+        with metrics.timer("sheets_fetch"):
+            request = self.service.spreadsheets().values().batchGet(spreadsheetId=self.sheet_id, ranges=ranges)
+            value_ranges = self._execute(request, deadline.remaining()).get("valueRanges", [])
+
+        values_by_tab: Dict[str, List[List[str]]] = {}
+        index = 0
+        for tab, first_col, names_range in plan:
+            if names_range is not None:
+                names = value_ranges[index].get("values", [])
+                index += 1
+            window_values = value_ranges[index].get("values", [])
+            index += 1
+            if names_range is None:
+                values_by_tab[tab.title] = window_values
+                continue
+            padding = [""] * (first_col - 1)
+            values_by_tab[tab.title] = [
+                (names[row][:1] if row < len(names) and names[row] else [""])
+                + (padding + window_values[row] if row < len(window_values) and window_values[row] else [])
+                for row in range(max(len(names), len(window_values)))
+            ]
+        return {day: values_by_tab[tab_index.tab_for(day).title] for day in target_dates}
+
+    def day_digest(self, target_date: date, timeout: Optional[float] = None) -> Optional[str]:
+        """Hash the names column and a date's AM/PM columns, without reading the rest of the sheet.
+
+        Both ranges are read in one batched call, a few kilobytes however
+        wide the sheet is, so the digest is cheap enough to poll. The columns
+        come from the last header read, so the sheet (or with
+        GOOGLE_SHEET_AUTO_TABS, the tab metadata) must have been read once.
+
+        Args:
+            target_date: Date whose columns are hashed
+            timeout: Seconds the read may take
+
+        Returns:
+            Hex digest, or None if the date's columns are not known yet
+        """
+        if settings.google_sheet_auto_tabs:
+            tab = self.tab_index.tab_for(target_date) if self.tab_index is not None else None
+            am_col = dict(tab.date_columns).get(target_date) if tab is not None else None
+            if am_col is None:
+                return None
+            title = quote_title(tab.title)
+            first_row, last_row = 1, tab.row_count
+            names_range = f"{title}!A1:A{tab.row_count}"
+        else:
+            am_col = self._date_column_lookup.get(target_date)
+            if am_col is None:
+                return None
+            title = self.range.rsplit("!", 1)[0]
+            first_row, last_row = range_rows(self.range)
+            names_range = settings.google_sheet_range_names
+
+        ranges = [
+            names_range,
+            f"{title}!{column_letter(am_col)}{first_row}:{column_letter(am_col + 1)}{last_row or ''}",
+        ]
+        with metrics.timer("sheets_digest"):
+            request = self.service.spreadsheets().values().batchGet(spreadsheetId=self.sheet_id, ranges=ranges)
+            value_ranges = self._execute(request, timeout).get("valueRanges", [])
+        payload = json.dumps([value_range.get("values", []) for value_range in value_ranges])
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def _values_to_dataframe(self, values: List[List[str]]) -> pd.DataFrame:
+        """Convert raw cell values to a DataFrame with the first row as headers.
+
+        Args:
+            values: Raw cell values
+
+        Returns:
+            DataFrame containing the spreadsheet data
+        """
+        # Convert to pandas DataFrame
+        df = pd.DataFrame(values)
+
+        # Set the first row as column headers if it contains headers
+        if df.shape[0] > 0:
+            df = df.rename(columns=df.iloc[0]).drop(df.index[0])
+
+        self._remember_rows(df, values[0] if values else [], values[1:])
+        return df
+
+    def _remember_rows(self, df: pd.DataFrame, header: List[Any], rows: List[List[Any]]) -> None:
+        self._rows_frame = weakref.ref(df)
+        self._header = header
+        self._rows = rows
+        self._generation += 1
+        self._digest = None
+
+    def _values_digest(self) -> bytes:
+        """Digest of the header and rows of the current fetch, computed once per fetch."""
+        if self._digest is None:
+            self._digest = values_digest([self._header, *self._rows])
+        return self._digest
+
+    def _raw_rows(self, df: pd.DataFrame) -> List[List[Any]]:
+        """Get the cell rows of a DataFrame as plain lists.
+
+        Row access through ``df.iloc`` costs milliseconds on a wide sheet, so
+        parsing works on the raw API rows kept from ``_values_to_dataframe``.
+        Rows may be shorter than the sheet (the API drops trailing empty cells).
+
+        Args:
+            df: DataFrame containing the spreadsheet data
+
+        Returns:
+            Rows aligned with the DataFrame's positional index
+        """
+        if self._rows_frame is None or self._rows_frame() is not df:
+            self._remember_rows(df, list(df.columns), df.to_numpy(dtype=object).tolist())
+        return self._rows
+
+    @staticmethod
+    def _cell(row: List[Any], col_idx: int) -> str:
+        """Get a cleaned cell value, empty for missing cells."""
+        if col_idx >= len(row):
+            return ""
+        value = row[col_idx]
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            return ""
+        return str(value).strip()
+
+    def _snapshot_covers(self, target_dates: List[date]) -> bool:
+        """Check that the last saved snapshot has columns for every date.
+
+        A snapshot of a SHEET_WINDOW_DAYS read only holds the days of its
+        window; the skipped columns are blank and must not be read as Present.
+        """
+        covered = {day for day, _ in self.snapshot.date_columns}
+        return all(day in covered for day in target_dates)
+
+    def _snapshot_dataframe(self) -> pd.DataFrame:
+        """Load the last saved snapshot and mark the data as of its fetch time."""
+        self.data_as_of = self.snapshot.fetched_at
+        df = self._values_to_dataframe(self.snapshot.values)
+        self._index_date_columns(df, known_columns=self.snapshot.date_columns)
+        return df
+
+    def get_sheet_data(
+        self, timeout: Optional[float] = None, from_snapshot: bool = False, target_date: Optional[date] = None
+    ) -> pd.DataFrame:
         """Fetch data from the Google Sheet and convert to pandas DataFrame.
 
+        Falls back to the last saved snapshot if the live fetch fails, misses
+        its deadline or the circuit breaker is open, and the snapshot has the
+        target date; ``data_as_of`` is then set to the snapshot time.
+
+        Args:
+            timeout: Seconds the fetch may take
+            from_snapshot: Skip the live fetch and read the last saved snapshot
+            target_date: Date whose tab is read when GOOGLE_SHEET_AUTO_TABS is set, defaults to today
+
         Returns:
             DataFrame containing the spreadsheet data
         """
+        values, error = self._fetch_or_error(timeout, from_snapshot, target_date)
+        with self.lock:
+            return self._sheet_dataframe(values, error, from_snapshot, target_date)
+
+    def _fetch_or_error(
+        self, timeout: Optional[float], from_snapshot: bool, target_date: Optional[date]
+    ) -> Tuple[Optional[List[List[str]]], Optional[Exception]]:
+        """Fetch the raw values without holding the lock, returning the error instead of raising it."""
+        if from_snapshot:
+            return None, None
         try:
-            sheet = self.service.spreadsheets()
-            result = sheet.values().get(spreadsheetId=self.sheet_id, range=self.range).execute()
-            values = result.get("values", [])
+            return self._fetch_values(timeout, target_date), None
+        except Exception as e:
+            return None, e
 
-            if not values:
-                logger.warning("No data found in the Google Sheet")
-                return pd.DataFrame()
+    def _sheet_dataframe(
+        self,
+        values: Optional[List[List[str]]],
+        error: Optional[Exception],
+        from_snapshot: bool,
+        target_date: Optional[date],
+    ) -> pd.DataFrame:
+        """Convert fetched values (or the snapshot they fall back to) to a DataFrame; call with the lock held."""
+        target_dates = [target_date] if target_date else []
+        if from_snapshot:
+            if self.snapshot is None:
+                raise LookupError("No sheet snapshot saved yet")
+            if not self._snapshot_covers(target_dates):
+                raise LookupError(
+                    f"The sheet snapshot as of {self.snapshot.fetched_at:%d/%m/%Y %H:%M} "
+                    f"has no data for {target_date:%d/%m/%Y}"
+                )
+            return self._snapshot_dataframe()
 
-            # Convert to pandas DataFrame
-            df = pd.DataFrame(values)
-            
-            # Set the first row as column headers if it contains headers
-            if df.shape[0] > 0:
-                df = df.rename(columns=df.iloc[0]).drop(df.index[0])
-                
-            return df
+        if error is not None:
+            if self.snapshot is None or not self._snapshot_covers(target_dates):
+                logger.error(f"Error fetching data from Google Sheet: {error}")
+                raise error
+            logger.warning(
+                f"Error fetching data from Google Sheet ({error!r}), "
+                f"using snapshot as of {self.snapshot.fetched_at:%d/%m/%Y %H:%M}"
+            )
+            metrics.increment("sheets_snapshot_fallbacks_total")
+            return self._snapshot_dataframe()
+
+        self.data_as_of = None
+        if not values:
+            logger.warning("No data found in the Google Sheet")
+            return pd.DataFrame()
 
+        df = self._values_to_dataframe(values)
+        try:
+            self.snapshot = self.snapshot_store.save(values, self._index_date_columns(df), self._values_digest())
         except Exception as e:
-            logger.error(f"Error fetching data from Google Sheet: {e}")
-            raise
+            logger.warning(f"Could not save sheet snapshot: {e}")
+        return df
 
     def find_date_columns(self, df: pd.DataFrame, target_date: date) -> Tuple[int, int]:
         """Find the AM and PM column indices for a specific date.
@@ -113,8 +582,14 @@ class GoogleSheetsService:
         Returns:
             Tuple of (am_column_index, pm_column_index)
         """
+        # Dated days are indexed once per header
+        self._index_date_columns(df)
+        col_idx = self._date_column_lookup.get(target_date)
+        if col_idx is not None:
+            return col_idx, col_idx + 1
+
         target_date_str = target_date.strftime("%d/%m/%Y")
-        
+
         # First, try to find exact date match in the header row
         for col in df.columns:
             if target_date_str in str(col):
@@ -135,30 +610,316 @@ class GoogleSheetsService:
         # (This would be updated based on actual sheet structure)
         return 1, 2  # Assuming columns 1 and 2 are the first AM/PM pair
 
-    def get_staff_list(self, target_date: Optional[date] = None) -> StaffList:
+    def _index_date_columns(
+        self, df: pd.DataFrame, known_columns: Optional[List[Tuple[date, int]]] = None
+    ) -> List[Tuple[date, int]]:
+        """Index the AM column of every dated day in the sheet.
+
+        The header rows are compared once per fetch, and the index is rebuilt
+        only when they change.
+
+        Args:
+            df: DataFrame containing the spreadsheet data
+            known_columns: Previously saved index for this sheet, used instead of scanning
+
+        Returns:
+            Chronologically sorted (date, am_column_index) pairs
+        """
+        rows = self._raw_rows(df)
+        if self._date_columns_generation == self._generation:
+            return self._date_columns
+        self._date_columns_generation = self._generation
+
+        header_key = (tuple(self._header), tuple(rows[0]) if rows else ())
+        if header_key == self._date_header_key:
+            return self._date_columns
+        if known_columns is not None:
+            self._set_date_columns(list(known_columns), header_key)
+        else:
+            self._set_date_columns(parse_header_dates([self._header, rows[0] if rows else []]), header_key)
+        return self._date_columns
+
+    def _set_date_columns(self, date_columns: List[Tuple[date, int]], header_key: tuple) -> None:
+        self._date_columns = date_columns
+        self._date_column_lookup = dict(date_columns)
+        self._date_header_key = header_key
+        self._slot_keys = [(day, period) for day, _ in date_columns for period in ("AM", "PM")]
+        self._slot_columns = [col for _, am_col in date_columns for col in (am_col, am_col + 1)]
+
+    def get_status_history(self, df: pd.DataFrame, df_row_idx: int) -> StatusHistory:
+        """Get the run-length encoded status history of a staff row.
+
+        Each row is parsed at most once per fetch; the histories of the
+        previous fetch are dropped with it.
+
+        Args:
+            df: DataFrame containing the spreadsheet data
+            df_row_idx: 0-indexed DataFrame row of the staff member
+
+        Returns:
+            StatusHistory for the row
+        """
+        self._index_date_columns(df)
+        if self._history_generation != self._generation:
+            self._history_cache.clear()
+            self._history_generation = self._generation
+            # Cell values are few; keep their decoding across fetches unless the sheet is unusually varied
+            if len(self._decoded_cells) > 4096:
+                self._decoded_cells.clear()
+        history = self._history_cache.get(df_row_idx)
+        if history is not None:
+            return history
+
+        raw_row = self._raw_rows(df)[df_row_idx]
+        width = len(raw_row)
+        decoded = self._decoded_cells
+        values = []
+        for col_idx in self._slot_columns:
+            value = raw_row[col_idx] if col_idx < width else ""
+            slot = decoded.get(value) if isinstance(value, str) else None
+            if slot is None:
+                cell = self._cell(raw_row, col_idx)
+                slot = decoded.get(cell)
+                if slot is None:
+                    status = self._parse_status_string(cell)
+                    slot = decoded[cell] = (status.status_type, status.location.location if status.location else None)
+                if isinstance(value, str):
+                    decoded[value] = slot
+            values.append(slot)
+
+        history = StatusHistory.from_slot_values(self._slot_keys, values)
+        self._history_cache[df_row_idx] = history
+        return history
+
+    def _fill_run_end_date(self, status: StatusRecord, history: StatusHistory, target_date: date) -> StatusRecord:
+        """Fill in the end date of a status from the end of its current run.
+
+        Args:
+            status: Parsed status for the target date
+            history: Status history of the staff row
+            target_date: The target date for the status
+
+        Returns:
+            StatusRecord with end_date set if the run continues past the target date
+        """
+        if status.end_date is not None:
+            return status
+
+        # The PM half decides whether the status carries on to the next day
+        period = "PM" if status.am_pm_split else "AM"
+        if status.status_for(period) == StatusType.PRESENT:
+            return status
+
+        segment = history.segment_at(target_date, period)
+        if segment is None:
+            return status
+        # A run resuming with the same status on the next working day carries
+        # on over the weekend or holiday in between, even if those cells are blank
+        while segment.end_period == "PM":
+            resumed = history.segment_at(self.work_calendar.next_working_day(segment.end), "AM")
+            if resumed is None or (resumed.status_type, resumed.location) != (segment.status_type, segment.location):
+                break
+            segment = resumed
+
+        if segment.end > target_date:
+            return replace(status, end_date=segment.end)
+        return status
+
+    def get_staff_list(
+        self, target_date: Optional[date] = None, timeout: Optional[float] = None, from_snapshot: bool = False
+    ) -> StaffRoster:
         """Fetch and parse the staff list from Google Sheets for a specific date.
 
         Args:
             target_date: The date to get staff status for, defaults to today
+            timeout: Seconds the sheet fetch may take
+            from_snapshot: Read the last saved snapshot instead of fetching
 
         Returns:
-            StaffList containing all staff members
+            StaffRoster containing all staff members
         """
         if target_date is None:
             target_date = date.today()
             
-        # Get the sheet data as DataFrame
-        df = self.get_sheet_data()
-        
-        # Find the columns for the target date
-        self.am_col_idx, self.pm_col_idx = self.find_date_columns(df, target_date)
-        
-        # Extract staff data for active rows
-        staff_list = self._extract_staff_data(df, target_date)
-        
+        # Fetch outside the lock, so a slow sheet does not hold up other callers
+        values, error = self._fetch_or_error(timeout, from_snapshot, target_date)
+
+        with self.lock:
+            # Get the sheet data as DataFrame
+            df = self._sheet_dataframe(values, error, from_snapshot, target_date)
+
+            with metrics.timer("sheets_parse"):
+                # Find the columns for the target date
+                self.am_col_idx, self.pm_col_idx = self.find_date_columns(df, target_date)
+                self.refresh_work_calendar(df)
+
+                # Extract staff data for active rows
+                staff_list = self._extract_staff_data(df, target_date)
+
+            with metrics.timer("status_index"):
+                self.refresh_status_index(df)
+
         return staff_list
 
-    def _extract_staff_data(self, df: pd.DataFrame, target_date: date) -> StaffList:
+    def get_staff_lists(self, target_dates: List[date], timeout: Optional[float] = None) -> Dict[date, StaffRoster]:
+        """Fetch and parse the staff lists of several dates.
+
+        With GOOGLE_SHEET_AUTO_TABS, the tabs covering the dates are read in
+        one batched call and a failed fetch is not answered from the snapshot
+        (it holds a single tab). Otherwise the sheet is read once for all
+        dates and, like get_staff_list, falls back to the snapshot if it has
+        every date.
+
+        Args:
+            target_dates: Dates to get staff status for
+            timeout: Seconds the sheet fetch may take
+
+        Returns:
+            StaffRoster of each date
+        """
+        target_dates = sorted(set(target_dates))
+        if settings.google_sheet_auto_tabs:
+            values_by_date = self._fetch_tab_values(target_dates, timeout)
+        else:
+            values, error = self._fetch_or_error(timeout, False, None)
+
+        with self.lock:
+            if settings.google_sheet_auto_tabs:
+                self.data_as_of = None
+            else:
+                df = self._sheet_dataframe(values, error, False, None)
+                if self.data_as_of is not None and not self._snapshot_covers(target_dates):
+                    raise LookupError(
+                        f"Google Sheets is unavailable and the snapshot as of {self.data_as_of:%d/%m/%Y %H:%M} "
+                        "does not have every requested date"
+                    )
+
+            rosters: Dict[date, StaffRoster] = {}
+            df_values = None
+            with metrics.timer("sheets_parse"):
+                for day in target_dates:
+                    # Dates are sorted, so each tab is converted once
+                    if settings.google_sheet_auto_tabs and values_by_date[day] is not df_values:
+                        df_values = values_by_date[day]
+                        df = self._values_to_dataframe(df_values)
+                    self.am_col_idx, self.pm_col_idx = self.find_date_columns(df, day)
+                    self.refresh_work_calendar(df)
+                    rosters[day] = self._extract_staff_data(df, day)
+        return rosters
+
+    def lint(self, timeout: Optional[float] = None, target_date: Optional[date] = None) -> LintReport:
+        """Scan every status cell of the staff rows for values the decoder cannot read reliably.
+
+        Args:
+            timeout: Seconds the sheet fetch may take
+            target_date: Date whose tab is scanned when GOOGLE_SHEET_AUTO_TABS is set, defaults to today
+
+        Returns:
+            LintReport of the sheet
+        """
+        values, error = self._fetch_or_error(timeout, False, target_date)
+        with self.lock:
+            df = self._sheet_dataframe(values, error, False, target_date)
+            date_columns = self._index_date_columns(df)
+            self.resolve_staff_rows(df)
+            staff_rows = {row: self.staff_index.cell(row) for row in set(self.staff_index.rows.values())}
+            with metrics.timer("sheets_lint"):
+                return lint_cells(self._raw_rows(df), date_columns, staff_rows, self.status_mappings)
+
+    def refresh_status_index(self, df: pd.DataFrame) -> int:
+        """Bring the status index up to date with a sheet.
+
+        Args:
+            df: DataFrame containing the spreadsheet data
+
+        Returns:
+            Number of staff re-indexed
+        """
+        rows = self.resolve_staff_rows(df)
+        histories = {name: self.get_status_history(df, row) for name, row in zip(self._staff_names, rows)}
+        changed = self.status_index.update((day for day, _ in self._date_columns), histories)
+        if changed:
+            logger.debug(f"Status index: re-indexed {changed} of {len(histories)} staff")
+        return changed
+
+    def refresh_work_calendar(self, df: pd.DataFrame) -> WorkCalendar:
+        """Bring the working-day calendar up to date with the PH days of a sheet.
+
+        The calendar spans the whole years of the sheet's dated days and is
+        rebuilt only when its span or holidays change. The holidays are only
+        searched again when the sheet values change.
+
+        Args:
+            df: DataFrame containing the spreadsheet data
+
+        Returns:
+            The current WorkCalendar
+        """
+        rows = self._raw_rows(df)
+        digest = self._values_digest()
+        if digest == self._calendar_digest:
+            return self.work_calendar
+        date_columns = self._index_date_columns(df)
+        holidays = find_holidays(rows, date_columns, self.resolve_staff_rows(df))
+        years = [day.year for day, _ in date_columns] or [date.today().year]
+        first_year, last_year = min(years), max(years)
+        calendar = self.work_calendar
+        if (
+            holidays != calendar.holidays
+            or calendar.start.year != first_year
+            or calendar.end.year != last_year
+        ):
+            self.work_calendar = WorkCalendar(first_year, last_year, holidays, settings.weekend_day_list)
+            logger.info(
+                f"Work calendar {first_year}-{last_year}: "
+                f"{len(holidays)} public holidays ({', '.join(f'{day:%d/%m/%Y}' for day in sorted(holidays))})"
+            )
+        self._calendar_digest = digest
+        return self.work_calendar
+
+    def resolve_staff_rows(self, df: pd.DataFrame) -> List[int]:
+        """Resolve the active staff to DataFrame rows by name.
+
+        The name index is rebuilt only when the names column changes, so an
+        inserted or moved row is picked up without shifting anyone else.
+
+        Args:
+            df: DataFrame containing the spreadsheet data
+
+        Returns:
+            DataFrame row indices of the active staff, in parade order
+        """
+        rows = self._raw_rows(df)
+        # Sheet row N (1-indexed) is DataFrame row N - 2, the first sheet row being the header
+        first = max(self.names_first_row - 2, 0)
+        last = len(rows) if self.names_last_row is None else min(self.names_last_row - 1, len(rows))
+        names = tuple(self._cell(row, 0) for row in rows[first:last])
+
+        if self.staff_index is None or self.staff_index.names != names:
+            self.staff_index = StaffIndex(names, first_row=first)
+            resolved = self.staff_index.resolve(self.active_staff)
+            self._staff_rows = [row for _, row in resolved]
+            self._staff_names = [staff.name for staff, _ in resolved]
+            self._identities = [parse_identity(self.staff_index.cell(row)) for row in self._staff_rows]
+            changed = self.name_lookup.update(self._name_entries(resolved))
+            logger.info(
+                f"Indexed {len(names)} rows of the names column, resolved {len(self._staff_rows)} active staff "
+                f"({changed} name lookup entries updated)"
+            )
+        return self._staff_rows
+
+    def _name_entries(self, resolved: List[Tuple[StaffSynonym, int]]) -> List[NameEntry]:
+        """Build name lookup entries from the resolved staff and their sheet names."""
+        entries = []
+        for staff, row in resolved:
+            cell = self.staff_index.cell(row)
+            rank_match = RANK_PATTERN.match(cell)
+            sheet_name = rank_match.group(2) if rank_match else cell
+            aliases = tuple(dict.fromkeys((sheet_name, *staff.synonyms)))
+            entries.append(NameEntry(key=staff.name, row=row, aliases=aliases))
+        return entries
+
+    def _extract_staff_data(self, df: pd.DataFrame, target_date: date) -> StaffRoster:
         """Extract staff data from the DataFrame.
 
         Args:
@@ -166,75 +927,56 @@ class GoogleSheetsService:
             target_date: The target date for the status
 
         Returns:
-            StaffList containing all staff members
+            StaffRoster containing all staff members
         """
-        staff_list = StaffList()
+        staff_records: List[StaffRecord] = []
         
         try:
-            # Process only the active staff rows
-            for staff_index, row_num in enumerate(sorted(self.active_staff_rows), 0):
-                # Convert to 0-indexed for DataFrame
-                df_row_idx = row_num -2 # idk why -2 but it works
-                
-                # Skip if row doesn't exist in DataFrame
-                if df_row_idx < 0 or df_row_idx >= len(df):
-                    logger.warning(f"Row {row_num} is out of range for the sheet data")
-                    continue
-                
-                # Extract staff info from row
-                name = str(df.iloc[df_row_idx, 0]) if 0 < len(df.columns) else ""
-                
-                # Get AM and PM status
-                am_status_str = str(df.iloc[df_row_idx, self.am_col_idx]) if self.am_col_idx < len(df.columns) else "P"
-                pm_status_str = str(df.iloc[df_row_idx, self.pm_col_idx]) if self.pm_col_idx < len(df.columns) else "P"
+            rows = self._raw_rows(df)
+            staff_rows = self.resolve_staff_rows(df)
+
+            # Process only the active staff rows, found by name
+            for staff_index, (df_row_idx, identity) in enumerate(zip(staff_rows, self._identities, strict=True)):
+                row = rows[df_row_idx]
                 
-                # Clean status strings
-                am_status_str = am_status_str.strip() if not pd.isna(am_status_str) else "P"
-                pm_status_str = pm_status_str.strip() if not pd.isna(pm_status_str) else "P"
+                # Get AM and PM status (missing cells are empty, i.e. present)
+                am_status_str = self._cell(row, self.am_col_idx)
+                pm_status_str = self._cell(row, self.pm_col_idx)
                 
                 # Check if AM/PM are different
                 am_pm_split = (am_status_str != pm_status_str) and (am_status_str != "" and pm_status_str != "")
                 
                 # Create the status object
                 staff_status = self._create_staff_status(am_status_str, pm_status_str, am_pm_split)
-                
-                # Determine position and rank from name if necessary
-                position = None
-                rank = None
-                
-                # Special positions like "Sch Comd", "OC MECH", etc.
-                if "Sch Comd" in name or "OC" in name or "CC" in name:
-                    position = name
-                else:
-                    # Extract rank if present (typical military ranks like ME3, etc.)
-                    rank_match = re.match(r'^(ME\d+|LTC|MAJ|CPT|LTA)\s+(.+)$', name)
-                    if rank_match:
-                        rank = rank_match.group(1)
-                        name = rank_match.group(2)
-                    
+
+                # Fill in TILL from the end of the current run in the sheet
+                history = self.get_status_history(df, df_row_idx)
+                staff_status = self._fill_run_end_date(staff_status, history, target_date)
+
                 # Create the staff member
-                staff = StaffMember(
+                staff = StaffRecord(
                     id=staff_index,
-                    name=name,
-                    rank=rank,
-                    position=position,
+                    name=identity.name,
+                    rank=identity.rank,
+                    position=identity.position,
+                    display=identity.display,
                     status=staff_status,
                 )
                 
-                staff_list.staff.append(staff)
+                staff_records.append(staff)
             
             # Log warning if no staff were found
-            if not staff_list.staff:
-                logger.warning("No active staff members were found in the specified rows")
+            if not staff_records:
+                logger.warning("No active staff members were found in the names column")
                 
-            return staff_list
+            return StaffRoster(staff=tuple(staff_records))
             
         except Exception as e:
             logger.error(f"Error extracting staff data: {e}")
             raise
 
-    def _create_staff_status(self, am_status_str: str, pm_status_str: str, am_pm_split: bool) -> StaffStatus:
-        """Create a StaffStatus object from AM and PM status strings.
+    def _create_staff_status(self, am_status_str: str, pm_status_str: str, am_pm_split: bool) -> StatusRecord:
+        """Create a StatusRecord from AM and PM status strings.
 
         Args:
             am_status_str: Status string for AM
@@ -242,7 +984,7 @@ class GoogleSheetsService:
             am_pm_split: Whether AM and PM statuses are different
 
         Returns:
-            StaffStatus object
+            StatusRecord
         """
         if not am_pm_split:
             # Use AM status as the overall status
@@ -253,7 +995,7 @@ class GoogleSheetsService:
         pm_status = self._parse_status_string(pm_status_str)
         
         # Create combined status
-        combined_status = StaffStatus(
+        combined_status = StatusRecord(
             status_type=am_status.status_type,  # Default to AM status type
             am_pm_split=True,
             am_status=am_status.status_type,
@@ -265,14 +1007,14 @@ class GoogleSheetsService:
         
         return combined_status
 
-    def _parse_status_string(self, status_str: str) -> StaffStatus:
-        """Parse a status string into a StaffStatus object.
+    def _parse_status_string(self, status_str: str) -> StatusRecord:
+        """Parse a status string into a StatusRecord.
 
         Args:
             status_str: Status string from the spreadsheet
 
         Returns:
-            StaffStatus object
+            StatusRecord
         """
         # Default status
         status_type = StatusType.PRESENT
@@ -282,7 +1024,7 @@ class GoogleSheetsService:
         
         # Handle empty or NaN status
         if not status_str or status_str == "nan" or status_str == "":
-            return StaffStatus(status_type=status_type)
+            return StatusRecord(status_type=status_type)
         
         # Apply status mappings
         if status_str in self.status_mappings:
@@ -294,7 +1036,7 @@ class GoogleSheetsService:
             elif status_str == "DO Off":
                 details = "(DO OFF)"
                 
-            return StaffStatus(
+            return StatusRecord(
                 status_type=status_type,
                 details=details
             )
@@ -306,25 +1048,21 @@ class GoogleSheetsService:
             location_part = status_parts[1].strip()
             
             # Check for status type
-            found_status = False
-            for status in StatusType:
-                if status.value in status_part:
-                    status_type = status
-                    found_status = True
-                    break
-            
-            # If no recognized status, use OTH
-            if not found_status:
+            candidates = status_candidates(status_part)
+            if candidates:
+                status_type = candidates[0]
+            else:
+                # If no recognized status, use OTH
                 status_type = StatusType.OTH
                 details = f"({status_part})"
             
             # Create location detail
-            location_detail = LocationDetail(
-                location=location_part,
+            location_detail = LocationRecord(
+                location=sys.intern(location_part),
                 detail=None
             )
             
-            return StaffStatus(
+            return StatusRecord(
                 status_type=status_type,
                 details=details,
                 location=location_detail
@@ -337,15 +1075,11 @@ class GoogleSheetsService:
             date_part = parts[1].strip()
             
             # Find status type
-            found_status = False
-            for status in StatusType:
-                if status.value in status_part:
-                    status_type = status
-                    found_status = True
-                    break
-            
-            # If no recognized status, use OTH
-            if not found_status:
+            candidates = status_candidates(status_part)
+            if candidates:
+                status_type = candidates[0]
+            else:
+                # If no recognized status, use OTH
                 status_type = StatusType.OTH
                 details = f"({status_part})"
             
@@ -360,20 +1094,21 @@ class GoogleSheetsService:
             except Exception as e:
                 logger.warning(f"Could not parse date from '{date_part}': {e}")
             
-            return StaffStatus(
+            return StatusRecord(
                 status_type=status_type,
                 details=details,
                 end_date=end_date
             )
         
         # Handle standard status types
-        for status in StatusType:
-            if status.value == status_str:
-                return StaffStatus(status_type=status)
+        status = STATUS_BY_VALUE.get(status_str)
+        if status is not None:
+            return StatusRecord(status_type=status)
         
         # Default to OTHERS for unrecognized status
-        logger.info(f"Unrecognized status: {status_str}, using OTHERS")
-        return StaffStatus(
+        # Formatted only if a sink accepts INFO; repeats are rate limited per call site
+        logger.info("Unrecognized status: {}, using OTHERS", status_str)
+        return StatusRecord(
             status_type=StatusType.OTHERS,
             details=status_str
         )
\ No newline at end of file
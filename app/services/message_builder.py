@@ -1,14 +1,26 @@
 """Service for building parade state messages."""
 from datetime import date, datetime, timedelta
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from loguru import logger
+from telegram.constants import ParseMode
 
+from app.config import settings
 from app.models.duty import DutyInstructor, DutySchedule
 from app.models.parade_state import ParadeState
-from app.models.staff import StaffList
+from app.models.report import HTML, MARKDOWN_V2, PLAIN
+from app.models.staff import StaffRoster
+from app.services.attendance_archive import AttendanceArchive
 from app.services.google_sheets import GoogleSheetsService
+from app.services.parade_history import ParadeHistory
+from app.services.report_renderer import ReportRenderer
 from app.services.telegram_service import TelegramService
+from app.utils.metrics import metrics
+from app.utils.profiling import profiler
+from app.utils.resilience import Deadline
+
+# Telegram parse mode of each sendable format (plain text has none)
+PARSE_MODES = {PLAIN: None, MARKDOWN_V2: ParseMode.MARKDOWN_V2, HTML: ParseMode.HTML}
 
 
 class MessageBuilderService:
@@ -18,21 +30,127 @@ class MessageBuilderService:
         self,
         google_sheets_service: GoogleSheetsService,
         telegram_service: TelegramService,
+        attendance_archive: Optional[AttendanceArchive] = None,
+        parade_history: Optional[ParadeHistory] = None,
     ):
         """Initialize the message builder service.
 
         Args:
             google_sheets_service: Service for Google Sheets operations
             telegram_service: Service for Telegram operations
+            attendance_archive: Optional archive that records each day's attendance
+            parade_history: Optional archive that records each generated and sent message
         """
         self.google_sheets_service = google_sheets_service
         self.telegram_service = telegram_service
+        self.attendance_archive = attendance_archive
+        self.parade_history = parade_history
+        self.renderer = ReportRenderer(settings.render_cache_size)
+
+    def render(self, parade_state: ParadeState, fmt: str = PLAIN) -> str:
+        """Render a parade state in an output format, reusing the text of an equal report.
+
+        Args:
+            parade_state: Parade state to render
+            fmt: Output format (plain, markdown_v2, html or csv)
+
+        Returns:
+            Rendered message
+        """
+        report = parade_state.to_report(include_breakdown=settings.include_status_breakdown)
+        return self.renderer.render(report, fmt)
+
+    def _record(self, parade_state: ParadeState, message: str) -> None:
+        """Store a generated parade state in the history archive, if there is one."""
+        if self.parade_history is None:
+            return
+        try:
+            with metrics.timer("history_record"):
+                self.parade_history.record(parade_state, message)
+        except Exception as e:
+            logger.warning(f"Could not archive parade state for {parade_state.report_date}: {e}")
+
+    async def _archive_attendance(self, target_date: date, staff_list: StaffRoster) -> None:
+        """Keep the decoded attendance of a day for history queries, if there is an archive."""
+        if self.attendance_archive is None:
+            return
+        try:
+            await profiler.to_thread(self.attendance_archive.append, target_date, staff_list)
+        except Exception as e:
+            logger.warning(f"Could not archive attendance for {target_date}: {e}")
+
+    async def archive(self, parade_state: ParadeState) -> None:
+        """Archive a parade state generated with ``archive=False``, once it is known to be kept.
+
+        Args:
+            parade_state: Parade state to store in the attendance and history archives
+        """
+        await self._archive_attendance(parade_state.report_date, parade_state.staff_list)
+        self._record(parade_state, self.render(parade_state))
+
+    def mark_sent(self, message: str) -> None:
+        """Mark a generated message as sent in the history archive, if there is one.
+
+        Args:
+            message: The message that was sent
+        """
+        if self.parade_history is None:
+            return
+        try:
+            if not self.parade_history.mark_sent(message):
+                logger.warning("Sent parade state was not found in the history archive")
+        except Exception as e:
+            logger.warning(f"Could not mark parade state as sent: {e}")
+
+    def _next_di(self, duty_schedule: DutySchedule, target_date: date) -> Optional[DutyInstructor]:
+        """Get the DI of the next working day, or the next scheduled DI if that day has none.
+
+        Args:
+            duty_schedule: Parsed DI schedule
+            target_date: Date of the parade state
+
+        Returns:
+            Next DutyInstructor if found, None otherwise
+        """
+        next_day = self.google_sheets_service.work_calendar.next_working_day(target_date)
+        return duty_schedule.get_di_for_date(next_day) or duty_schedule.get_next_di(target_date)
+
+    async def _read_staff_list(
+        self, target_date: date, timeout: Optional[float] = None, from_snapshot: bool = False
+    ) -> Tuple[StaffRoster, Optional[datetime]]:
+        """Read a staff list in a worker thread, so a slow sheet does not block the event loop.
+
+        Args:
+            target_date: The date to get staff status for
+            timeout: Seconds the sheet fetch may take
+            from_snapshot: Read the last saved snapshot instead of fetching
+
+        Returns:
+            The staff list, and the snapshot time if it did not come from a live fetch
+        """
+        service = self.google_sheets_service
+
+        def read() -> Tuple[StaffRoster, Optional[datetime]]:
+            # data_as_of is per thread, so it belongs to this read
+            staff_list = service.get_staff_list(target_date=target_date, timeout=timeout, from_snapshot=from_snapshot)
+            return staff_list, service.data_as_of
 
-    async def build_parade_state(self, target_date: Optional[date] = None) -> ParadeState:
+        return await profiler.to_thread(read)
+
+    async def build_parade_state(
+        self,
+        target_date: Optional[date] = None,
+        deadline: Optional[Deadline] = None,
+        from_snapshot: bool = False,
+        archive: bool = True,
+    ) -> ParadeState:
         """Build a parade state for the specified date.
 
         Args:
             target_date: The date for the parade state, defaults to today
+            deadline: Time budget shared by the fetch stages, defaults to the command deadline
+            from_snapshot: Build from the last sheet snapshot and cached DI list, without network calls
+            archive: Store the fetched attendance in the attendance archive
 
         Returns:
             ParadeState containing all necessary information
@@ -40,17 +158,37 @@ class MessageBuilderService:
         # Use today's date if not specified
         if target_date is None:
             target_date = date.today()
+        if deadline is None:
+            deadline = Deadline(settings.command_deadline)
 
         try:
+            if from_snapshot:
+                staff_list, as_of = await self._read_staff_list(target_date, from_snapshot=True)
+                duty_schedule = self.telegram_service.cached_duty_schedule
+                return ParadeState(
+                    report_date=target_date,
+                    staff_list=staff_list,
+                    current_di=duty_schedule.get_di_for_date(target_date),
+                    next_di=self._next_di(duty_schedule, target_date),
+                    as_of=as_of,
+                    as_of_note="refreshing from Google Sheets",
+                )
+
             # Fetch staff data from Google Sheets
-            staff_list = self.google_sheets_service.get_staff_list(target_date=target_date)
+            staff_list, as_of = await self._read_staff_list(
+                target_date, timeout=deadline.budget(settings.sheets_deadline_share)
+            )
+
+            # Keep the decoded attendance for history queries
+            if archive:
+                await self._archive_attendance(target_date, staff_list)
 
             # Fetch DI schedule from Telegram
-            duty_schedule = await self.telegram_service.fetch_di_list()
+            duty_schedule = await self.telegram_service.fetch_di_list(timeout=deadline.remaining())
 
             # Get the current and next DI
             current_di = duty_schedule.get_di_for_date(target_date)
-            next_di = duty_schedule.get_next_di(target_date)
+            next_di = self._next_di(duty_schedule, target_date)
 
             # Create the parade state
             parade_state = ParadeState(
@@ -58,6 +196,7 @@ class MessageBuilderService:
                 staff_list=staff_list,
                 current_di=current_di,
                 next_di=next_di,
+                as_of=as_of,
             )
 
             return parade_state
@@ -66,14 +205,109 @@ class MessageBuilderService:
             logger.error(f"Error building parade state: {e}")
             raise
 
-    async def generate_message(self, target_date: Optional[date] = None) -> str:
+    async def generate_messages(self, target_dates: List[date], deadline: Optional[Deadline] = None) -> Dict[date, str]:
+        """Generate parade state messages for several dates from one sheet read.
+
+        Args:
+            target_dates: Dates to generate messages for
+            deadline: Time budget shared by the fetch stages, defaults to the command deadline
+
+        Returns:
+            Formatted parade state message of each date, in date order
+        """
+        if deadline is None:
+            deadline = Deadline(settings.command_deadline)
+
+        service = self.google_sheets_service
+
+        def read_staff_lists() -> Tuple[Dict[date, StaffRoster], Optional[datetime]]:
+            rosters = service.get_staff_lists(target_dates, timeout=deadline.budget(settings.sheets_deadline_share))
+            return rosters, service.data_as_of
+
+        with metrics.timer("build"):
+            rosters, as_of = await profiler.to_thread(read_staff_lists)
+            duty_schedule = await self.telegram_service.fetch_di_list(timeout=deadline.remaining())
+
+        messages = {}
+        parade_states = []
+        with metrics.timer("render"):
+            for target_date, staff_list in rosters.items():
+                parade_state = ParadeState(
+                    report_date=target_date,
+                    staff_list=staff_list,
+                    current_di=duty_schedule.get_di_for_date(target_date),
+                    next_di=self._next_di(duty_schedule, target_date),
+                    as_of=as_of,
+                )
+                messages[target_date] = self.render(parade_state)
+                parade_states.append(parade_state)
+        for parade_state in parade_states:
+            self._record(parade_state, messages[parade_state.report_date])
+        return messages
+
+    async def generate_parade_state(
+        self,
+        target_date: Optional[date] = None,
+        deadline: Optional[Deadline] = None,
+        from_snapshot: bool = False,
+        archive: bool = True,
+    ) -> ParadeState:
+        """Build a parade state, rendering and archiving its plain message unless it comes from the snapshot.
+
+        Args:
+            target_date: The date for the parade state, defaults to today
+            deadline: Time budget shared by the fetch stages
+            from_snapshot: Build from the last sheet snapshot, without network calls
+            archive: Archive the parade state; callers that may still discard it
+                pass False and call ``archive`` once it is kept
+
+        Returns:
+            ParadeState whose renders are cached by the message builder
+        """
+        if from_snapshot:
+            with metrics.timer("build_snapshot"):
+                parade_state = await self.build_parade_state(target_date, from_snapshot=True)
+            return parade_state
+
+        async with profiler.profile("generate_message"):
+            with metrics.timer("build"):
+                parade_state = await self.build_parade_state(target_date, deadline=deadline, archive=archive)
+            with metrics.timer("render"):
+                message = self.render(parade_state)
+        if archive:
+            self._record(parade_state, message)
+        return parade_state
+
+    async def generate_message(
+        self,
+        target_date: Optional[date] = None,
+        deadline: Optional[Deadline] = None,
+        from_snapshot: bool = False,
+    ) -> str:
         """Generate a formatted parade state message.
 
         Args:
             target_date: The date for the parade state, defaults to today
+            deadline: Time budget shared by the fetch stages
+            from_snapshot: Build from the last sheet snapshot, without network calls
 
         Returns:
             Formatted parade state message
         """
-        parade_state = await self.build_parade_state(target_date)
-        return parade_state.format_message()
\ No newline at end of file
+        parade_state = await self.generate_parade_state(target_date, deadline=deadline, from_snapshot=from_snapshot)
+        return self.render(parade_state)
+
+    async def send_parade_state(self, parade_state: ParadeState, timeout: Optional[float] = None) -> None:
+        """Send a parade state to the configured chat in PARADE_STATE_FORMAT and mark it as sent.
+
+        Args:
+            parade_state: Parade state to send
+            timeout: Seconds to wait for the Bot API
+        """
+        fmt = settings.parade_state_format
+        if fmt not in PARSE_MODES:
+            raise ValueError(f"Unknown PARADE_STATE_FORMAT {fmt!r}, expected one of {', '.join(PARSE_MODES)}")
+        await self.telegram_service.send_message(
+            self.render(parade_state, fmt), timeout=timeout, parse_mode=PARSE_MODES[fmt]
+        )
+        self.mark_sent(self.render(parade_state))
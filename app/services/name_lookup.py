@@ -0,0 +1,176 @@
+"""Fuzzy staff name lookup over a precomputed trigram index."""
+import heapq
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+# Shorter words (initials, "S/O") do not identify anyone
+MIN_TOKEN_LENGTH = 2
+# Score of a word that starts with the query word ("edm" -> "edmund")
+PREFIX_SCORE = 0.8
+# Closest vocabulary words considered per query word
+MAX_WORD_CANDIDATES = 8
+
+
+def normalize(text: str) -> str:
+    """Normalize text for matching: case, punctuation and spacing."""
+    return " ".join(_NON_WORD.sub(" ", str(text)).split()).casefold()
+
+
+def tokens(text: str) -> List[str]:
+    """Words of a text that take part in matching, in order and without repeats."""
+    return list(dict.fromkeys(token for token in normalize(text).split() if len(token) >= MIN_TOKEN_LENGTH))
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Padded character trigrams of a word, so short words still match."""
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+@dataclass(frozen=True, slots=True)
+class NameEntry:
+    """A staff member as seen by the lookup: canonical name, sheet row and aliases."""
+
+    key: str
+    row: int
+    aliases: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class NameMatch:
+    """A ranked lookup result."""
+
+    key: str
+    row: int
+    score: float
+
+
+class NameLookupService:
+    """Ranks staff by similarity of their names and aliases to a query.
+
+    The index has two levels: trigrams -> words of the vocabulary, and words ->
+    entries using them. Each query word is scored against the vocabulary only
+    (a few thousand words even for merged rosters of many units), and entries
+    collect the best score of their words, so a lookup never scans the roster.
+    ``update`` diffs the roster and re-indexes only the entries that changed.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.entries: Dict[str, NameEntry] = {}
+        self._entry_tokens: Dict[str, FrozenSet[str]] = {}
+        self._token_entries: Dict[str, Set[str]] = defaultdict(set)
+        self._token_grams: Dict[str, FrozenSet[str]] = {}
+        self._gram_tokens: Dict[str, Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def update(self, entries: Iterable[NameEntry]) -> int:
+        """Make the index match a roster, re-indexing only changed entries.
+
+        Args:
+            entries: The complete current roster
+
+        Returns:
+            Number of entries added, changed or removed
+        """
+        current = {entry.key: entry for entry in entries}
+        changed = 0
+        for key in [key for key in self.entries if key not in current]:
+            self._remove(key)
+            changed += 1
+        for key, entry in current.items():
+            if self.entries.get(key) != entry:
+                if key in self.entries:
+                    self._remove(key)
+                self._add(entry)
+                changed += 1
+        return changed
+
+    def _add(self, entry: NameEntry) -> None:
+        words = frozenset(token for alias in (entry.key, *entry.aliases) for token in tokens(alias))
+        self.entries[entry.key] = entry
+        self._entry_tokens[entry.key] = words
+        for word in words:
+            if word not in self._token_grams:
+                grams = trigrams(word)
+                self._token_grams[word] = grams
+                for gram in grams:
+                    self._gram_tokens[gram].add(word)
+            self._token_entries[word].add(entry.key)
+
+    def _remove(self, key: str) -> None:
+        for word in self._entry_tokens.pop(key):
+            users = self._token_entries[word]
+            users.discard(key)
+            if users:
+                continue
+            # Last entry using the word, drop it from the vocabulary
+            del self._token_entries[word]
+            for gram in self._token_grams.pop(word):
+                words = self._gram_tokens[gram]
+                words.discard(word)
+                if not words:
+                    del self._gram_tokens[gram]
+        del self.entries[key]
+
+    def _score_words(self, word: str, min_score: float) -> Dict[str, float]:
+        """Score vocabulary words against one query word (Dice coefficient of trigrams).
+
+        Returns:
+            The closest words and their scores
+        """
+        query_grams = trigrams(word)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in query_grams:
+            for candidate in self._gram_tokens.get(gram, ()):
+                shared[candidate] += 1
+
+        scores = []
+        for candidate, count in shared.items():
+            score = 2 * count / (len(query_grams) + len(self._token_grams[candidate]))
+            if candidate.startswith(word):
+                score = 1.0 if candidate == word else max(score, PREFIX_SCORE)
+            if score >= min_score:
+                scores.append((score, candidate))
+        return {candidate: score for score, candidate in heapq.nlargest(MAX_WORD_CANDIDATES, scores)}
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.3) -> List[NameMatch]:
+        """Find the staff whose names best match a query.
+
+        Args:
+            query: Name, part of a name or misspelling
+            limit: Maximum number of matches
+            min_score: Minimum similarity (0-1) of a match
+
+        Returns:
+            Matches, best first; ties go to the entry with fewer other words
+        """
+        query_words = tokens(query)
+        if not query_words:
+            return []
+
+        totals: Dict[str, float] = defaultdict(float)
+        for word in query_words:
+            best: Dict[str, float] = {}
+            for candidate, score in self._score_words(word, min_score).items():
+                for key in self._token_entries[candidate]:
+                    if score > best.get(key, 0.0):
+                        best[key] = score
+            for key, score in best.items():
+                totals[key] += score
+
+        candidates = (
+            (-total / len(query_words), len(self._entry_tokens[key]), key)
+            for key, total in totals.items()
+            if total / len(query_words) >= min_score
+        )
+        return [
+            NameMatch(key=key, row=self.entries[key].row, score=-neg_score)
+            for neg_score, _, key in heapq.nsmallest(limit, candidates)
+        ]
@@ -0,0 +1,348 @@
+"""Local, searchable archive of generated and sent parade states (SQLite with FTS5)."""
+import hashlib
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from datetime import date
+from itertools import groupby
+from typing import IO, Iterator, List, Optional
+
+from loguru import logger
+
+from app.config import settings
+from app.models.parade_state import ParadeState
+from app.utils.date_helpers import get_local_time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parade_states (
+    id INTEGER PRIMARY KEY,
+    report_date TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    generated_at TEXT NOT NULL,
+    sent_at TEXT,
+    as_of TEXT,
+    current_di TEXT,
+    next_di TEXT,
+    am_count INTEGER NOT NULL,
+    pm_count INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    UNIQUE (report_date, content_hash)
+);
+CREATE INDEX IF NOT EXISTS parade_states_hash ON parade_states (content_hash);
+CREATE TABLE IF NOT EXISTS parade_entries (
+    id INTEGER PRIMARY KEY,
+    state_id INTEGER NOT NULL REFERENCES parade_states (id),
+    report_date TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    label TEXT NOT NULL,
+    status TEXT NOT NULL,
+    am_status TEXT NOT NULL,
+    pm_status TEXT NOT NULL,
+    am_location TEXT,
+    pm_location TEXT,
+    end_date TEXT
+);
+CREATE INDEX IF NOT EXISTS parade_entries_state ON parade_entries (state_id, position);
+CREATE INDEX IF NOT EXISTS parade_entries_name ON parade_entries (name COLLATE NOCASE, report_date);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS parade_entries_fts USING fts5(
+    name, label, status, content='parade_entries', content_rowid='id'
+);
+"""
+
+# Per report date and staff member, the state that counts: the last sent, else the last generated
+PREFERRED_ORDER = "{t}sent_at IS NULL, COALESCE({t}sent_at, {t}generated_at) DESC, {t}id DESC"
+
+
+@dataclass(frozen=True, slots=True)
+class StoredParadeState:
+    """A parade state as archived, with its rendered text."""
+
+    id: int
+    report_date: date
+    generated_at: str
+    sent_at: Optional[str]
+    am_count: int
+    pm_count: int
+    total: int
+    text: str
+
+    def format_summary(self) -> str:
+        sent = f"sent {self.sent_at[11:16]}" if self.sent_at else "draft only"
+        return (
+            f"{self.report_date:%d/%m/%Y} {self.report_date:%a}: "
+            f"{self.am_count}/{self.total}(AM), {self.pm_count}/{self.total}(PM), {sent}"
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryEntry:
+    """A staff member's line in an archived parade state."""
+
+    report_date: date
+    name: str
+    label: str
+    status: str
+    sent: bool
+
+    def format_line(self) -> str:
+        return f"{self.report_date:%d/%m/%Y} {self.report_date:%a} {self.label} - {self.status}"
+
+
+class ParadeHistory:
+    """SQLite archive of every generated and sent parade state.
+
+    Each distinct message of a date is one row of ``parade_states`` (a
+    regenerated identical draft only updates its time) with one row per
+    staff member in ``parade_entries``. Entries are indexed by name and, when
+    SQLite has FTS5, full-text indexed on name, display label and status, so
+    date and name lookups are index reads instead of a chat history scan.
+    """
+
+    def __init__(self, path: str = None):
+        """Open (or create) the archive.
+
+        Args:
+            path: SQLite database file, defaults to PARADE_HISTORY_PATH
+        """
+        self.path = path or settings.parade_history_path
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5: name search falls back to LIKE
+            logger.warning(f"SQLite FTS5 unavailable ({e}), parade history name search uses LIKE")
+            self.fts = False
+
+    def close(self) -> None:
+        """Close the database."""
+        self.conn.close()
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Hash of a rendered message, identifying it across generate and send."""
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def record(self, parade_state: ParadeState, text: str) -> int:
+        """Store a generated parade state; an identical message of the same date is stored once.
+
+        Args:
+            parade_state: The parade state
+            text: Its rendered message
+
+        Returns:
+            Row id of the stored state
+        """
+        report_date = parade_state.report_date.isoformat()
+        content_hash = self.content_hash(text)
+        now = get_local_time().isoformat(timespec="seconds")
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT id FROM parade_states WHERE report_date = ? AND content_hash = ?",
+                (report_date, content_hash),
+            ).fetchone()
+            if row is not None:
+                self.conn.execute("UPDATE parade_states SET generated_at = ? WHERE id = ?", (now, row[0]))
+                return row[0]
+
+            roster = parade_state.staff_list
+            state_id = self.conn.execute(
+                "INSERT INTO parade_states (report_date, content_hash, generated_at, as_of, current_di, next_di,"
+                " am_count, pm_count, total, text) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    report_date,
+                    content_hash,
+                    now,
+                    parade_state.as_of.isoformat(timespec="seconds") if parade_state.as_of else None,
+                    str(parade_state.current_di) if parade_state.current_di else None,
+                    str(parade_state.next_di) if parade_state.next_di else None,
+                    parade_state.am_count,
+                    parade_state.pm_count,
+                    len(roster),
+                    text,
+                ),
+            ).lastrowid
+            self.conn.executemany(
+                "INSERT INTO parade_entries (state_id, report_date, position, name, label, status,"
+                " am_status, pm_status, am_location, pm_location, end_date)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        state_id,
+                        report_date,
+                        position,
+                        record.name,
+                        record.display or record.position or str(record),
+                        record.status.format_status(),
+                        record.status.status_for("AM").value,
+                        record.status.status_for("PM").value,
+                        record.status.location_for("AM"),
+                        record.status.location_for("PM"),
+                        record.status.end_date.isoformat() if record.status.end_date else None,
+                    )
+                    for position, record in enumerate(roster)
+                ],
+            )
+            if self.fts:
+                self.conn.execute(
+                    "INSERT INTO parade_entries_fts (rowid, name, label, status)"
+                    " SELECT id, name, label, status FROM parade_entries WHERE state_id = ?",
+                    (state_id,),
+                )
+        return state_id
+
+    def mark_sent(self, text: str) -> bool:
+        """Mark the latest stored state with this message as sent.
+
+        Args:
+            text: The message that was sent
+
+        Returns:
+            True if a stored state matched
+        """
+        now = get_local_time().isoformat(timespec="seconds")
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE parade_states SET sent_at = ? WHERE id = "
+                "(SELECT id FROM parade_states WHERE content_hash = ? ORDER BY generated_at DESC, id DESC LIMIT 1)",
+                (now, self.content_hash(text)),
+            )
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _state(row: tuple) -> StoredParadeState:
+        state_id, report_date, generated_at, sent_at, am_count, pm_count, total, text = row
+        return StoredParadeState(
+            id=state_id,
+            report_date=date.fromisoformat(report_date),
+            generated_at=generated_at,
+            sent_at=sent_at,
+            am_count=am_count,
+            pm_count=pm_count,
+            total=total,
+            text=text,
+        )
+
+    def states_between(self, start: date, end: date) -> List[StoredParadeState]:
+        """Get the state that counts for each archived date in a range (the last sent, else the last generated).
+
+        Args:
+            start: First date (inclusive)
+            end: Last date (inclusive)
+
+        Returns:
+            One state per archived date, in date order
+        """
+        rows = self.conn.execute(
+            "SELECT id, report_date, generated_at, sent_at, am_count, pm_count, total, text FROM ("
+            " SELECT *, ROW_NUMBER() OVER (PARTITION BY report_date ORDER BY " + PREFERRED_ORDER.format(t="") + ") AS rank"
+            " FROM parade_states WHERE report_date BETWEEN ? AND ?"
+            ") WHERE rank = 1 ORDER BY report_date",
+            (start.isoformat(), end.isoformat()),
+        ).fetchall()
+        return [self._state(row) for row in rows]
+
+    def state_for(self, report_date: date) -> Optional[StoredParadeState]:
+        """Get the state that counts for a date, or None if nothing was archived for it."""
+        states = self.states_between(report_date, report_date)
+        return states[0] if states else None
+
+    @staticmethod
+    def _match_query(text: str) -> str:
+        """Build an FTS5 query matching every word of the text as a prefix."""
+        words = [word.replace('"', '""') for word in text.split()]
+        return " ".join(f'"{word}"*' for word in words)
+
+    def search_name(self, text: str, limit: int = 20) -> List[HistoryEntry]:
+        """Find a staff member's archived entries by (part of) their name or display label.
+
+        Args:
+            text: Words to look for; each must prefix a word of the name or label
+            limit: Most recent dates returned
+
+        Returns:
+            One entry per matching staff member and date (from the state that counts), newest first
+        """
+        if not text.split():
+            return []
+        if self.fts:
+            match = "e.id IN (SELECT rowid FROM parade_entries_fts WHERE parade_entries_fts MATCH ?)"
+            params = [f"{{name label}} : ({self._match_query(text)})"]
+        else:
+            match = " AND ".join("(e.name LIKE ? OR e.label LIKE ?)" for _ in text.split())
+            params = [pattern for word in text.split() for pattern in (f"%{word}%",) * 2]
+        rows = self.conn.execute(
+            "SELECT report_date, name, label, status, sent FROM ("
+            " SELECT e.report_date, e.name, e.label, e.status, s.sent_at IS NOT NULL AS sent,"
+            " ROW_NUMBER() OVER (PARTITION BY e.report_date, e.name ORDER BY "
+            + PREFERRED_ORDER.format(t="s.")
+            + ") AS rank FROM parade_entries e JOIN parade_states s ON s.id = e.state_id WHERE "
+            + match
+            + ") WHERE rank = 1 ORDER BY report_date DESC, name LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [
+            HistoryEntry(report_date=date.fromisoformat(day), name=name, label=label, status=status, sent=bool(sent))
+            for day, name, label, status, sent in rows
+        ]
+
+    def export_jsonl(self, out: IO[str], batch_size: int = 500) -> int:
+        """Write every archived state with its entries as JSON lines, streaming from the database.
+
+        Args:
+            out: Text stream to write to
+            batch_size: Rows fetched from SQLite at a time
+
+        Returns:
+            Number of states written
+        """
+        cursor = self.conn.execute(
+            "SELECT s.id, s.report_date, s.generated_at, s.sent_at, s.as_of, s.current_di, s.next_di,"
+            " s.am_count, s.pm_count, s.total, s.text,"
+            " e.position, e.name, e.label, e.status, e.am_status, e.pm_status, e.am_location, e.pm_location, e.end_date"
+            " FROM parade_states s LEFT JOIN parade_entries e ON e.state_id = s.id"
+            " ORDER BY s.report_date, s.id, e.position"
+        )
+        written = 0
+        for state_id, rows in groupby(self._iter_rows(cursor, batch_size), key=lambda row: row[0]):
+            rows = list(rows)
+            first = rows[0]
+            record = dict(
+                zip(
+                    ("id", "report_date", "generated_at", "sent_at", "as_of", "current_di", "next_di",
+                     "am_count", "pm_count", "total", "text"),
+                    first[:11],
+                )
+            )
+            record["entries"] = [
+                dict(
+                    zip(
+                        ("position", "name", "label", "status", "am_status", "pm_status",
+                         "am_location", "pm_location", "end_date"),
+                        row[11:],
+                    )
+                )
+                for row in rows
+                if row[11] is not None
+            ]
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            written += 1
+        return written
+
+    @staticmethod
+    def _iter_rows(cursor: sqlite3.Cursor, batch_size: int) -> Iterator[tuple]:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
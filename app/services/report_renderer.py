@@ -0,0 +1,55 @@
+"""Cache of parade state reports rendered in each output format."""
+from collections import OrderedDict
+from typing import Tuple
+
+from app.models.report import RENDERERS, ParadeReport
+from app.utils.metrics import metrics
+
+
+class ReportRenderer:
+    """Renders parade reports, keeping the most recently used outputs.
+
+    Reports are frozen and compared by content, so a report rebuilt from an
+    unchanged sheet (e.g. /draft then /send) reuses the text rendered for the
+    first one.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        """Initialize the renderer.
+
+        Args:
+            max_entries: Rendered messages to keep, across all formats
+        """
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple[ParadeReport, str], str]" = OrderedDict()
+
+    def render(self, report: ParadeReport, fmt: str) -> str:
+        """Render a report, reusing the cached text of an equal report.
+
+        Args:
+            report: Report to render
+            fmt: Output format (see app.models.report.RENDERERS)
+
+        Returns:
+            Rendered text
+
+        Raises:
+            ValueError: If the format is unknown
+        """
+        renderer = RENDERERS.get(fmt)
+        if renderer is None:
+            raise ValueError(f"Unknown parade state format {fmt!r}, expected one of {', '.join(RENDERERS)}")
+
+        key = (report, fmt)
+        text = self._cache.get(key)
+        if text is not None:
+            self._cache.move_to_end(key)
+            metrics.increment("render_cache_hits_total", format=fmt)
+            return text
+
+        metrics.increment("render_cache_misses_total", format=fmt)
+        text = renderer(report)
+        self._cache[key] = text
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return text
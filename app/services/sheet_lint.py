@@ -0,0 +1,197 @@
+"""Whole-sheet data-quality scan for status cells the decoder cannot read reliably."""
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models.staff import STATUS_BY_VALUE, StatusType, status_candidates
+from app.services.sheet_tabs import column_letter
+from app.services.work_calendar import HOLIDAY_MARK
+
+# Issue kinds, in report order
+UNRECOGNIZED = "unrecognized"
+AMBIGUOUS = "ambiguous"
+BAD_DATE = "bad TILL date"
+KINDS = (UNRECOGNIZED, AMBIGUOUS, BAD_DATE)
+
+
+@dataclass(frozen=True, slots=True)
+class CellRef:
+    """Position of a status cell: A1 reference, staff name and slot."""
+
+    a1: str
+    name: str
+    day: date
+    period: str
+
+
+@dataclass(frozen=True, slots=True)
+class LintIssue:
+    """A distinct cell value the decoder misreads or cannot read, with every cell holding it."""
+
+    kind: str
+    value: str
+    decoded_as: StatusType
+    note: str
+    cells: Tuple[CellRef, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class LintReport:
+    """Result of a whole-sheet scan."""
+
+    issues: Tuple[LintIssue, ...]
+    cells_scanned: int
+    distinct_values: int
+    seconds: float
+
+    def format_lines(self, max_cells: int = 3) -> List[str]:
+        """Format the report, one line per distinct value followed by some of its cells.
+
+        Args:
+            max_cells: Cells listed per value
+
+        Returns:
+            Report lines
+        """
+        flagged = sum(len(issue.cells) for issue in self.issues)
+        lines = [
+            f"Scanned {self.cells_scanned} cells ({self.distinct_values} distinct values) "
+            f"in {self.seconds * 1000:.0f} ms: {len(self.issues)} problem values in {flagged} cells"
+        ]
+        for issue in self.issues:
+            lines.append(
+                f'{issue.kind}: "{issue.value}" x{len(issue.cells)}, read as {issue.decoded_as.value} ({issue.note})'
+            )
+            for cell in issue.cells[:max_cells]:
+                lines.append(f"  {cell.a1} {cell.name} {cell.day:%d/%m/%Y} {cell.period}")
+            if len(issue.cells) > max_cells:
+                lines.append(f"  ... and {len(issue.cells) - max_cells} more")
+        return lines
+
+
+def classify(value: str, status_mappings: Dict[str, StatusType]) -> Optional[Tuple[str, StatusType, str]]:
+    """Check one cell value against the decoding rules of GoogleSheetsService._parse_status_string.
+
+    Args:
+        value: Stripped cell value
+        status_mappings: Exact-match mappings of the service
+
+    Returns:
+        (kind, status the decoder reads, explanation), or None if the value decodes cleanly
+    """
+    if not value or value == "nan" or value in status_mappings or value in STATUS_BY_VALUE:
+        return None
+    # Public holidays, read by the work calendar
+    if value == HOLIDAY_MARK:
+        return None
+
+    if "@" in value:
+        status_part = value.split("@", 1)[0].strip()
+        issue = _classify_status_part(status_part, StatusType.OTH)
+        if issue is None and "TILL" in value:
+            status = status_candidates(status_part)[0]
+            return AMBIGUOUS, status, "TILL after @ is read as part of the location"
+        return issue
+
+    if "TILL" in value:
+        status_part, date_part = (part.strip() for part in value.split("TILL")[:2])
+        issue = _classify_status_part(status_part, StatusType.OTH)
+        if issue is not None:
+            return issue
+        try:
+            day, month = date_part.split("/")
+            date(2000, int(month), int(day))
+        except ValueError:
+            return BAD_DATE, status_candidates(status_part)[0], f'"{date_part}" is not DD/MM'
+        return None
+
+    return UNRECOGNIZED, StatusType.OTHERS, "no status code"
+
+
+def _classify_status_part(status_part: str, fallback: StatusType) -> Optional[Tuple[str, StatusType, str]]:
+    candidates = status_candidates(status_part)
+    if not candidates:
+        return UNRECOGNIZED, fallback, f'no status code in "{status_part}"'
+    if len(candidates) > 1:
+        codes = ", ".join(status.value for status in candidates)
+        return AMBIGUOUS, candidates[0], f"contains {codes}"
+    return None
+
+
+def lint_cells(
+    rows: Sequence[Sequence[Any]],
+    date_columns: Sequence[Tuple[date, int]],
+    staff_rows: Dict[int, str],
+    status_mappings: Dict[str, StatusType],
+) -> LintReport:
+    """Decode every status cell of the staff rows once and report the problem values.
+
+    Cells are gathered into one array and reduced to their distinct values
+    with ``np.unique``; only the distinct values are classified, and cells
+    are grouped back by value from the inverse index.
+
+    Args:
+        rows: Raw cell rows below the header row (DataFrame row order)
+        date_columns: Sorted (date, am_column_index) pairs of the sheet
+        staff_rows: Names-column cell of each staff row, by row index
+        status_mappings: Exact-match mappings of the decoder
+
+    Returns:
+        LintReport with issues grouped by distinct value, most frequent first
+    """
+    started = time.perf_counter()
+    row_indices = sorted(staff_rows)
+    if not row_indices or not date_columns:
+        return LintReport(issues=(), cells_scanned=0, distinct_values=0, seconds=time.perf_counter() - started)
+
+    # Slot s of the scan is column cols[s]: the AM and PM column of every dated day
+    cols = np.array([col for _, am_col in date_columns for col in (am_col, am_col + 1)])
+    width = int(cols.max()) + 1
+    grid = np.empty((len(row_indices), width), dtype=object)
+    grid.fill("")
+    for position, df_row in enumerate(row_indices):
+        row = rows[df_row][:width]
+        grid[position, :len(row)] = [value if isinstance(value, str) else "" for value in row]
+    cells = grid[:, cols]
+
+    values, inverse = np.unique(cells, return_inverse=True)
+    inverse = inverse.reshape(cells.shape)
+    problems = {}
+    for value_id, raw in enumerate(values):
+        issue = classify(raw.strip(), status_mappings)
+        if issue is not None:
+            problems[value_id] = issue
+
+    issues = []
+    if problems:
+        flagged = np.isin(inverse, list(problems))
+        # Slot-major, so each value's cells come out in date order
+        slots, positions = np.nonzero(flagged.T)
+        by_value: Dict[int, List[CellRef]] = {}
+        for position, slot in zip(positions.tolist(), slots.tolist()):
+            df_row = row_indices[position]
+            by_value.setdefault(int(inverse[position, slot]), []).append(
+                CellRef(
+                    # DataFrame row N is sheet row N + 2, the first sheet row being the header
+                    a1=f"{column_letter(int(cols[slot]))}{df_row + 2}",
+                    name=staff_rows[df_row],
+                    day=date_columns[slot // 2][0],
+                    period="AM" if slot % 2 == 0 else "PM",
+                )
+            )
+        for value_id, refs in by_value.items():
+            kind, decoded_as, note = problems[value_id]
+            issues.append(
+                LintIssue(kind=kind, value=values[value_id].strip(), decoded_as=decoded_as, note=note, cells=tuple(refs))
+            )
+        issues.sort(key=lambda issue: (KINDS.index(issue.kind), -len(issue.cells), issue.value))
+
+    return LintReport(
+        issues=tuple(issues),
+        cells_scanned=int(cells.size),
+        distinct_values=len(values),
+        seconds=time.perf_counter() - started,
+    )
@@ -0,0 +1,139 @@
+"""Local compressed snapshot of the last good Google Sheet fetch."""
+import hashlib
+import json
+import os
+import struct
+import zlib
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+import pytz
+from loguru import logger
+
+from app.config import settings
+
+MAGIC = b"PSSNAP02"
+
+# magic, fetched_at (POSIX seconds), digest of the cell values
+HEADER = struct.Struct("<8sd16s")
+FETCHED_AT = struct.Struct("<d")
+
+
+def _encode(values: List[List[str]]) -> bytes:
+    return json.dumps(values, separators=(",", ":")).encode("utf-8")
+
+
+def values_digest(values: List[List[str]]) -> bytes:
+    """Digest of sheet values, equal for equal cell contents.
+
+    Args:
+        values: Raw cell values as returned by the Sheets API
+
+    Returns:
+        16-byte BLAKE2b digest
+    """
+    return hashlib.blake2b(_encode(values), digest_size=16).digest()
+
+
+class SheetSnapshot:
+    """Raw sheet values together with their date column index."""
+
+    __slots__ = ("values", "fetched_at", "date_columns")
+
+    def __init__(self, values: List[List[str]], fetched_at: datetime, date_columns: List[Tuple[date, int]]):
+        """Initialize the snapshot.
+
+        Args:
+            values: Raw cell values as returned by the Sheets API
+            fetched_at: When the values were fetched
+            date_columns: Sorted (date, am_column_index) pairs of the sheet
+        """
+        self.values = values
+        self.fetched_at = fetched_at
+        self.date_columns = date_columns
+
+
+class SheetSnapshotStore:
+    """Saves and loads sheet snapshots as a zlib-compressed JSON dump.
+
+    Layout: header (magic, fetch time, digest of the values) followed by the
+    compressed values and date column index. The file is only rewritten when
+    the values change; an unchanged fetch just updates the fetch time in the
+    header, so polling an idle sheet costs one digest of the values.
+    """
+
+    def __init__(self, path: str = None):
+        """Initialize the snapshot store.
+
+        Args:
+            path: Path of the snapshot file
+        """
+        self.path = path or settings.sheet_snapshot_path
+        # Digest of the values in the file, None until saved or loaded
+        self.digest: Optional[bytes] = None
+
+    def save(
+        self, values: List[List[str]], date_columns: List[Tuple[date, int]], digest: Optional[bytes] = None
+    ) -> SheetSnapshot:
+        """Persist a snapshot of the sheet values.
+
+        Args:
+            values: Raw cell values as returned by the Sheets API
+            date_columns: Sorted (date, am_column_index) pairs of the sheet
+            digest: values_digest of the values, if the caller already has it
+
+        Returns:
+            The saved SheetSnapshot
+        """
+        fetched_at = datetime.now(pytz.timezone(settings.timezone))
+        if digest is None:
+            digest = values_digest(values)
+
+        if digest == self.digest and os.path.exists(self.path):
+            with open(self.path, "r+b") as f:
+                f.seek(len(MAGIC))
+                f.write(FETCHED_AT.pack(fetched_at.timestamp()))
+        else:
+            payload = _encode(values)
+            dates = json.dumps([(day.toordinal(), col) for day, col in date_columns]).encode("utf-8")
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, fetched_at.timestamp(), digest))
+                f.write(zlib.compress(b"%s\n%s" % (payload, dates), 1))
+            os.replace(tmp_path, self.path)
+            self.digest = digest
+
+        return SheetSnapshot(values=values, fetched_at=fetched_at, date_columns=list(date_columns))
+
+    def load(self) -> Optional[SheetSnapshot]:
+        """Load the last saved snapshot.
+
+        Returns:
+            SheetSnapshot, or None if there is no usable snapshot
+        """
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < HEADER.size:
+            return None
+
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            magic, timestamp, digest = HEADER.unpack_from(data, 0)
+            if magic != MAGIC:
+                logger.warning(f"Ignoring sheet snapshot with unknown format: {self.path}")
+                return None
+
+            payload, _, dates = zlib.decompress(data[HEADER.size:]).partition(b"\n")
+            values = json.loads(payload)
+            date_columns = [(date.fromordinal(ordinal), col) for ordinal, col in json.loads(dates)]
+            self.digest = digest
+
+            fetched_at = datetime.fromtimestamp(timestamp, pytz.timezone(settings.timezone))
+            logger.info(f"Loaded sheet snapshot as of {fetched_at:%d/%m/%Y %H:%M} from {self.path}")
+            return SheetSnapshot(values=values, fetched_at=fetched_at, date_columns=date_columns)
+
+        except Exception as e:
+            logger.warning(f"Could not load sheet snapshot from {self.path}: {e}")
+            return None
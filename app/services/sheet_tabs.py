@@ -0,0 +1,119 @@
+"""Index of the spreadsheet's tabs by the dates they cover."""
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DATE_PATTERN = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
+# Header rows holding the dates: day names (row 1) and dates merged over AM/PM (row 2)
+HEADER_ROWS = 2
+
+
+def column_letter(col_idx: int) -> str:
+    """Convert a 0-based column index to its A1 letters (0 -> A, 26 -> AA)."""
+    letters = ""
+    col_idx += 1
+    while col_idx:
+        col_idx, remainder = divmod(col_idx - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def quote_title(title: str) -> str:
+    """Quote a tab title for use in an A1 range."""
+    return "'" + title.replace("'", "''") + "'"
+
+
+def parse_header_dates(rows: Sequence[Sequence[Any]]) -> List[Tuple[date, int]]:
+    """Find the AM column of every dated day in the header rows.
+
+    Args:
+        rows: Header rows, searched in order; the first column found for a date wins
+
+    Returns:
+        Chronologically sorted (date, am_column_index) pairs
+    """
+    date_columns: Dict[date, int] = {}
+    for cells in rows:
+        for col_idx, cell in enumerate(cells):
+            match = DATE_PATTERN.search(str(cell))
+            if not match:
+                continue
+            try:
+                day, month, year = map(int, match.groups())
+                date_columns.setdefault(date(year, month, day), col_idx)
+            except ValueError:
+                continue
+    return sorted(date_columns.items())
+
+
+@dataclass(frozen=True, slots=True)
+class SheetTab:
+    """A tab of the spreadsheet and the dated days it covers."""
+
+    title: str
+    row_count: int
+    column_count: int
+    date_columns: Tuple[Tuple[date, int], ...] = ()
+
+    @property
+    def first_date(self) -> Optional[date]:
+        return self.date_columns[0][0] if self.date_columns else None
+
+    @property
+    def last_date(self) -> Optional[date]:
+        return self.date_columns[-1][0] if self.date_columns else None
+
+    def column_window(self, first: date, last: date) -> Tuple[int, int]:
+        """Get the columns holding a date range (AM of the first day to PM of the last).
+
+        Returns:
+            (first_column, last_column), 0-based and inclusive, clamped to the tab
+        """
+        dates = [day for day, _ in self.date_columns]
+        start = min(bisect_left(dates, first), len(dates) - 1)
+        end = max(bisect_right(dates, last) - 1, 0)
+        return self.date_columns[start][1], min(self.date_columns[end][1] + 1, self.column_count - 1)
+
+
+class SheetTabIndex:
+    """Maps dates to the tab covering them (e.g. one tab per year or month).
+
+    Built from the spreadsheet metadata (tab titles and grid sizes) and the
+    header rows of every tab; lookups are a binary search over the tabs'
+    first dates.
+    """
+
+    def __init__(self, tabs: Sequence[SheetTab]):
+        """Build the index.
+
+        Args:
+            tabs: Tabs of the spreadsheet; tabs without dates are ignored
+        """
+        self.tabs = {tab.title: tab for tab in tabs}
+        self._dated = sorted((tab for tab in tabs if tab.date_columns), key=lambda tab: tab.first_date)
+        self._first_dates = [tab.first_date for tab in self._dated]
+
+    def __len__(self) -> int:
+        return len(self._dated)
+
+    def covers(self, target_date: date) -> bool:
+        """Whether a tab's dates span the target date."""
+        tab = self.tab_for(target_date)
+        return tab is not None and tab.first_date <= target_date <= tab.last_date
+
+    def tab_for(self, target_date: date) -> Optional[SheetTab]:
+        """Find the tab for a date: the last tab starting on or before it.
+
+        Args:
+            target_date: Date to look up
+
+        Returns:
+            The tab, or the first tab for dates before every tab (None without dated tabs)
+        """
+        if not self._dated:
+            return None
+        index = bisect_right(self._first_dates, target_date) - 1
+        return self._dated[max(index, 0)]
@@ -0,0 +1,210 @@
+"""Background watcher that posts status changes made to today's columns of the sheet."""
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, List, Optional
+
+from loguru import logger
+
+from app.models.staff import StaffRecord, StaffRoster
+from app.services.google_sheets import GoogleSheetsService
+from app.services.telegram_service import TelegramService
+from app.utils.date_helpers import get_local_date, get_local_time
+from app.utils.metrics import metrics
+from app.utils.resilience import Backoff
+
+
+@dataclass(frozen=True, slots=True)
+class StatusChange:
+    """A staff member's parade state entry before and after a sheet edit (None if not listed)."""
+
+    label: str
+    before: Optional[str]
+    after: Optional[str]
+
+    def format_line(self) -> str:
+        if self.before is None:
+            return f"+ {self.label} - {self.after}"
+        if self.after is None:
+            return f"- {self.label} (no longer listed)"
+        return f"{self.label}: {self.before} → {self.after}"
+
+
+def _label(record: StaffRecord) -> str:
+    return record.display or record.position or str(record)
+
+
+def roster_changes(before: StaffRoster, after: StaffRoster) -> List[StatusChange]:
+    """Compare two rosters of the same day staff member by staff member.
+
+    Args:
+        before: Roster last reported
+        after: Roster just parsed
+
+    Returns:
+        Changed, added and removed staff, in the new parade order with removed staff last
+    """
+    previous = {record.name: record for record in before}
+    current = {record.name for record in after}
+    changes = []
+    for record in after:
+        old = previous.get(record.name)
+        new_status = record.status.format_status()
+        old_status = old.status.format_status() if old is not None else None
+        if old_status != new_status:
+            changes.append(StatusChange(label=_label(record), before=old_status, after=new_status))
+    for name, record in previous.items():
+        if name not in current:
+            changes.append(StatusChange(label=_label(record), before=record.status.format_status(), after=None))
+    return changes
+
+
+def format_changes(target_date: date, changes: List[StatusChange], roster: StaffRoster) -> str:
+    """Format the status changes of a day as a chat message.
+
+    Args:
+        target_date: Day the changes are for
+        changes: Changes to report
+        roster: Roster after the changes, for the updated strength
+
+    Returns:
+        Message text
+    """
+    lines = [f"🔄 Parade state update for {target_date:%d/%m/%Y} (as of {get_local_time():%H:%M})", ""]
+    lines.extend(change.format_line() for change in changes)
+    lines.append("")
+    lines.append(f"Present: {roster.count_present('AM')}/{len(roster)} (AM), {roster.count_present('PM')}/{len(roster)} (PM)")
+    return "\n".join(lines)
+
+
+class SheetWatcher:
+    """Polls today's columns of the sheet and posts the per-staff changes to the chat.
+
+    Each poll reads only the names column and today's AM/PM columns and
+    compares their hash with the last one; the sheet is fetched and parsed
+    only when the hash differs. Weekends and public holidays are skipped, and
+    the first poll of each working day records the roster without posting. Polls are spaced by a jittered interval that
+    backs off exponentially while the sheet or Telegram is failing.
+    """
+
+    def __init__(
+        self,
+        google_sheets_service: GoogleSheetsService,
+        telegram_service: TelegramService,
+        interval: float,
+        max_interval: float,
+        jitter: float = 0.2,
+        today: Callable[[], date] = get_local_date,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            google_sheets_service: Service reading the sheet
+            telegram_service: Service posting to the configured chat
+            interval: Seconds between polls
+            max_interval: Longest wait between polls while failing
+            jitter: Fraction of the interval added or removed at random
+            today: Source of the date being watched
+        """
+        self.google_sheets_service = google_sheets_service
+        self.telegram_service = telegram_service
+        self.backoff = Backoff(interval, max_interval, jitter)
+        self._today = today
+
+        self._day: Optional[date] = None
+        self._digest: Optional[str] = None
+        self._roster: Optional[StaffRoster] = None
+        self.polls = 0
+        self.updates_sent = 0
+        # time.monotonic() of the last poll
+        self.last_poll_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """Poll until the stop event is set.
+
+        Args:
+            stop_event: Event that ends the loop
+        """
+        logger.info(f"Watching today's sheet columns every {self.backoff.interval:.0f}s")
+        delay = self.backoff.first_delay()
+        while True:
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=delay)
+                return
+            except asyncio.TimeoutError:
+                pass
+
+            failed = False
+            try:
+                await self.poll_once()
+                self.last_error = None
+            except Exception as e:
+                failed = True
+                self.last_error = repr(e)
+                metrics.increment("sheet_watch_failures_total")
+                logger.warning(f"Sheet watch poll failed ({e!r}), retry #{self.backoff.failures + 1}")
+            delay = self.backoff.next_delay(failed)
+
+    async def poll_once(self) -> Optional[List[StatusChange]]:
+        """Check the sheet once and post any changes since the last report.
+
+        Returns:
+            Changes posted (possibly empty), or None if the columns were unchanged,
+            the day's first roster was recorded or today is not a working day
+        """
+        self.polls += 1
+        self.last_poll_at = time.monotonic()
+        metrics.increment("sheet_watch_polls_total")
+
+        day = self._today()
+        if day != self._day:
+            self._day, self._digest, self._roster = day, None, None
+
+        service = self.google_sheets_service
+        if not service.work_calendar.is_working_day(day):
+            return None
+        # Sheets calls block, so they run in worker threads to keep commands responsive
+        digest = await asyncio.to_thread(service.day_digest, day)
+        if digest is not None and digest == self._digest:
+            return None
+
+        def read_roster() -> StaffRoster:
+            roster = service.get_staff_list(day)
+            # data_as_of is per thread, so it is checked in the thread that read the roster
+            if service.data_as_of is not None:
+                raise RuntimeError("Google Sheets unavailable, only the snapshot could be read")
+            return roster
+
+        roster = await asyncio.to_thread(read_roster)
+        if digest is None:
+            # Today's columns are known now that the sheet has been read
+            digest = await asyncio.to_thread(service.day_digest, day)
+
+        if self._roster is None:
+            self._roster, self._digest = roster, digest
+            logger.info(f"Sheet watch: recorded {len(roster)} staff for {day:%d/%m/%Y}")
+            return None
+
+        changes = roster_changes(self._roster, roster)
+        if changes:
+            # The baseline moves only once the update is posted, so a failed send is retried
+            await self.telegram_service.send_message(format_changes(day, changes, roster))
+            self.updates_sent += 1
+            metrics.increment("sheet_watch_updates_total")
+            logger.info(f"Sheet watch: posted {len(changes)} status change(s) for {day:%d/%m/%Y}")
+        self._roster, self._digest = roster, digest
+        return changes
+
+    def describe(self) -> str:
+        """Describe the watcher for /status."""
+        if self.last_poll_at is None:
+            last = "not polled yet"
+        else:
+            last = f"last poll {time.monotonic() - self.last_poll_at:.0f}s ago"
+        error = f", failing ({self.last_error})" if self.last_error else ""
+        return (
+            f"Sheet watcher: every {self.backoff.interval:.0f}s, {last}{error}, "
+            f"{self.updates_sent} update(s) posted"
+        )
@@ -0,0 +1,172 @@
+"""Resolve active staff to sheet rows by name instead of fixed row numbers."""
+import json
+import os
+import re
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from app.config import settings
+from app.models.staff import StaffIdentity, StaffSynonym
+
+
+def _alternation(words: Sequence[str]) -> str:
+    """Regex alternation of literal words, longest first so "SLTC" wins over "LTC"."""
+    if not words:
+        return "(?!)"
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+RANK_PATTERN = re.compile(rf"^({_alternation(settings.rank_list)})\s+(.+)$")
+POSITION_PATTERN = re.compile(rf"(?<!\w)(?:{_alternation(settings.position_title_list)})(?!\w)")
+RANGE_ROWS_PATTERN = re.compile(r"[A-Za-z]+(\d*)(?::[A-Za-z]+(\d*))?$")
+
+# Relative ACTIVE_STAFF_FILE paths are resolved against the project directory
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a name for lookups (case, spacing)."""
+    return " ".join(str(name).split()).casefold()
+
+
+def name_keys(cell: str) -> List[str]:
+    """Lookup keys of a names-column cell: the full text and the name without its rank."""
+    keys = [normalize_name(cell)]
+    match = RANK_PATTERN.match(" ".join(str(cell).split()))
+    if match:
+        keys.append(normalize_name(match.group(2)))
+    return keys
+
+
+def parse_identity(cell: str) -> StaffIdentity:
+    """Parse a names-column cell into name, rank, position and display string.
+
+    Cells naming a position (e.g. "OC MECH") are shown as-is; otherwise a
+    leading rank is split off the name.
+    """
+    text = " ".join(str(cell).split())
+    if POSITION_PATTERN.search(text):
+        return StaffIdentity(name=sys.intern(text), position=text, display=text)
+    match = RANK_PATTERN.match(text)
+    if match:
+        rank, name = match.group(1), match.group(2)
+        return StaffIdentity(name=sys.intern(name), rank=sys.intern(rank), display=f"{rank} {name}")
+    return StaffIdentity(name=sys.intern(text), display=text)
+
+
+def range_rows(a1_range: str) -> Tuple[int, Optional[int]]:
+    """Get the 1-indexed first and last row of an A1 range like "Sheet1!A1:A40".
+
+    Returns:
+        (first_row, last_row); last_row is None for open ranges
+    """
+    cells = a1_range.rsplit("!", 1)[-1]
+    match = RANGE_ROWS_PATTERN.search(cells)
+    if not match:
+        return 1, None
+    first = int(match.group(1)) if match.group(1) else 1
+    last = int(match.group(2)) if match.group(2) else None
+    return first, last
+
+
+def load_active_staff(path: str) -> Optional[List[StaffSynonym]]:
+    """Load the active staff list.
+
+    The file is a JSON list in parade order; each entry is a name or an object
+    with "name" and optional "synonyms" (other spellings used in the sheet).
+    A relative path is resolved against the project directory, so the bot
+    finds the file whatever directory it is started from.
+
+    Args:
+        path: Path of the JSON file, empty to list every named row
+
+    Returns:
+        Active staff, or None if no file is configured or it does not exist
+    """
+    if not path:
+        return None
+    if not os.path.isabs(path):
+        path = os.path.join(PROJECT_DIR, path)
+    if not os.path.exists(path):
+        logger.warning(
+            f"Active staff file {path} not found, listing every named row of the sheet; "
+            "create it from active_staff.example.json to choose and order the staff"
+        )
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    return [
+        StaffSynonym(name=entry) if isinstance(entry, str) else StaffSynonym.model_validate(entry)
+        for entry in entries
+    ]
+
+
+class StaffIndex:
+    """Hash index from normalized names to DataFrame rows of the names column."""
+
+    __slots__ = ("names", "rows", "first_row", "first_staff_row")
+
+    def __init__(self, names: Sequence[str], first_row: int = 0):
+        """Build the index.
+
+        Args:
+            names: Cells of the names column, in sheet order
+            first_row: DataFrame row index of names[0]
+        """
+        self.names = tuple(names)
+        self.rows: Dict[str, int] = {}
+        self.first_row = first_row
+        self.first_staff_row = first_row
+
+        for offset, cell in enumerate(self.names):
+            if not cell:
+                continue
+            # Staff rows start below the "Name" header cell
+            if normalize_name(cell) == "name":
+                self.first_staff_row = first_row + offset + 1
+                continue
+            for key in name_keys(cell):
+                if key in self.rows and self.rows[key] != first_row + offset:
+                    logger.warning(f"Name '{cell}' appears more than once in the names column")
+                    continue
+                self.rows[key] = first_row + offset
+        self.rows = {key: row for key, row in self.rows.items() if row >= self.first_staff_row}
+
+    def find(self, staff: StaffSynonym) -> Optional[int]:
+        """Find the row of a staff member by name, then by synonyms.
+
+        Returns:
+            DataFrame row index, or None if no name matches
+        """
+        for name in (staff.name, *staff.synonyms):
+            row = self.rows.get(normalize_name(name))
+            if row is not None:
+                return row
+        return None
+
+    def cell(self, row: int) -> str:
+        """Get the names-column cell of a DataFrame row."""
+        return self.names[row - self.first_row]
+
+    def resolve(self, active_staff: Optional[Sequence[StaffSynonym]]) -> List[Tuple[StaffSynonym, int]]:
+        """Resolve the active staff to rows, in parade order.
+
+        Args:
+            active_staff: Active staff list, or None to take every named staff row
+
+        Returns:
+            (staff, DataFrame row index) of the staff found
+        """
+        if active_staff is None:
+            return [(StaffSynonym(name=self.cell(row)), row) for row in sorted(set(self.rows.values()))]
+
+        resolved = []
+        for staff in active_staff:
+            row = self.find(staff)
+            if row is None:
+                logger.warning(f"Active staff member '{staff.name}' was not found in the names column")
+                continue
+            resolved.append((staff, row))
+        return resolved
@@ -0,0 +1,224 @@
+"""Inverted index of staff statuses over the dated days of the sheet."""
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.models.history import PERIOD_INDEX, PERIODS, StatusHistory, StatusSegment
+from app.models.staff import StatusType
+
+StatusKey = Tuple[StatusType, Optional[str]]
+
+
+class StatusIndex:
+    """Inverted index from (status type, location) to staff and half-day slots.
+
+    Every dated half-day of the sheet is a bit position (2 * day + period).
+    For each (status type, location) the index keeps a bitset of the staff who
+    have it and, per staff member, a bitset of the slots they have it on, so
+    "who is on OL this week" is a few AND operations instead of a sheet scan.
+    "Where is X" reads the staff member's run-length history directly.
+
+    ``update`` re-indexes only the staff whose history changed (histories
+    are rebuilt with every fetch, so they are compared by their segments).
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._reset(())
+        # time.monotonic() of the last update
+        self.refreshed_at: Optional[float] = None
+
+    def _reset(self, dates: Tuple[date, ...]) -> None:
+        self.dates = dates
+        self.staff: Dict[str, int] = {}
+        self._histories: Dict[str, StatusHistory] = {}
+        self._staff_slots: Dict[str, Dict[StatusKey, int]] = {}
+        self._key_staff: Dict[StatusKey, int] = defaultdict(int)
+        self._key_slots: Dict[StatusKey, Dict[int, int]] = defaultdict(dict)
+        self._names: Dict[int, str] = {}
+        self._order: Dict[str, int] = {}
+        self._free_bits: List[int] = []
+        # Bits of the AM slots; shifted by one for PM
+        self._am_slots = int("01" * len(dates), 2) if dates else 0
+
+    def __len__(self) -> int:
+        return len(self.staff)
+
+    def update(self, dates: Iterable[date], histories: Mapping[str, StatusHistory]) -> int:
+        """Make the index match the staff histories of a sheet.
+
+        Args:
+            dates: Sorted dated days of the sheet
+            histories: Status history by staff name, in parade order
+
+        Returns:
+            Number of staff added, changed or removed
+        """
+        dates = tuple(dates)
+        if dates != self.dates:
+            # Slot positions moved, start over
+            self._reset(dates)
+
+        changed = 0
+        for name in [name for name in self.staff if name not in histories]:
+            self._remove(name)
+            changed += 1
+        for name, history in histories.items():
+            old = self._histories.get(name)
+            if old is None or (old is not history and old.segments != history.segments):
+                if name in self.staff:
+                    self._remove(name)
+                self._add(name, history)
+                changed += 1
+        self._order = {name: order for order, name in enumerate(histories)}
+        self.refreshed_at = time.monotonic()
+        return changed
+
+    def covers(self, start: date, end: date) -> bool:
+        """Check that a date range lies within the indexed days.
+
+        Days outside them (e.g. beyond a SHEET_WINDOW_DAYS read) have no data,
+        which is not the same as nobody having a status on them.
+
+        Args:
+            start: First date (inclusive)
+            end: Last date (inclusive)
+
+        Returns:
+            True if the index spans the whole range
+        """
+        return bool(self.dates) and self.dates[0] <= start and end <= self.dates[-1]
+
+    def _slot(self, day: date, period: str) -> int:
+        return 2 * bisect_left(self.dates, day) + PERIOD_INDEX[period]
+
+    def _add(self, name: str, history: StatusHistory) -> None:
+        # Reuse freed staff bits so the bitsets stay short
+        bit = self._free_bits.pop() if self._free_bits else len(self.staff)
+        staff_mask = 1 << bit
+        self.staff[name] = bit
+        self._names[bit] = name
+        self._histories[name] = history
+
+        slots: Dict[StatusKey, int] = defaultdict(int)
+        for segment in history.segments:
+            first = self._slot(segment.start, segment.start_period)
+            last = self._slot(segment.end, segment.end_period)
+            slots[(segment.status_type, segment.location)] |= ((1 << (last - first + 1)) - 1) << first
+        self._staff_slots[name] = dict(slots)
+        for key, key_slots in slots.items():
+            self._key_staff[key] |= staff_mask
+            self._key_slots[key][bit] = key_slots
+
+    def _remove(self, name: str) -> None:
+        bit = self.staff.pop(name)
+        del self._names[bit]
+        del self._histories[name]
+        self._free_bits.append(bit)
+        for key in self._staff_slots.pop(name):
+            self._key_staff[key] &= ~(1 << bit)
+            del self._key_slots[key][bit]
+            if not self._key_staff[key]:
+                del self._key_staff[key]
+                del self._key_slots[key]
+
+    def slot_mask(self, start: date, end: date, period: Optional[str] = None) -> int:
+        """Get the bitset of the half-day slots in a date range.
+
+        Args:
+            start: First date (inclusive)
+            end: Last date (inclusive)
+            period: Only this period ("AM" or "PM") of each day
+
+        Returns:
+            Bitset of slot positions
+        """
+        first = bisect_left(self.dates, start)
+        last = bisect_right(self.dates, end)
+        if last <= first:
+            return 0
+        mask = ((1 << (2 * (last - first))) - 1) << (2 * first)
+        if period in PERIODS:
+            mask &= self._am_slots << PERIOD_INDEX[period]
+        return mask
+
+    def keys(self, status_type: StatusType, location: Optional[str] = None) -> List[StatusKey]:
+        """Get the indexed (status type, location) pairs of a status.
+
+        Args:
+            status_type: Status type
+            location: Only locations containing this text (case-insensitive)
+
+        Returns:
+            Matching keys
+        """
+        needle = location.casefold() if location else None
+        return [
+            key
+            for key in self._key_staff
+            if key[0] == status_type and (needle is None or (key[1] and needle in key[1].casefold()))
+        ]
+
+    def who(
+        self,
+        status_type: StatusType,
+        start: date,
+        end: date,
+        location: Optional[str] = None,
+        period: Optional[str] = None,
+    ) -> List[Tuple[str, List[StatusSegment]]]:
+        """Find the staff with a status on any half-day of a date range.
+
+        Args:
+            status_type: Status type
+            start: First date (inclusive)
+            end: Last date (inclusive)
+            location: Only locations containing this text (case-insensitive)
+            period: Only this period ("AM" or "PM") of each day
+
+        Returns:
+            (staff name, their runs of the status overlapping the range), in parade order
+        """
+        mask = self.slot_mask(start, end, period)
+        keys = self.keys(status_type, location)
+        candidates = 0
+        for key in keys:
+            candidates |= self._key_staff[key]
+
+        found = []
+        while candidates:
+            low = candidates & -candidates
+            candidates ^= low
+            bit = low.bit_length() - 1
+            if any(self._key_slots[key].get(bit, 0) & mask for key in keys):
+                found.append(self._names[bit])
+        found.sort(key=self._order.__getitem__)
+
+        return [
+            (
+                name,
+                [
+                    segment
+                    for segment in self._histories[name].segments_between(start, end)
+                    if (segment.status_type, segment.location) in keys
+                ],
+            )
+            for name in found
+        ]
+
+    def where(self, name: str, target_date: date) -> Tuple[Optional[StatusSegment], Optional[StatusSegment]]:
+        """Get a staff member's AM and PM runs covering a date.
+
+        Args:
+            name: Staff name as indexed
+            target_date: Date to look up
+
+        Returns:
+            (AM segment, PM segment); None where the date is not in the sheet
+        """
+        history = self._histories.get(name)
+        if history is None:
+            return None, None
+        return history.segment_at(target_date, "AM"), history.segment_at(target_date, "PM")
@@ -1,79 +1,213 @@
 """Telegram service for interacting with Telegram Bot API."""
+import asyncio
+import os
 import re
 from datetime import datetime, date
 from typing import Dict, List, Optional, Tuple
 
 from loguru import logger
 from telegram import Bot, Update
-from telegram.constants import ParseMode
-from telegram.ext import Application, CommandHandler, MessageHandler, filters
+from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters
 
 from app.config import settings
 from app.models.duty import DutyInstructor, DutySchedule
+from app.utils.metrics import metrics
+from app.utils.resilience import CircuitBreaker
 
 
 class TelegramService:
     """Service for interacting with Telegram Bot API."""
 
-    def __init__(self, token: str = None, chat_id: str = None):
+    def __init__(self, token: str = None, chat_id: str = None, bot: Optional[Bot] = None):
         """Initialize the Telegram service.
 
         Args:
             token: Telegram bot token
             chat_id: Telegram chat ID
+            bot: Pre-built Bot client (benchmarks, tests)
         """
         self.token = token or settings.telegram_bot_token
         self.chat_id = chat_id or settings.telegram_chat_id
-        self.bot = Bot(token=self.token)
+        if bot is None:
+            bot = Bot(token=self.token, base_url=settings.telegram_api_base_url) if settings.telegram_api_base_url else Bot(token=self.token)
+        self.bot = bot
+        # One breaker per Bot API method, so failing getUpdates polls cannot block sendMessage
+        self.breakers: Dict[str, CircuitBreaker] = {
+            method: CircuitBreaker(
+                f"Telegram {method}",
+                failure_threshold=settings.circuit_failure_threshold,
+                reset_timeout=settings.circuit_reset_timeout,
+            )
+            for method in ("sendMessage", "getUpdates")
+        }
+
+        # Last DI schedule found, served when Telegram is unavailable; the
+        # post it came from is saved so a restart does not lose it
+        self._duty_schedule_cache: Optional[DutySchedule] = None
+        self._di_list_text: Optional[str] = None
+        self.di_list_path = settings.di_list_path
+        self._load_di_list()
+        # Set when a bot application receives this chat's updates (webhook or
+        # long polling): DI lists then arrive through handle_di_message, and
+        # getUpdates would conflict with the webhook or the polling updater
+        self.receives_updates = False
+
+    @property
+    def cached_duty_schedule(self) -> DutySchedule:
+        """Last DI schedule found, without calling the Bot API."""
+        return self._duty_schedule_cache or DutySchedule()
 
-    async def send_message(self, message: str) -> None:
+    async def _call(self, method: str, coro, timeout: Optional[float] = None, stage: str = "telegram_call"):
+        """Await a Bot API call through the circuit breaker of its method.
+
+        Args:
+            method: Bot API method name, selects the breaker
+            coro: Coroutine of the Bot API call
+            timeout: Seconds to wait before giving up
+            stage: Metrics stage name of the call
+
+        Returns:
+            Result of the call
+        """
+        breaker = self.breakers[method]
+        try:
+            breaker.check()
+        except Exception:
+            coro.close()
+            raise
+        try:
+            with metrics.timer(stage):
+                result = await asyncio.wait_for(coro, timeout=timeout)
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled with the command: no outcome, but the probe must not stay taken
+            breaker.record_abandoned()
+            raise
+        breaker.record_success()
+        return result
+
+    async def send_message(
+        self, message: str, timeout: Optional[float] = None, parse_mode: Optional[str] = None
+    ) -> None:
         """Send a message to the configured chat.
 
         Args:
-            message: The message to send
+            message: The message to send, escaped for the parse mode if there is one
+            timeout: Seconds to wait for the Bot API
+            parse_mode: Telegram parse mode, defaults to plain text
         """
         try:
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode=ParseMode.MARKDOWN,
+            await self._call(
+                "sendMessage",
+                self.bot.send_message(
+                    chat_id=self.chat_id,
+                    text=message,
+                    parse_mode=parse_mode,
+                ),
+                timeout=timeout,
+                stage="telegram_send",
             )
             logger.info(f"Message sent to chat {self.chat_id}")
         except Exception as e:
             logger.error(f"Error sending message to Telegram: {e}")
             raise
 
-    async def fetch_di_list(self) -> DutySchedule:
+    def remember_di_list(self, message_text: str) -> bool:
+        """Cache (and save) the DI schedule of a chat message if it is a /DI LIST post.
+
+        Args:
+            message_text: The text content of the message
+
+        Returns:
+            True if the message was a DI list
+        """
+        if "/DI LIST" not in message_text.upper():
+            return False
+        self._duty_schedule_cache = self._parse_di_list(message_text)
+        if message_text != self._di_list_text:
+            self._di_list_text = message_text
+            self._save_di_list(message_text)
+        return True
+
+    def _load_di_list(self) -> None:
+        """Restore the DI schedule from the last saved /DI LIST post, if any."""
+        if not self.di_list_path or not os.path.exists(self.di_list_path):
+            return
+        try:
+            with open(self.di_list_path, encoding="utf-8") as f:
+                text = f.read()
+        except OSError as e:
+            logger.warning(f"Could not read the saved DI list {self.di_list_path}: {e}")
+            return
+        self._duty_schedule_cache = self._parse_di_list(text)
+        self._di_list_text = text
+        logger.info(f"Loaded the saved DI list from {self.di_list_path}")
+
+    def _save_di_list(self, text: str) -> None:
+        """Save a /DI LIST post, replacing the file atomically."""
+        if not self.di_list_path:
+            return
+        try:
+            if os.path.dirname(self.di_list_path):
+                os.makedirs(os.path.dirname(self.di_list_path), exist_ok=True)
+            tmp_path = f"{self.di_list_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, self.di_list_path)
+        except OSError as e:
+            logger.warning(f"Could not save the DI list to {self.di_list_path}: {e}")
+
+    async def handle_di_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle a /DI LIST post arriving as an update."""
+        message = update.effective_message
+        if message is not None and message.text and self.remember_di_list(message.text):
+            logger.info(f"DI list updated from chat {message.chat_id}")
+
+    async def fetch_di_list(self, timeout: Optional[float] = None) -> DutySchedule:
         """Fetch the duty instructor list from Telegram chat history.
 
+        When a bot application receives the updates (``receives_updates``),
+        the schedule collected by handle_di_message is returned without
+        calling getUpdates.
+
+        Args:
+            timeout: Seconds to wait for the Bot API
+
         Returns:
             DutySchedule with parsed DI information
         """
         duty_schedule = DutySchedule()
+        if self.receives_updates:
+            return self.cached_duty_schedule
 
         try:
             # Using get_updates to fetch recent messages
             # This is a workaround as get_chat_history is no longer available
             # In a real implementation, it's better to store DI list in a database
-            updates = await self.bot.get_updates(
-                offset=-100,  # Get recent updates
-                allowed_updates=["message"]
+            updates = await self._call(
+                "getUpdates",
+                self.bot.get_updates(
+                    offset=-100,  # Get recent updates
+                    allowed_updates=["message"]
+                ),
+                timeout=timeout,
+                stage="telegram_get_updates",
             )
             
             for update in updates:
-                if update.message and update.message.text and "/DI LIST" in update.message.text.upper():
-                    # Parse the DI information from the message
-                    di_schedule = self._parse_di_list(update.message.text)
-                    if di_schedule:
-                        duty_schedule = di_schedule
-                        break
+                # Parse the DI information from the message
+                if update.message and update.message.text and self.remember_di_list(update.message.text):
+                    duty_schedule = self._duty_schedule_cache
+                    break
 
             return duty_schedule
         
         except Exception as e:
-            logger.error(f"Error fetching DI list from Telegram: {e}")
-            # Return empty schedule on error
-            return duty_schedule
+            logger.error(f"Error fetching DI list from Telegram: {e!r}")
+            # Fall back to the last known schedule, or an empty one
+            return self._duty_schedule_cache or duty_schedule
 
     def _parse_di_list(self, message_text: str) -> DutySchedule:
         """Parse duty instructor information from message text.
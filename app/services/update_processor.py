@@ -0,0 +1,140 @@
+"""Concurrent update processing that keeps each chat's updates in order."""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+from loguru import logger
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+from app.utils.metrics import metrics
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Handles updates from different chats concurrently, one chat at a time.
+
+    Updates are admitted up to max_in_flight (running or waiting for their
+    turn); beyond that they are answered by the reject callback instead of
+    queueing behind a slow command. Within a chat, each update waits for the
+    previous one to finish, so replies keep the order the commands were sent in.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_in_flight: int,
+        on_reject: Optional[Callable[[object], Awaitable[None]]] = None,
+    ):
+        """Initialize the processor.
+
+        Args:
+            workers: Updates handled at the same time
+            max_in_flight: Updates accepted (running or waiting) before rejecting
+            on_reject: Coroutine function called with each rejected update
+        """
+        workers = max(1, workers)
+        max_in_flight = max(workers, max_in_flight)
+        # PTB's own semaphore is taken before do_process_update; size it above
+        # the admission limit so excess updates reach the reject path instead
+        # of waiting on it
+        super().__init__(max_concurrent_updates=2 * max_in_flight)
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+        self.on_reject = on_reject
+
+        self.in_flight = 0
+        self.running = 0
+        self.peak_in_flight = 0
+        self.rejected = 0
+        self._worker_slots = asyncio.Semaphore(workers)
+        self._chat_tails: Dict[Hashable, asyncio.Future] = {}
+        self._background: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def _chat_key(update: object) -> Optional[Hashable]:
+        if isinstance(update, Update) and update.effective_chat is not None:
+            return update.effective_chat.id
+        return None
+
+    @property
+    def waiting(self) -> int:
+        """Updates admitted but not yet running."""
+        return self.in_flight - self.running
+
+    def _publish(self) -> None:
+        metrics.set_gauge("updates_in_flight", self.in_flight)
+        metrics.set_gauge("updates_running", self.running)
+        metrics.set_gauge("updates_waiting", self.waiting)
+
+    def describe(self) -> str:
+        """Describe the queue state for the status command."""
+        return (
+            f"Updates: {self.running}/{self.workers} running, {self.waiting} waiting "
+            f"(peak {self.peak_in_flight}/{self.max_in_flight}), {self.rejected} rejected"
+        )
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        if self.in_flight >= self.max_in_flight:
+            self._reject(update, coroutine)
+            return
+
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self._publish()
+
+        key = self._chat_key(update)
+        previous = self._chat_tails.get(key) if key is not None else None
+        done = asyncio.get_running_loop().create_future()
+        if key is not None:
+            self._chat_tails[key] = done
+
+        queued_at = time.perf_counter()
+        started = False
+        try:
+            if previous is not None:
+                await previous
+            async with self._worker_slots:
+                metrics.observe("update_wait", time.perf_counter() - queued_at)
+                self.running += 1
+                self._publish()
+                started = True
+                try:
+                    await coroutine
+                finally:
+                    self.running -= 1
+        finally:
+            if not started:
+                # Cancelled while waiting for its turn
+                coroutine.close()
+            self.in_flight -= 1
+            self._publish()
+            done.set_result(None)
+            if key is not None and self._chat_tails.get(key) is done:
+                del self._chat_tails[key]
+
+    def _reject(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """Drop an update that exceeds the admission limit."""
+        coroutine.close()
+        self.rejected += 1
+        metrics.increment("updates_rejected_total")
+        logger.warning(f"Rejected update from chat {self._chat_key(update)}: {self.in_flight} updates in flight")
+        if self.on_reject is None:
+            return
+
+        # Answer outside the PTB semaphore so a slow reply cannot hold a slot
+        task = asyncio.create_task(self.on_reject(update))
+        self._background.add(task)
+        task.add_done_callback(self._reject_done)
+
+    def _reject_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Could not answer rejected update: {task.exception()}")
+
+    async def initialize(self) -> None:
+        """Nothing to allocate."""
+
+    async def shutdown(self) -> None:
+        """Wait for pending busy replies."""
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
@@ -0,0 +1,186 @@
+"""Working-day calendar: weekends plus public holidays marked in the sheet."""
+from array import array
+from datetime import date, timedelta
+from typing import Collection, FrozenSet, Iterable, Sequence, Tuple
+
+import numpy as np
+
+# Cell value marking a public holiday
+HOLIDAY_MARK = "PH"
+
+
+def find_holidays(
+    rows: Sequence[Sequence[object]],
+    date_columns: Sequence[Tuple[date, int]],
+    staff_rows: Iterable[int],
+) -> FrozenSet[date]:
+    """Find the days marked as public holidays across the staff rows.
+
+    A day is a holiday when at least half of the staff rows read PH in its AM
+    and PM columns and no staff row has anything else there (blank cells are
+    allowed, e.g. for new staff).
+
+    Args:
+        rows: Raw cell rows below the header row
+        date_columns: Sorted (date, am_column_index) pairs of the sheet
+        staff_rows: Row indices of the staff
+
+    Returns:
+        Holiday dates
+    """
+    staff_rows = list(staff_rows)
+    if not staff_rows or not date_columns:
+        return frozenset()
+
+    am_cols = np.array([col for _, col in date_columns])
+    width = int(am_cols.max()) + 2
+    grid = np.empty((len(staff_rows), width), dtype=object)
+    grid.fill("")
+    for position, row_idx in enumerate(staff_rows):
+        row = rows[row_idx][:width]
+        grid[position, :len(row)] = [value.strip() if isinstance(value, str) else "" for value in row]
+
+    holidays = []
+    for period_cols in (am_cols, am_cols + 1):
+        cells = grid[:, period_cols]
+        marked = (cells == HOLIDAY_MARK).sum(axis=0)
+        other = ((cells != HOLIDAY_MARK) & (cells != "")).sum(axis=0)
+        holidays.append((2 * marked >= len(staff_rows)) & (other == 0))
+    days = np.nonzero(holidays[0] & holidays[1])[0]
+    return frozenset(date_columns[day][0] for day in days.tolist())
+
+
+class WorkCalendar:
+    """Working days of whole years, precomputed so every lookup is O(1).
+
+    For each day of the span the calendar stores whether it is a working
+    day, the offset of the next and previous working day, and the number of
+    working days before it. Dates outside the span fall back to the weekend
+    rule alone.
+    """
+
+    def __init__(
+        self,
+        first_year: int,
+        last_year: int,
+        holidays: Collection[date] = (),
+        weekend_days: Collection[int] = (5, 6),
+    ):
+        """Precompute the calendar.
+
+        Args:
+            first_year: First year of the span
+            last_year: Last year of the span (inclusive)
+            holidays: Public holidays in the span
+            weekend_days: Weekdays off (0=Monday, 6=Sunday)
+        """
+        if len(set(weekend_days)) >= 7:
+            raise ValueError("At least one weekday must be a working day")
+        self.start = date(first_year, 1, 1)
+        self.end = date(last_year, 12, 31)
+        self.holidays = frozenset(holidays)
+        self.weekend_days = frozenset(weekend_days)
+
+        size = (self.end - self.start).days + 1
+        first_weekday = self.start.weekday()
+        self._working = bytearray(
+            (first_weekday + offset) % 7 not in self.weekend_days for offset in range(size)
+        )
+        for holiday in self.holidays:
+            if self.start <= holiday <= self.end:
+                self._working[(holiday - self.start).days] = 0
+
+        # Offset of the next working day at or after each offset (size if none)
+        self._next = array("i", [size]) * (size + 1)
+        for offset in range(size - 1, -1, -1):
+            self._next[offset] = offset if self._working[offset] else self._next[offset + 1]
+        # Offset of the previous working day at or before each offset (-1 if none)
+        self._previous = array("i", [-1]) * size
+        last = -1
+        for offset in range(size):
+            if self._working[offset]:
+                last = offset
+            self._previous[offset] = last
+        # Working days before each offset
+        self._before = array("i", [0]) * (size + 1)
+        for offset in range(size):
+            self._before[offset + 1] = self._before[offset] + self._working[offset]
+
+    @classmethod
+    def for_dates(
+        cls, dates: Iterable[date], holidays: Collection[date] = (), weekend_days: Collection[int] = (5, 6)
+    ) -> "WorkCalendar":
+        """Build a calendar over the whole years of some dates."""
+        years = [day.year for day in dates]
+        return cls(min(years), max(years), holidays, weekend_days)
+
+    def __contains__(self, target_date: date) -> bool:
+        return self.start <= target_date <= self.end
+
+    def _offset(self, target_date: date) -> int:
+        return (target_date - self.start).days
+
+    def is_working_day(self, target_date: date) -> bool:
+        """Whether a date is neither a weekend day nor a public holiday."""
+        if target_date in self:
+            return bool(self._working[self._offset(target_date)])
+        return target_date.weekday() not in self.weekend_days
+
+    def next_working_day(self, target_date: date, inclusive: bool = False) -> date:
+        """Get the first working day after a date.
+
+        Args:
+            target_date: Date to start from
+            inclusive: Return the date itself if it is a working day
+
+        Returns:
+            Next working day
+        """
+        start = target_date if inclusive else target_date + timedelta(days=1)
+        if start in self:
+            offset = self._next[self._offset(start)]
+            if offset < len(self._working):
+                return self.start + timedelta(days=offset)
+            start = self.end + timedelta(days=1)
+        return self._step(start, 1)
+
+    def previous_working_day(self, target_date: date, inclusive: bool = False) -> date:
+        """Get the last working day before a date.
+
+        Args:
+            target_date: Date to start from
+            inclusive: Return the date itself if it is a working day
+
+        Returns:
+            Previous working day
+        """
+        start = target_date if inclusive else target_date - timedelta(days=1)
+        if start in self:
+            offset = self._previous[self._offset(start)]
+            if offset >= 0:
+                return self.start + timedelta(days=offset)
+            start = self.start - timedelta(days=1)
+        return self._step(start, -1)
+
+    def working_days_between(self, first: date, last: date) -> int:
+        """Count the working days in a date range.
+
+        Args:
+            first: First date (inclusive)
+            last: Last date (inclusive)
+
+        Returns:
+            Number of working days, 0 for an empty range
+        """
+        if last < first:
+            return 0
+        if first in self and last in self:
+            return self._before[self._offset(last) + 1] - self._before[self._offset(first)]
+        return sum(self.is_working_day(first + timedelta(days=i)) for i in range((last - first).days + 1))
+
+    def _step(self, start: date, direction: int) -> date:
+        # Outside the span only weekends are known
+        day = start
+        while not self.is_working_day(day):
+            day += timedelta(days=direction)
+        return day
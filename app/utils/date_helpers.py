@@ -1,6 +1,7 @@
 """Date-related utility functions."""
 import calendar
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Tuple
 
 import pytz
@@ -8,6 +9,12 @@ import pytz
 from app.config import settings
 
 
+@lru_cache(maxsize=8)
+def _timezone(name: str) -> pytz.BaseTzInfo:
+    """Look up a timezone once per name."""
+    return pytz.timezone(name)
+
+
 def get_local_time(timezone: Optional[str] = None) -> datetime:
     """Get the current time in the specified timezone.
 
@@ -17,8 +24,7 @@ def get_local_time(timezone: Optional[str] = None) -> datetime:
     Returns:
         Current datetime in the specified timezone
     """
-    tz = pytz.timezone(timezone or settings.timezone)
-    return datetime.now(tz)
+    return datetime.now(_timezone(timezone or settings.timezone))
 
 
 def get_local_date(timezone: Optional[str] = None) -> date:
@@ -72,9 +78,10 @@ def parse_date_with_year(date_str: str) -> date:
     
     if len(parts) == 2:  # DD/MM format
         day, month = map(int, parts)
-        year = get_local_date().year
+        today = get_local_date()
+        year = today.year
         # If the month is earlier than current month, assume it's next year
-        if month < get_local_date().month:
+        if month < today.month:
             year += 1
     elif len(parts) == 3:  # DD/MM/YYYY format
         day, month, year = map(int, parts)
@@ -84,6 +91,27 @@ def parse_date_with_year(date_str: str) -> date:
     return date(year, month, day)
 
 
+def parse_past_date(date_str: str, today: date) -> date:
+    """Parse a date string that may or may not include the year, preferring past dates.
+
+    Args:
+        date_str: Date string in format DD/MM or DD/MM/YYYY
+        today: Latest date a DD/MM date may fall on
+
+    Returns:
+        Parsed date object, the last such day on or before today if the year is omitted
+    """
+    parts = date_str.split("/")
+    if len(parts) != 2:
+        return parse_date_with_year(date_str)
+
+    day, month = map(int, parts)
+    year = today.year
+    if (month, day) > (today.month, today.day):
+        year -= 1
+    return date(year, month, day)
+
+
 def get_next_weekday(start_date: date, weekday: int) -> date:
     """Get the next occurrence of a specific weekday.
 
@@ -112,3 +140,45 @@ def get_date_range(start_date: date, end_date: date) -> list[date]:
     """
     delta = end_date - start_date
     return [start_date + timedelta(days=i) for i in range(delta.days + 1)]
+
+
+def parse_day_range(text: str, today: date, prefer_past: bool = False) -> Tuple[date, date]:
+    """Parse a day or range of days as used in bot commands.
+
+    Args:
+        text: "today", "tomorrow", "week" (rest of this week), "nextweek",
+            DD/MM[/YYYY] or DD/MM[/YYYY]-DD/MM[/YYYY]
+        today: Current local date
+        prefer_past: Read a DD/MM without a year as its last occurrence (e.g. for
+            /history) rather than as an upcoming day; a range then ends on or
+            before today and starts on or before its end
+
+    Returns:
+        (first, last) dates, inclusive
+
+    Raises:
+        ValueError: If the text is not a day or range
+    """
+    text = text.strip().lower()
+    if text == "today":
+        return today, today
+    if text == "tomorrow":
+        tomorrow = today + timedelta(days=1)
+        return tomorrow, tomorrow
+    if text == "week":
+        return today, today + timedelta(days=6 - today.weekday())
+    if text == "nextweek":
+        monday = get_next_weekday(today, 0)
+        return monday, monday + timedelta(days=6)
+    if "-" in text:
+        first_text, last_text = (part.strip() for part in text.split("-", 1))
+        if prefer_past:
+            last = parse_past_date(last_text, today)
+            first = parse_past_date(first_text, last)
+        else:
+            first, last = parse_date_with_year(first_text), parse_date_with_year(last_text)
+        if last < first:
+            raise ValueError(f"Range ends before it starts: {text}")
+        return first, last
+    day = parse_past_date(text, today) if prefer_past else parse_date_with_year(text)
+    return day, day
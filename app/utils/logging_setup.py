@@ -0,0 +1,134 @@
+"""Shared logging setup for the CLI and bot entry points."""
+import inspect
+import logging
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.config import settings
+
+HUMAN_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} | {message}"
+
+# Records at or above this level are never rate limited
+UNLIMITED_LEVEL = logger.level("ERROR").no
+
+_configured = False
+
+
+class CallSiteRateLimiter:
+    """Per-call-site rate limiting with sampling for noisy log statements.
+
+    Each call site (module, function, line) may log ``limit`` records per
+    ``window`` seconds; past that, only one in ``sample_every`` records is
+    kept. The first record of the next window carries the number of records
+    dropped in the previous one (``extra["suppressed"]``).
+
+    The decision is made once per record in a patcher, so every sink sees the
+    same records; sinks drop marked records with ``filter``.
+    """
+
+    def __init__(self, limit: int, window: float, sample_every: int):
+        """Initialize the limiter.
+
+        Args:
+            limit: Records per call site and window that are always kept
+            window: Window length in seconds
+            sample_every: Keep one in this many records past the limit (0 drops them all)
+        """
+        self.limit = limit
+        self.window = window
+        self.sample_every = sample_every
+        # call site -> [window start, records seen, records dropped]
+        self._sites: Dict[Tuple[str, str, int], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def patch(self, record: dict) -> None:
+        if self.limit <= 0 or record["level"].no >= UNLIMITED_LEVEL:
+            return
+        key = (record["name"], record["function"], record["line"])
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                if site is not None and site[2]:
+                    record["extra"]["suppressed"] = int(site[2])
+                site = self._sites[key] = [now, 0, 0]
+            site[1] += 1
+            over = site[1] - self.limit
+            if over > 0 and (self.sample_every <= 0 or over % self.sample_every):
+                site[2] += 1
+                record["extra"]["drop"] = True
+
+    @staticmethod
+    def filter(record: dict) -> bool:
+        return not record["extra"].get("drop", False)
+
+
+def _human_format(record: dict) -> str:
+    suppressed = record["extra"].get("suppressed")
+    suffix = f" ({suppressed} similar suppressed)" if suppressed else ""
+    return HUMAN_FORMAT + suffix + "\n{exception}"
+
+
+class InterceptHandler(logging.Handler):
+    """Forward stdlib logging (python-telegram-bot, httpx, googleapiclient) to loguru."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+
+        # Report the caller of the stdlib logger, not this handler
+        frame, depth = inspect.currentframe(), 0
+        while frame is not None and (depth == 0 or frame.f_code.co_filename == logging.__file__):
+            frame = frame.f_back
+            depth += 1
+        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+
+
+def setup_logging(log_file: Optional[str] = None, json_output: Optional[bool] = None) -> None:
+    """Configure loguru sinks once per process.
+
+    Sinks write from a background queue (``enqueue=True``), so request
+    handlers only pay for building the record, and records past the per-call
+    -site rate limit are dropped before any sink sees them.
+
+    Args:
+        log_file: Rotating log file path, defaults to the LOG_FILE setting (empty disables)
+        json_output: Write JSON records instead of text, defaults to the LOG_JSON setting
+    """
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    log_file = settings.log_file if log_file is None else log_file
+    json_output = settings.log_json if json_output is None else json_output
+    limiter = CallSiteRateLimiter(settings.log_rate_limit, settings.log_rate_window, settings.log_sample_every)
+
+    logger.remove()
+    logger.configure(patcher=limiter.patch)
+    sink_options = {
+        "level": settings.log_level,
+        "enqueue": True,
+        "filter": limiter.filter,
+        "serialize": json_output,
+        "format": HUMAN_FORMAT if json_output else _human_format,
+    }
+    logger.add(sys.stderr, **sink_options)
+    if log_file:
+        logger.add(log_file, rotation="1 day", retention=settings.log_retention, **sink_options)
+
+    # Route stdlib loggers through the same sinks, filtering at the source
+    stdlib_level = logging.getLevelName(settings.log_level.upper())
+    logging.basicConfig(
+        handlers=[InterceptHandler()],
+        level=stdlib_level if isinstance(stdlib_level, int) else logging.NOTSET,
+        force=True,
+    )
+    # httpx logs every Bot API request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
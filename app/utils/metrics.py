@@ -0,0 +1,228 @@
+"""Lightweight stage latency metrics with Prometheus text exposition."""
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+from loguru import logger
+
+# Latency buckets in seconds, from parsing (sub-millisecond) to slow network calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """Initialize the histogram.
+
+        Args:
+            buckets: Sorted upper bounds of the buckets in seconds
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile from the buckets (upper bound of the bucket).
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value in seconds
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for idx, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[idx] if idx < len(self.buckets) else float("inf")
+        return float("inf")
+
+
+class _Timer:
+    """Context manager timing one stage into a registry."""
+
+    __slots__ = ("registry", "stage", "start")
+
+    def __init__(self, registry: "MetricsRegistry", stage: str):
+        self.registry = registry
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.registry.observe(self.stage, time.perf_counter() - self.start)
+        if exc_type is not None:
+            self.registry.increment("stage_errors_total", stage=self.stage)
+        return False
+
+
+class MetricsRegistry:
+    """In-process registry of stage histograms and labelled counters."""
+
+    def __init__(self, namespace: str = "parade"):
+        """Initialize the registry.
+
+        Args:
+            namespace: Prefix of every exported metric name
+        """
+        self.namespace = namespace
+        self.stages: Dict[str, Histogram] = {}
+        self.counters: Dict[str, Dict[LabelKey, int]] = {}
+        self.gauges: Dict[str, float] = {}
+
+    def timer(self, stage: str) -> _Timer:
+        """Time a pipeline stage.
+
+        Usage:
+            with metrics.timer("sheets_fetch"):
+                ...
+
+        Args:
+            stage: Stage name (e.g. "sheets_fetch", "render")
+
+        Returns:
+            Context manager recording the stage duration and errors
+        """
+        return _Timer(self, stage)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record a stage duration.
+
+        Args:
+            stage: Stage name
+            seconds: Duration in seconds
+        """
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = Histogram()
+        histogram.observe(seconds)
+
+    def increment(self, name: str, amount: int = 1, **labels: str) -> None:
+        """Increment a labelled counter.
+
+        Args:
+            name: Counter name (without namespace)
+            amount: Amount to add
+            **labels: Label values
+        """
+        series = self.counters.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        series[key] = series.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set a gauge to its current value.
+
+        Args:
+            name: Gauge name (without namespace)
+            value: Current value
+        """
+        self.gauges[name] = value
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        name = f"{self.namespace}_stage_duration_seconds"
+        lines.append(f"# HELP {name} Duration of pipeline stages.")
+        lines.append(f"# TYPE {name} histogram")
+        for stage, histogram in sorted(self.stages.items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+
+        for counter, series in sorted(self.counters.items()):
+            full_name = f"{self.namespace}_{counter}"
+            lines.append(f"# TYPE {full_name} counter")
+            for key, value in sorted(series.items()):
+                labels = ",".join(f'{label}="{label_value}"' for label, label_value in key)
+                lines.append(f"{full_name}{{{labels}}} {value}" if labels else f"{full_name} {value}")
+
+        for gauge, value in sorted(self.gauges.items()):
+            full_name = f"{self.namespace}_{gauge}"
+            lines.append(f"# TYPE {full_name} gauge")
+            lines.append(f"{full_name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """Summarize stage latencies for a chat message."""
+        if not self.stages:
+            return "No metrics recorded yet."
+        lines = ["Stage latency (count, avg, p50, p95):"]
+        for stage, histogram in sorted(self.stages.items()):
+            avg_ms = histogram.sum / histogram.count * 1000
+            lines.append(
+                f"{stage}: {histogram.count}, {avg_ms:.0f}ms, "
+                f"<={histogram.quantile(0.5) * 1000:.0f}ms, <={histogram.quantile(0.95) * 1000:.0f}ms"
+            )
+        errors = self.counters.get("stage_errors_total", {})
+        if errors:
+            lines.append("")
+            lines.append("Errors: " + ", ".join(f"{dict(key)['stage']}={value}" for key, value in sorted(errors.items())))
+        return "\n".join(lines)
+
+
+async def start_metrics_server(registry: "MetricsRegistry", host: str, port: int) -> asyncio.AbstractServer:
+    """Serve the registry on a local HTTP endpoint (GET /metrics).
+
+    Args:
+        registry: Registry to expose
+        host: Interface to bind
+        port: Port to bind
+
+    Returns:
+        The running asyncio server
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await reader.readline()
+            # Drain the request headers
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", registry.render_prometheus().encode("utf-8")
+            else:
+                status, body = "404 Not Found", b"not found\n"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.warning(f"Error serving metrics: {e}")
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    logger.info(f"Metrics endpoint listening on http://{host}:{port}/metrics")
+    return server
+
+
+# Global registry shared by all services
+metrics = MetricsRegistry()
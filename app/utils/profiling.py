@@ -0,0 +1,210 @@
+"""On-demand CPU and allocation profiling of the message generation path."""
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import signal
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import AsyncIterator, Callable, List, TypeVar
+
+from loguru import logger
+
+from app.config import settings
+
+T = TypeVar("T")
+
+# Set in the task being profiled (and tasks it starts), so only its blocking calls run inline
+_profiling: ContextVar[bool] = ContextVar("profiling", default=False)
+
+
+class StackSampler:
+    """Samples the main thread's stack on a CPU-time timer for flamegraphs.
+
+    Uses SIGPROF, so it only samples when started from the main thread on a
+    platform that has it; otherwise no stacks are collected.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        """Initialize the sampler.
+
+        Args:
+            interval: CPU seconds between samples
+        """
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.enabled = hasattr(signal, "SIGPROF") and threading.current_thread() is threading.main_thread()
+        self._previous_handler = None
+
+    def _sample(self, signum, frame) -> None:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        if stack:
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self) -> None:
+        if not self.enabled:
+            return
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+
+    def collapsed(self) -> str:
+        """Render samples in the collapsed-stack format used by flamegraph tools."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class Profiler:
+    """Profiles the next N runs of a code path when armed."""
+
+    def __init__(self, output_dir: str = None, sort_key: str = None):
+        """Initialize the profiler.
+
+        Args:
+            output_dir: Directory for the reports
+            sort_key: pstats sort key of the text report (e.g. "cumulative", "tottime")
+        """
+        self.output_dir = output_dir or settings.profile_dir
+        self.sort_key = sort_key or settings.profile_sort
+        self.remaining_runs = 0
+        # cProfile allows one active profiler per thread, so runs are profiled one at a time
+        self.running = False
+        self.last_reports: List[str] = []
+
+    @property
+    def armed(self) -> bool:
+        """Whether the next run will be profiled."""
+        return self.remaining_runs > 0
+
+    def arm(self, runs: int) -> None:
+        """Profile the next runs.
+
+        Args:
+            runs: Number of runs to profile
+        """
+        self.remaining_runs = max(0, runs)
+        logger.info(f"Profiling armed for {self.remaining_runs} run(s)")
+
+    def disarm(self) -> None:
+        """Stop profiling."""
+        self.remaining_runs = 0
+        logger.info("Profiling disarmed")
+
+    async def to_thread(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking call in a worker thread, keeping the event loop free.
+
+        cProfile and the stack sampler only see the event loop thread, so the
+        call runs inline when it is made by the run being profiled.
+
+        Args:
+            func: Blocking callable
+            *args: Positional arguments of the call
+            **kwargs: Keyword arguments of the call
+
+        Returns:
+            The result of the call
+        """
+        if _profiling.get():
+            return func(*args, **kwargs)
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    @asynccontextmanager
+    async def profile(self, label: str) -> AsyncIterator[None]:
+        """Profile the enclosed block if armed.
+
+        A run that starts while another is being profiled runs unprofiled.
+
+        Args:
+            label: Name of the profiled path, used in the report file names
+        """
+        if not self.armed or self.running:
+            yield
+            return
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Another profiler (e.g. a debugger or external cProfile) owns this thread
+            logger.warning(f"Could not profile {label}: {e}")
+            yield
+            return
+        # Checked before anything is set up, so a refusal leaves nothing to undo
+        profile.disable()
+
+        self.remaining_runs -= 1
+        self.running = True
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        sampler = StackSampler()
+
+        sampler.start()
+        start = time.perf_counter()
+        token = _profiling.set(True)
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            _profiling.reset(token)
+            self.running = False
+            elapsed = time.perf_counter() - start
+            sampler.stop()
+            after = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            try:
+                self._write_reports(label, elapsed, profile, sampler, before, after)
+            except Exception as e:
+                logger.warning(f"Could not write profile reports: {e}")
+
+    def _write_reports(
+        self,
+        label: str,
+        elapsed: float,
+        profile: cProfile.Profile,
+        sampler: StackSampler,
+        before: tracemalloc.Snapshot,
+        after: tracemalloc.Snapshot,
+    ) -> None:
+        """Write the text report, raw stats and collapsed stacks."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"{label}_{datetime.now():%Y%m%d_%H%M%S_%f}")
+
+        # Raw stats can be re-sorted later with `python -m pstats <file>`
+        profile.dump_stats(f"{base}.prof")
+
+        report = io.StringIO()
+        report.write(f"Profile of {label}: {elapsed * 1000:.1f} ms\n\n")
+        pstats.Stats(profile, stream=report).sort_stats(self.sort_key).print_stats(40)
+        report.write("\nTop allocations (tracemalloc, by line):\n")
+        for stat in after.compare_to(before, "lineno")[:25]:
+            report.write(f"{stat}\n")
+        with open(f"{base}.txt", "w", encoding="utf-8") as f:
+            f.write(report.getvalue())
+
+        with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+            f.write(sampler.collapsed())
+
+        self.last_reports = [f"{base}.txt", f"{base}.prof", f"{base}.collapsed"]
+        logger.info(f"Profile of {label} ({elapsed * 1000:.1f} ms) written to {base}.*")
+
+
+# Global profiler shared by the CLI and bot
+profiler = Profiler()
@@ -0,0 +1,187 @@
+"""Deadline budgets, circuit breakers and retry backoff for external calls."""
+import random
+import threading
+import time
+from typing import Optional
+
+from loguru import logger
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because its circuit breaker is open."""
+
+
+class Deadline:
+    """Time budget for a whole command, shared across its stages."""
+
+    def __init__(self, seconds: float):
+        """Initialize the deadline.
+
+        Args:
+            seconds: Total time budget in seconds
+        """
+        self.total = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed."""
+        return self.remaining() <= 0
+
+    def budget(self, share: float, cap: Optional[float] = None) -> float:
+        """Get the time budget of a stage.
+
+        Args:
+            share: Fraction of the total deadline given to the stage
+            cap: Optional upper bound in seconds
+
+        Returns:
+            Seconds the stage may take, bounded by the time remaining
+        """
+        seconds = min(self.total * share, self.remaining())
+        if cap is not None:
+            seconds = min(seconds, cap)
+        return seconds
+
+
+class CircuitBreaker:
+    """Circuit breaker for one external dependency.
+
+    Closed: calls go through. After ``failure_threshold`` consecutive failures
+    the breaker opens and calls are rejected without waiting. Once
+    ``reset_timeout`` seconds have passed, a single half-open probe is
+    allowed; its success closes the breaker, its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        """Initialize the circuit breaker.
+
+        Args:
+            name: Name of the dependency, used in logs and /status
+            failure_threshold: Consecutive failures before the breaker opens
+            reset_timeout: Seconds to stay open before allowing a probe
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        # Shared by the Sheets fetch worker threads
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Check whether a call may go through now.
+
+        Returns:
+            True if the call should be attempted
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if a call may not go through now."""
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"{self.name} circuit closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"{self.name} circuit opened after {self.failures} failure(s)")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def record_abandoned(self) -> None:
+        """Record a call that ended without an outcome (e.g. cancelled), so a half-open probe can be retried."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def describe(self) -> str:
+        """Describe the breaker state for /status."""
+        if self.state == self.OPEN:
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+            return f"{self.name}: {self.state} ({self.failures} failures, probe in {retry_in:.0f}s)"
+        return f"{self.name}: {self.state} ({self.failures} failures)"
+
+
+class Backoff:
+    """Jittered polling interval that backs off exponentially on failures.
+
+    A healthy poll waits ``interval`` seconds +/- ``jitter`` (a fraction of
+    it), so many instances started together drift apart. After ``n``
+    consecutive failures the wait is drawn uniformly from
+    [interval, min(interval * 2 ** n, max_interval)] ("full jitter" above the
+    base interval), so they do not retry in lockstep either.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        max_interval: float,
+        jitter: float = 0.2,
+        rng: Optional[random.Random] = None,
+    ):
+        """Initialize the backoff.
+
+        Args:
+            interval: Seconds between healthy polls
+            max_interval: Longest wait after repeated failures
+            jitter: Fraction of the interval added or removed at random
+            rng: Random source, defaults to a new unseeded one
+        """
+        self.interval = interval
+        self.max_interval = max(max_interval, interval)
+        self.jitter = jitter
+        self.failures = 0
+        self._rng = rng or random.Random()
+
+    def first_delay(self) -> float:
+        """Get the wait before the first poll: anywhere within one interval."""
+        return self._rng.uniform(0, self.interval)
+
+    def next_delay(self, failed: bool) -> float:
+        """Record the outcome of a poll and get the wait before the next one.
+
+        Args:
+            failed: Whether the poll failed
+
+        Returns:
+            Seconds to wait
+        """
+        if not failed:
+            self.failures = 0
+            return self.interval * self._rng.uniform(1 - self.jitter, 1 + self.jitter)
+        self.failures += 1
+        ceiling = min(self.interval * 2 ** min(self.failures, 32), self.max_interval)
+        return self._rng.uniform(self.interval, ceiling)
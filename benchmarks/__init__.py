@@ -0,0 +1 @@
+"""Benchmarks for the Parade State Bot."""
@@ -0,0 +1,102 @@
+"""Benchmark Pydantic staff models against the compact staff records.
+
+Measures construct+format throughput and memory per record.
+
+Usage:
+    python -m benchmarks.bench_records [--records 20000]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import date
+from typing import Callable, List
+
+from app.models.staff import (
+    LocationDetail,
+    LocationRecord,
+    StaffMember,
+    StaffRecord,
+    StaffStatus,
+    StatusRecord,
+    StatusType,
+)
+
+STATUS_CYCLE = [StatusType.PRESENT, StatusType.OL, StatusType.CSE, StatusType.MC, StatusType.OB]
+
+
+def build_models(count: int) -> List[StaffMember]:
+    """Construct (and validate) Pydantic staff members."""
+    members = []
+    for i in range(count):
+        status_type = STATUS_CYCLE[i % len(STATUS_CYCLE)]
+        members.append(
+            StaffMember(
+                id=i,
+                name="Tan Pau Siang",
+                rank="ME3",
+                status=StaffStatus(
+                    status_type=status_type,
+                    location=LocationDetail(location="PLAB") if status_type == StatusType.OB else None,
+                    end_date=date(2025, 5, 2) if status_type == StatusType.OL else None,
+                ),
+            )
+        )
+    return members
+
+
+def build_records(count: int) -> List[StaffRecord]:
+    """Construct compact staff records."""
+    location = LocationRecord(location="PLAB")
+    records = []
+    for i in range(count):
+        status_type = STATUS_CYCLE[i % len(STATUS_CYCLE)]
+        records.append(
+            StaffRecord(
+                id=i,
+                name="Tan Pau Siang",
+                rank="ME3",
+                status=StatusRecord(
+                    status_type=status_type,
+                    location=location if status_type == StatusType.OB else None,
+                    end_date=date(2025, 5, 2) if status_type == StatusType.OL else None,
+                ),
+            )
+        )
+    return records
+
+
+def measure(label: str, builder: Callable[[int], list], count: int) -> None:
+    """Print throughput and memory per record for one builder."""
+    gc.collect()
+    start = time.perf_counter()
+    items = builder(count)
+    for item in items:
+        item.get_parade_state_entry()
+    elapsed = time.perf_counter() - start
+    del items
+
+    gc.collect()
+    tracemalloc.start()
+    items = builder(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+
+    print(
+        f"{label:<10} {count / elapsed:>12,.0f} records/s "
+        f"{current / count:>8,.0f} bytes/record"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Staff record benchmark")
+    parser.add_argument("--records", type=int, default=20000, help="Number of records to build")
+    args = parser.parse_args()
+
+    measure("pydantic", build_models, args.records)
+    measure("records", build_records, args.records)
+
+
+if __name__ == "__main__":
+    main()
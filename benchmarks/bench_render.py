@@ -0,0 +1,99 @@
+"""Benchmark rendering parade states in every output format.
+
+A parade state is rendered several times over its life (draft, archive,
+send, mark as sent). Compares formatting each format straight from the
+staff records on every pass with building the report once and rendering
+from it, without and with the render cache.
+
+Usage:
+    python -m benchmarks.bench_render [--days 250] [--passes 3]
+"""
+import argparse
+import time
+from datetime import date
+from typing import Callable, Dict, List
+
+from app.config import settings
+from app.models.parade_state import ParadeState
+from app.models.report import CSV, HTML, MARKDOWN_V2, PLAIN, RENDERERS, ParadeReport, escape_html, escape_markdown_v2
+from app.models.staff import StaffRoster
+from app.services.google_sheets import GoogleSheetsService
+from app.services.report_renderer import ReportRenderer
+from benchmarks.stubs import StaticSheetsClient
+from benchmarks.synthetic_sheet import generate_values, weekdays
+
+FORMATS = (PLAIN, MARKDOWN_V2, HTML, CSV)
+
+
+def build_rosters(days: int) -> Dict[date, StaffRoster]:
+    """Parse the rosters of the first weekdays of a synthetic sheet."""
+    settings.google_sheet_range = "Sheet1"
+    settings.active_staff_file = ""
+    years = days // 250 + 1
+    service = GoogleSheetsService(active_staff=None, service=StaticSheetsClient(generate_values(years)))
+    return service.get_staff_lists(weekdays(date(2025, 1, 6), years)[:days])
+
+
+def render_direct(parade_state: ParadeState) -> List[str]:
+    """Render every format from the staff records, escaping line by line."""
+    texts = []
+    for escape in (str, escape_markdown_v2, escape_html):
+        lines = [
+            escape(f"Parade State for {parade_state.report_date.strftime('%d/%m/%Y')}"),
+            escape(parade_state.report_date.strftime("%A")),
+            "",
+            "",
+        ]
+        lines.extend(
+            escape(f"{i}. {record.get_parade_state_entry()}") for i, record in enumerate(parade_state.staff_list, 1)
+        )
+        lines.append("")
+        lines.append(escape(f"Today's number: {parade_state.am_count}(AM), {parade_state.pm_count}(PM)"))
+        texts.append("\n".join(lines))
+    texts.append(
+        "\n".join(
+            f"{parade_state.report_date},{record.display or record},{record.status.format_status()}"
+            for record in parade_state.staff_list
+        )
+    )
+    return texts
+
+
+def render_report(report: ParadeReport) -> List[str]:
+    """Render every format from a report."""
+    return [RENDERERS[fmt](report) for fmt in FORMATS]
+
+
+def measure(
+    label: str, render: Callable[[ParadeState], List[str]], rosters: Dict[date, StaffRoster], passes: int
+) -> None:
+    """Print rendered messages per second, for parade states built before timing."""
+    parade_states = [ParadeState(report_date=day, staff_list=roster) for day, roster in rosters.items()]
+    start = time.perf_counter()
+    for _ in range(passes):
+        for parade_state in parade_states:
+            render(parade_state)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {len(parade_states) * len(FORMATS) * passes / elapsed:>12,.0f} messages/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parade state render benchmark")
+    parser.add_argument("--days", type=int, default=250, help="Number of parade states to render")
+    parser.add_argument("--passes", type=int, default=3, help="Times each parade state is rendered")
+    args = parser.parse_args()
+
+    rosters = build_rosters(args.days)
+    renderer = ReportRenderer(max_entries=len(rosters) * len(FORMATS))
+
+    def render_cached(parade_state: ParadeState) -> List[str]:
+        report = parade_state.to_report()
+        return [renderer.render(report, fmt) for fmt in FORMATS]
+
+    measure("direct", render_direct, rosters, args.passes)
+    measure("report", lambda parade_state: render_report(parade_state.to_report()), rosters, args.passes)
+    measure("cached", render_cached, rosters, args.passes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+"""Local stand-ins for the Google Sheets API and the Telegram Bot API.
+
+One asyncio HTTP server emulates:
+    GET  /v4/spreadsheets/{id}                      (tab metadata)
+    GET  /v4/spreadsheets/{id}/values/{range}
+    GET  /v4/spreadsheets/{id}/values:batchGet?ranges=...
+    POST /bot{token}/{method}                       (getMe, getUpdates, sendMessage, ...)
+
+Latency, error rate and 429 rate are injectable per API, so caching,
+breakers and concurrency can be exercised offline. Like the Bot API,
+getUpdates answers 409 Conflict while a webhook is set. Point the bot at it with:
+
+    GOOGLE_SHEETS_API_ENDPOINT=http://127.0.0.1:8089
+    TELEGRAM_API_BASE_URL=http://127.0.0.1:8089/bot
+
+Usage:
+    python -m benchmarks.fake_servers --port 8089 --years 1 \\
+        --sheets-latency lognormal:0.3,0.5 --sheets-error-rate 0.02 --telegram-429-rate 0.05
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from benchmarks.synthetic_sheet import generate_values
+
+
+@dataclass
+class LatencyDistribution:
+    """Random response delay.
+
+    Specs: ``fixed:S``, ``uniform:LOW,HIGH``, ``exp:MEAN`` or
+    ``lognormal:MEDIAN,SIGMA`` (all in seconds).
+    """
+
+    kind: str = "fixed"
+    params: Tuple[float, ...] = (0.0,)
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        kind, _, raw = spec.partition(":")
+        params = tuple(float(value) for value in raw.split(",")) if raw else (0.0,)
+        if kind not in ("fixed", "uniform", "exp", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+        return cls(kind, params)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.params[0], self.params[1])
+        if self.kind == "exp":
+            return rng.expovariate(1 / self.params[0]) if self.params[0] > 0 else 0.0
+        if self.kind == "lognormal":
+            median, sigma = self.params[0], self.params[1] if len(self.params) > 1 else 0.5
+            return median * rng.lognormvariate(0, sigma)
+        return self.params[0]
+
+
+@dataclass
+class FaultProfile:
+    """Injected behaviour of one emulated API."""
+
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: int = 1
+
+
+def a1_to_index(cell: str) -> Tuple[int, Optional[int]]:
+    """Convert an A1 cell reference to (column, row) 0-based indices."""
+    match = re.fullmatch(r"([A-Za-z]+)(\d*)", cell)
+    if not match:
+        raise ValueError(f"Invalid cell reference: {cell}")
+    column = 0
+    for char in match.group(1).upper():
+        column = column * 26 + (ord(char) - ord("A") + 1)
+    row = int(match.group(2)) - 1 if match.group(2) else None
+    return column - 1, row
+
+
+class FakeApiServer:
+    """Emulates the Sheets values API and the Bot API methods the bot uses."""
+
+    def __init__(
+        self,
+        tabs: Dict[str, List[List[str]]],
+        sheets_profile: FaultProfile = None,
+        telegram_profile: FaultProfile = None,
+        seed: int = 0,
+    ):
+        """Initialize the server.
+
+        Args:
+            tabs: Sheet tab title -> value grid
+            sheets_profile: Injected behaviour of the Sheets API
+            telegram_profile: Injected behaviour of the Bot API
+            seed: Random seed for latency and fault injection
+        """
+        self.tabs = tabs
+        self.sheets_profile = sheets_profile or FaultProfile()
+        self.telegram_profile = telegram_profile or FaultProfile()
+        self.rng = random.Random(seed)
+        self.updates: List[Dict[str, Any]] = []
+        self.sent_messages: List[Dict[str, Any]] = []
+        # Set by setWebhook; getUpdates is refused while it is
+        self.webhook_url = ""
+        self.requests: Counter = Counter()
+        self._next_message_id = 1
+        self._next_update_id = 1
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: set = set()
+
+    # ----------------------------------------------------------------- lifecycle
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start listening and return the bound port."""
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Keep-alive clients would otherwise hold wait_closed() open
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+
+    # --------------------------------------------------------------------- HTTP
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                body = b""
+                if headers.get("content-length"):
+                    body = await reader.readexactly(int(headers["content-length"]))
+
+                status, payload, extra_headers = await self._dispatch(method, target, headers, body)
+                data = json.dumps(payload).encode("utf-8")
+                head = [f"HTTP/1.1 {status}", "Content-Type: application/json", f"Content-Length: {len(data)}"]
+                head.extend(f"{name}: {value}" for name, value in extra_headers.items())
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+                await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _inject(self, profile: FaultProfile, api: str) -> Optional[Tuple[str, Any, Dict[str, str]]]:
+        """Apply latency and maybe return an injected error response."""
+        delay = profile.latency.sample(self.rng)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        roll = self.rng.random()
+        if roll < profile.rate_limit_rate:
+            self.requests[f"{api}:429"] += 1
+            if api == "telegram":
+                return "429 Too Many Requests", {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": f"Too Many Requests: retry after {profile.retry_after}",
+                    "parameters": {"retry_after": profile.retry_after},
+                }, {"Retry-After": str(profile.retry_after)}
+            return "429 Too Many Requests", {
+                "error": {"code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}
+            }, {"Retry-After": str(profile.retry_after)}
+
+        if roll < profile.rate_limit_rate + profile.error_rate:
+            self.requests[f"{api}:500"] += 1
+            if api == "telegram":
+                return "500 Internal Server Error", {
+                    "ok": False, "error_code": 500, "description": "Internal Server Error"
+                }, {}
+            return "500 Internal Server Error", {
+                "error": {"code": 500, "message": "Internal error", "status": "INTERNAL"}
+            }, {}
+        return None
+
+    async def _dispatch(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        url = urlsplit(target)
+        path = unquote(url.path)
+        query = parse_qs(url.query)
+
+        if path == "/_stats":
+            return "200 OK", dict(self.requests), {}
+
+        if path.startswith("/v4/spreadsheets/"):
+            injected = await self._inject(self.sheets_profile, "sheets")
+            if injected:
+                return injected
+            return self._handle_sheets(path, query)
+
+        match = re.fullmatch(r"/bot([^/]+)/(\w+)", path)
+        if match:
+            injected = await self._inject(self.telegram_profile, "telegram")
+            if injected:
+                return injected
+            return self._handle_telegram(match.group(2), self._parse_params(headers, body, query))
+
+        return "404 Not Found", {"error": "not found"}, {}
+
+    # ------------------------------------------------------------------- Sheets
+
+    def _read_range(self, a1_range: str) -> Dict[str, Any]:
+        """Read an A1 range (``Tab!A1:Z100`` or ``Tab``) from the tabs."""
+        title, _, cells = a1_range.rpartition("!")
+        if not title:
+            title, cells = (cells, "") if cells in self.tabs else (next(iter(self.tabs)), cells)
+        title = title.strip("'")
+        grid = self.tabs[title]
+
+        first_col, first_row, last_col, last_row = 0, 0, None, None
+        if cells:
+            start, _, end = cells.partition(":")
+            first_col, first_row = a1_to_index(start)
+            first_row = first_row or 0
+            if end:
+                last_col, last_row = a1_to_index(end)
+
+        rows = grid[first_row:None if last_row is None else last_row + 1]
+        values = [row[first_col:None if last_col is None else last_col + 1] for row in rows]
+        while values and not values[-1]:
+            values.pop()
+        return {"range": a1_range, "majorDimension": "ROWS", "values": values}
+
+    def _handle_sheets(self, path: str, query: Dict[str, List[str]]):
+        match = re.fullmatch(r"/v4/spreadsheets/([^/]+)/values:batchGet", path)
+        if match:
+            self.requests["sheets:batchGet"] += 1
+            ranges = query.get("ranges", [])
+            return "200 OK", {
+                "spreadsheetId": match.group(1),
+                "valueRanges": [self._read_range(a1_range) for a1_range in ranges],
+            }, {}
+
+        match = re.fullmatch(r"/v4/spreadsheets/([^/]+)/values/(.+)", path)
+        if match:
+            self.requests["sheets:get"] += 1
+            return "200 OK", self._read_range(match.group(2)), {}
+
+        match = re.fullmatch(r"/v4/spreadsheets/([^/]+)", path)
+        if match:
+            self.requests["sheets:metadata"] += 1
+            return "200 OK", {
+                "spreadsheetId": match.group(1),
+                "sheets": [
+                    {
+                        "properties": {
+                            "sheetId": index,
+                            "title": title,
+                            "index": index,
+                            "gridProperties": {
+                                "rowCount": len(grid),
+                                "columnCount": max((len(row) for row in grid), default=0),
+                            },
+                        }
+                    }
+                    for index, (title, grid) in enumerate(self.tabs.items())
+                ],
+            }, {}
+
+        return "404 Not Found", {"error": {"code": 404, "message": "Not found"}}, {}
+
+    # ----------------------------------------------------------------- Telegram
+
+    @staticmethod
+    def _parse_params(headers: Dict[str, str], body: bytes, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Decode Bot API parameters (JSON body or form fields with JSON values)."""
+        if headers.get("content-type", "").startswith("application/json") and body:
+            return json.loads(body)
+        fields = parse_qs(body.decode("utf-8"), keep_blank_values=True) if body else query
+        params = {}
+        for name, values in fields.items():
+            try:
+                params[name] = json.loads(values[0])
+            except ValueError:
+                params[name] = values[0]
+        return params
+
+    def _message(self, chat_id: Any, text: str, from_bot: bool = True) -> Dict[str, Any]:
+        message = {
+            "message_id": self._next_message_id,
+            "date": int(time.time()),
+            "chat": {"id": int(chat_id) if str(chat_id).lstrip("-").isdigit() else 0, "type": "group"},
+            "text": text,
+        }
+        if from_bot:
+            message["from"] = {"id": 1, "is_bot": True, "first_name": "Parade State Bot"}
+        self._next_message_id += 1
+        return message
+
+    def add_update(self, chat_id: int, text: str, user_id: int = 1000) -> Dict[str, Any]:
+        """Queue an incoming chat message as an update (e.g. a /DI LIST post)."""
+        message = self._message(chat_id, text, from_bot=False)
+        message["from"] = {"id": user_id, "is_bot": False, "first_name": f"User {user_id}"}
+        update = {"update_id": self._next_update_id, "message": message}
+        self._next_update_id += 1
+        self.updates.append(update)
+        return update
+
+    def _handle_telegram(self, method: str, params: Dict[str, Any]):
+        self.requests[f"telegram:{method}"] += 1
+
+        if method == "getMe":
+            result: Any = {"id": 1, "is_bot": True, "first_name": "Parade State Bot", "username": "parade_state_bot"}
+        elif method == "getUpdates":
+            if self.webhook_url:
+                return "409 Conflict", {
+                    "ok": False,
+                    "error_code": 409,
+                    "description": "Conflict: can't use getUpdates method while webhook is active; "
+                    "use deleteWebhook to delete the webhook first",
+                }, {}
+            offset = int(params.get("offset", 0) or 0)
+            limit = int(params.get("limit", 100) or 100)
+            if offset < 0:
+                result = self.updates[offset:]
+            else:
+                result = [update for update in self.updates if update["update_id"] >= offset][:limit]
+        elif method == "sendMessage":
+            result = self._message(params.get("chat_id"), params.get("text", ""))
+            self.sent_messages.append(result)
+        elif method == "editMessageText":
+            result = self._message(params.get("chat_id"), params.get("text", ""))
+            result["message_id"] = int(params.get("message_id", 0))
+            self.sent_messages.append(result)
+        elif method == "setWebhook":
+            self.webhook_url = params.get("url", "")
+            result = True
+        elif method == "deleteWebhook":
+            self.webhook_url = ""
+            result = True
+        elif method in ("sendChatAction", "setMyCommands"):
+            result = True
+        elif method == "getWebhookInfo":
+            result = {"url": self.webhook_url, "has_custom_certificate": False, "pending_update_count": 0}
+        else:
+            return "404 Not Found", {"ok": False, "error_code": 404, "description": "Not Found: method not found"}, {}
+
+        return "200 OK", {"ok": True, "result": result}, {}
+
+
+def build_profile(latency: str, error_rate: float, rate_limit_rate: float, retry_after: int) -> FaultProfile:
+    return FaultProfile(
+        latency=LatencyDistribution.parse(latency),
+        error_rate=error_rate,
+        rate_limit_rate=rate_limit_rate,
+        retry_after=retry_after,
+    )
+
+
+async def serve(args: argparse.Namespace) -> None:
+    tab_title = args.tab
+    server = FakeApiServer(
+        tabs={tab_title: generate_values(years=args.years, start=date.fromisoformat(args.start))},
+        sheets_profile=build_profile(args.sheets_latency, args.sheets_error_rate, args.sheets_429_rate, args.retry_after),
+        telegram_profile=build_profile(
+            args.telegram_latency, args.telegram_error_rate, args.telegram_429_rate, args.retry_after
+        ),
+        seed=args.seed,
+    )
+    server.add_update(int(args.chat_id), args.di_list)
+    port = await server.start(args.host, args.port)
+    print(f"Fake Sheets/Bot API listening on http://{args.host}:{port}")
+    print(f"  GOOGLE_SHEETS_API_ENDPOINT=http://{args.host}:{port}")
+    print(f"  TELEGRAM_API_BASE_URL=http://{args.host}:{port}/bot")
+    await asyncio.Event().wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Google Sheets and Telegram Bot API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--tab", default="Sheet1", help="Tab title of the synthetic sheet")
+    parser.add_argument("--years", type=int, default=1, help="Years of dates in the synthetic sheet")
+    parser.add_argument("--start", default="2025-01-06", help="First date of the synthetic sheet")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chat-id", default="-1000")
+    parser.add_argument("--di-list", default="/DI LIST\n06/01/2025: ME3 Edmund Cheong\n07/01/2025: ME4 Kaleb Nim")
+    parser.add_argument("--sheets-latency", default="fixed:0", help="e.g. lognormal:0.3,0.5")
+    parser.add_argument("--sheets-error-rate", type=float, default=0.0)
+    parser.add_argument("--sheets-429-rate", type=float, default=0.0)
+    parser.add_argument("--telegram-latency", default="fixed:0", help="e.g. uniform:0.05,0.2")
+    parser.add_argument("--telegram-error-rate", type=float, default=0.0)
+    parser.add_argument("--telegram-429-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1, help="Seconds advertised in 429 responses")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""Concurrent-chat load generator for BotHandler.
+
+Simulates many chats sending /draft, /send and /help to a real BotHandler
+wired to the local fake Sheets/Bot API server (run on its own thread), and
+reports throughput, p50/p95/p99 latency per command and event-loop lag for
+each concurrency level. Updates go through the bot's update processor, so
+commands rejected by admission control are counted as busy, not timed.
+
+Usage:
+    python -m benchmarks.load_generator --concurrency 10 50 200 --duration 20 \\
+        --sheets-latency lognormal:0.3,0.5 --telegram-latency uniform:0.02,0.1
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from telegram import Update
+
+from app.config import settings
+from app.utils.date_helpers import get_local_date
+from benchmarks.fake_servers import FakeApiServer, build_profile
+from benchmarks.synthetic_sheet import generate_values
+
+COMMAND_MIX = {"draft": 0.6, "send": 0.1, "help": 0.3}
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+
+class FakeServerThread:
+    """Runs the fake API server on its own event loop thread."""
+
+    def __init__(self, server: FakeApiServer):
+        self.server = server
+        self.loop = asyncio.new_event_loop()
+        self.port = 0
+        self._thread = threading.Thread(target=self.loop.run_forever, name="fake-api", daemon=True)
+
+    def start(self) -> int:
+        self._thread.start()
+        self.port = asyncio.run_coroutine_threadsafe(self.server.start(), self.loop).result()
+        return self.port
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up a periodic timer."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class LoadGenerator:
+    """Sends simulated chat commands into a BotHandler."""
+
+    def __init__(self, bot_handler, chats: int, seed: int = 0, retry_after: float = 1.0):
+        """Initialize the generator.
+
+        Args:
+            bot_handler: Initialized BotHandler to drive
+            chats: Number of distinct simulated chats
+            seed: Random seed of the command mix
+            retry_after: Seconds a chat waits after a busy reply before its next command
+        """
+        self.bot_handler = bot_handler
+        self.chats = chats
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self._update_id = 0
+
+    def make_update(self, chat_id: int, text: str) -> Update:
+        """Build a group message update, tagged as a command if it is a bare /command."""
+        self._update_id += 1
+        message = {
+            "message_id": self._update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "group"},
+            "from": {"id": 10_000 + chat_id, "is_bot": False, "first_name": f"User {chat_id}"},
+            "text": text,
+        }
+        if text.startswith("/") and " " not in text:
+            message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text)}]
+        return Update.de_json({"update_id": self._update_id, "message": message}, self.bot_handler.application.bot)
+
+    async def dispatch(self, update: Update) -> bool:
+        """Feed an update through the bot's update processor, as the updater or webhook would.
+
+        Returns:
+            False if admission control rejected the update
+        """
+        handled = False
+
+        async def process() -> None:
+            nonlocal handled
+            handled = True
+            await self.bot_handler.application.process_update(update)
+
+        await self.bot_handler.update_processor.process_update(update, process())
+        return handled
+
+    async def _chat(
+        self,
+        chat_id: int,
+        until: float,
+        latencies: Dict[str, List[float]],
+        errors: Dict[str, int],
+        rejected: Dict[str, int],
+    ) -> None:
+        commands, weights = list(COMMAND_MIX), list(COMMAND_MIX.values())
+        while time.perf_counter() < until:
+            command = self.rng.choices(commands, weights=weights)[0]
+            update = self.make_update(chat_id, f"/{command}")
+            start = time.perf_counter()
+            try:
+                if await self.dispatch(update):
+                    latencies[command].append(time.perf_counter() - start)
+                else:
+                    rejected[command] += 1
+                    await asyncio.sleep(self.retry_after)
+            except Exception:
+                errors[command] += 1
+
+    async def run(self, concurrency: int, duration: float) -> Dict[str, object]:
+        """Run one load level.
+
+        Args:
+            concurrency: Number of chats sending commands at the same time
+            duration: Seconds to run
+
+        Returns:
+            Throughput, latency percentiles and loop lag for the level
+        """
+        latencies: Dict[str, List[float]] = defaultdict(list)
+        errors: Dict[str, int] = defaultdict(int)
+        rejected: Dict[str, int] = defaultdict(int)
+        monitor = LoopLagMonitor()
+        monitor.start()
+
+        start = time.perf_counter()
+        until = start + duration
+        chat_ids = [-(1000 + (i % self.chats)) for i in range(concurrency)]
+        await asyncio.gather(*(self._chat(chat_id, until, latencies, errors, rejected) for chat_id in chat_ids))
+        elapsed = time.perf_counter() - start
+        await monitor.stop()
+
+        total = sum(len(samples) for samples in latencies.values())
+        commands = {}
+        for command in sorted({*latencies, *errors, *rejected}):
+            samples = latencies[command]
+            commands[command] = {
+                "count": len(samples),
+                "errors": errors[command],
+                "rejected": rejected[command],
+                "p50_ms": percentile(samples, 0.50) * 1000,
+                "p95_ms": percentile(samples, 0.95) * 1000,
+                "p99_ms": percentile(samples, 0.99) * 1000,
+                "mean_ms": statistics.mean(samples) * 1000 if samples else 0.0,
+            }
+        return {
+            "concurrency": concurrency,
+            "elapsed_s": elapsed,
+            "throughput_rps": total / elapsed if elapsed else 0.0,
+            "commands": commands,
+            "loop_lag": {
+                "p50_ms": percentile(monitor.lags, 0.50) * 1000,
+                "p99_ms": percentile(monitor.lags, 0.99) * 1000,
+                "max_ms": max(monitor.lags, default=0.0) * 1000,
+            },
+        }
+
+
+def print_level(result: Dict[str, object]) -> None:
+    lag = result["loop_lag"]
+    print(
+        f"\nconcurrency={result['concurrency']}: {result['throughput_rps']:.1f} cmd/s, "
+        f"loop lag p50={lag['p50_ms']:.1f}ms p99={lag['p99_ms']:.1f}ms max={lag['max_ms']:.1f}ms"
+    )
+    for command, stats in result["commands"].items():
+        print(
+            f"  /{command:<6} n={stats['count']:<6} err={stats['errors']:<4} busy={stats['rejected']:<5} "
+            f"p50={stats['p50_ms']:>8.1f}ms p95={stats['p95_ms']:>8.1f}ms p99={stats['p99_ms']:>8.1f}ms"
+        )
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, object]]:
+    # Commands are for today, so the sheet starts on this week's Monday
+    today = get_local_date()
+    monday = today - timedelta(days=today.weekday())
+    server = FakeApiServer(
+        tabs={"Sheet1": generate_values(years=args.years, start=monday)},
+        sheets_profile=build_profile(args.sheets_latency, args.sheets_error_rate, args.sheets_429_rate, 1),
+        telegram_profile=build_profile(args.telegram_latency, args.telegram_error_rate, args.telegram_429_rate, 1),
+        seed=args.seed,
+    )
+    server_thread = FakeServerThread(server)
+    port = server_thread.start()
+
+    # Wire the bot to the fake server and keep its files out of the working tree
+    workdir = tempfile.mkdtemp(prefix="parade-load-")
+    settings.google_sheets_api_endpoint = f"http://127.0.0.1:{port}"
+    settings.telegram_api_base_url = f"http://127.0.0.1:{port}/bot"
+    settings.telegram_bot_token = settings.telegram_bot_token or "0:loadtest"
+    settings.telegram_chat_id = "-999"
+    settings.google_sheet_id = settings.google_sheet_id or "loadtest"
+    settings.sheet_snapshot_path = os.path.join(workdir, "sheet_snapshot.bin")
+    settings.di_list_path = os.path.join(workdir, "di_list.txt")
+    settings.attendance_archive_path = ""
+    settings.parade_history_path = ""
+    settings.active_staff_file = ""
+    settings.metrics_port = 0
+
+    from app.services.bot_handler import BotHandler
+
+    bot_handler = BotHandler()
+    await bot_handler.application.initialize()
+    generator = LoadGenerator(bot_handler, chats=args.chats, seed=args.seed, retry_after=args.retry_after)
+    # The bot reads the DI list from the messages it receives
+    await generator.dispatch(generator.make_update(-1000, f"/DI LIST\n{today:%d/%m/%Y}: ME3 Edmund Cheong"))
+
+    results = []
+    try:
+        for concurrency in args.concurrency:
+            result = await generator.run(concurrency, args.duration)
+            print_level(result)
+            results.append(result)
+    finally:
+        await bot_handler.application.shutdown()
+        server_thread.stop()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent-chat load generator")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument("--chats", type=int, default=500, help="Distinct simulated chats")
+    parser.add_argument("--years", type=int, default=1, help="Years of dates in the synthetic sheet")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Seconds a chat waits after a busy reply")
+    parser.add_argument("--sheets-latency", default="lognormal:0.3,0.5")
+    parser.add_argument("--sheets-error-rate", type=float, default=0.0)
+    parser.add_argument("--sheets-429-rate", type=float, default=0.0)
+    parser.add_argument("--telegram-latency", default="uniform:0.02,0.1")
+    parser.add_argument("--telegram-error-rate", type=float, default=0.0)
+    parser.add_argument("--telegram-429-rate", type=float, default=0.0)
+    parser.add_argument("--output", type=str, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
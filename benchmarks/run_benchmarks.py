@@ -0,0 +1,171 @@
+"""Benchmark suite over synthetic multi-year sheets.
+
+Measures find_date_columns, _extract_staff_data, _parse_status_string,
+ParadeState.format_message and end-to-end generate_message (stubbed I/O)
+separately, and stores the results as JSON for comparison across commits.
+
+Usage:
+    python -m benchmarks.run_benchmarks [--years 1 3 5] [--output results.json]
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/<old>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, Optional
+
+from app.config import settings
+
+# Keep benchmark runs from touching the real snapshot file; list every synthetic staff row
+settings.sheet_snapshot_path = os.path.join(tempfile.mkdtemp(prefix="parade-bench-"), "sheet_snapshot.bin")
+settings.active_staff_file = ""
+
+from app.models.parade_state import ParadeState
+from app.services.google_sheets import GoogleSheetsService
+from app.services.message_builder import MessageBuilderService
+from app.services.telegram_service import TelegramService
+from benchmarks.stubs import StaticSheetsClient, StubBot
+from benchmarks.synthetic_sheet import generate_values, sample_status_strings, weekdays
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+START_DATE = date(2025, 1, 6)
+
+
+def measure(func: Callable[[], object], min_time: float = 0.5, repeat: int = 5) -> Dict[str, float]:
+    """Time a callable.
+
+    Args:
+        func: Callable to time
+        min_time: Minimum seconds per repeat, used to pick the loop count
+        repeat: Number of timed repeats
+
+    Returns:
+        Per-call timings in microseconds and the loop count
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeat or loops >= 1_000_000:
+            break
+        loops *= 2
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops * 1e6)
+
+    return {
+        "min_us": min(samples),
+        "median_us": statistics.median(samples),
+        "mean_us": statistics.mean(samples),
+        "loops": loops,
+    }
+
+
+def run_suite(years: int, min_time: float) -> Dict[str, Dict[str, float]]:
+    """Run every benchmark against a sheet spanning a number of years."""
+    values = generate_values(years=years, start=START_DATE)
+    days = weekdays(START_DATE, years)
+    target_date = days[len(days) // 2]
+
+    sheets = GoogleSheetsService(service=StaticSheetsClient(values))
+    telegram = TelegramService(token="0:benchmark", chat_id="0", bot=StubBot())
+    builder = MessageBuilderService(google_sheets_service=sheets, telegram_service=telegram)
+
+    df = sheets.get_sheet_data()
+    sheets.am_col_idx, sheets.pm_col_idx = sheets.find_date_columns(df, target_date)
+    statuses = sample_status_strings(values)
+    roster = sheets._extract_staff_data(df, target_date)
+    parade_state = ParadeState(report_date=target_date, staff_list=roster)
+
+    def extract_cold():
+        sheets._history_cache.clear()
+        sheets._date_header_key = None
+        sheets._extract_staff_data(df, target_date)
+
+    def parse_statuses():
+        for status in statuses:
+            sheets._parse_status_string(status)
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = {
+            "find_date_columns": measure(lambda: sheets.find_date_columns(df, target_date), min_time),
+            "_extract_staff_data": measure(lambda: sheets._extract_staff_data(df, target_date), min_time),
+            "_extract_staff_data_cold": measure(extract_cold, min_time),
+            f"_parse_status_string_x{len(statuses)}": measure(parse_statuses, min_time),
+            "ParadeState.format_message": measure(parade_state.format_message, min_time),
+            "generate_message": measure(
+                lambda: loop.run_until_complete(builder.generate_message(target_date)), min_time
+            ),
+        }
+    finally:
+        loop.close()
+
+    cells = sum(len(row) for row in values)
+    print(f"\n{years} year(s): {len(days)} days, {len(values)} rows, {cells} cells")
+    for name, result in results.items():
+        print(f"  {name:<36} {result['median_us']:>12,.1f} us")
+    return results
+
+
+def git_revision() -> Optional[str]:
+    """Get the current commit hash, if available."""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+def compare(current: dict, baseline_path: str) -> None:
+    """Print median ratios against a stored result file."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline.get('revision')} (ratio > 1 means slower now):")
+    for years, results in current["results"].items():
+        old_results = baseline["results"].get(years, {})
+        for name, result in results.items():
+            if name in old_results:
+                ratio = result["median_us"] / old_results[name]["median_us"]
+                print(f"  {years}y {name:<36} {ratio:>6.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parade State Bot benchmarks")
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 3, 5], help="Sheet sizes in years")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds spent per benchmark")
+    parser.add_argument("--output", type=str, help="Result file (default: benchmarks/results/<revision>.json)")
+    parser.add_argument("--compare", type=str, help="Earlier result file to compare against")
+    args = parser.parse_args()
+
+    revision = git_revision()
+    current = {
+        "revision": revision,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "results": {str(years): run_suite(years, args.min_time) for years in args.years},
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{revision or 'local'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(current, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""In-process stand-ins for the Sheets API client and Telegram Bot."""
+from typing import Any, Dict, List
+
+
+class _Request:
+    def __init__(self, values: List[List[str]]):
+        self._values = values
+
+    def execute(self) -> Dict[str, Any]:
+        return {"values": self._values}
+
+
+class StaticSheetsClient:
+    """Mimics ``service.spreadsheets().values().get(...).execute()`` over a fixed grid."""
+
+    def __init__(self, values: List[List[str]]):
+        self.values_grid = values
+
+    def spreadsheets(self) -> "StaticSheetsClient":
+        return self
+
+    def values(self) -> "StaticSheetsClient":
+        return self
+
+    def get(self, spreadsheetId: str = None, range: str = None) -> _Request:
+        return _Request(self.values_grid)
+
+
+class StubBot:
+    """Bot with no chat history that accepts every message."""
+
+    def __init__(self):
+        self.sent: List[str] = []
+
+    async def get_updates(self, **kwargs) -> list:
+        return []
+
+    async def send_message(self, chat_id: str = None, text: str = "", **kwargs) -> None:
+        self.sent.append(text)
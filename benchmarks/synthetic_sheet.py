@@ -0,0 +1,129 @@
+"""Synthetic attendance sheets shaped like the production Google Sheet.
+
+Layout (see ai_docs/logic_google_sheets.md):
+    row 1: day names, row 2: dates (merged over AM/PM), row 3: AM/PM,
+    row 4: "Name", rows 6-40: one staff member per row with two columns per
+    weekday. Column A holds the names.
+"""
+import random
+from datetime import date, timedelta
+from typing import List
+
+NAMES = [
+    "Sch Comd", "Tan Pau Siang", "Pang Kee Hwee", "Chua Seong Bee", "OC MECH",
+    "Andrew Kwek", "Tay Chin Choon", "Kok Wai Chung", "Edwin Tan", "Jeffrey Kor",
+    "Or Ling Wan", "Michael Ng", "Marcus Soh", "Tan Toh Choon", "Ng Boon Hwee",
+    "Leonard Tan", "Brandon Lim", "Gin Tay", "Wilfred Hu", "Edmund Cheong",
+    "Jonathan Koe", "Benson Ong", "Edmund Yeo", "Tan Thian Kiong", "Tan Kok Kuan",
+    "Derrick Tan", "Tay Bijun", "Magendran S/O Raju", "Tan Eng Chuan", "Ignatios Quek",
+    "Edwin Ngow", "Benjamin Yeo", "Chen Yiming", "Sherwyn Sim", "Kaleb Nim",
+]
+RANKS = ["ME3", "ME4", "ME5", "LTC", "MAJ", "CPT", ""]
+
+# (status string, relative weight, min run days, max run days)
+RUNS = [
+    ("OL @ CHINA", 3, 3, 10),
+    ("OL @ KOREA", 2, 3, 10),
+    ("LL", 4, 1, 5),
+    ("CSE", 3, 5, 20),
+    ("CPE", 1, 2, 5),
+    ("MC", 3, 1, 3),
+    ("HL", 1, 3, 10),
+    ("WFH", 2, 1, 1),
+    ("OB @ PLAB", 2, 1, 2),
+    ("MA @ SGH", 2, 1, 1),
+    ("DS OFF", 2, 1, 1),
+    ("DO Off", 1, 1, 1),
+    ("OIL", 1, 1, 1),
+    ("MC TILL {till}", 1, 2, 4),
+    ("OB-LVS", 1, 1, 1),
+    ("L/L", 1, 1, 2),
+]
+
+HEADER_ROWS = 5
+TOTAL_ROWS = 40
+
+
+def weekdays(start: date, years: int) -> List[date]:
+    """Get every weekday from start for a number of years."""
+    end = start + timedelta(days=365 * years)
+    days = []
+    current = start
+    while current < end:
+        if current.weekday() < 5:
+            days.append(current)
+        current += timedelta(days=1)
+    return days
+
+
+def generate_values(years: int = 1, start: date = date(2025, 1, 6), seed: int = 0) -> List[List[str]]:
+    """Generate a sheet value grid as returned by the Sheets API.
+
+    Args:
+        years: Number of years of dates
+        start: First date (a Monday)
+        seed: Random seed, so runs are comparable across commits
+
+    Returns:
+        Ragged list of rows of cell strings
+    """
+    rng = random.Random(seed)
+    days = weekdays(start, years)
+    columns = 1 + 2 * len(days)
+
+    holidays = {day for day in days if rng.random() < 0.012}
+    weights = [weight for _, weight, _, _ in RUNS]
+
+    day_row = ["Day"] + [value for day in days for value in (day.strftime("%a"), "")]
+    date_row = ["Date"] + [value for day in days for value in (day.strftime("%d/%m/%Y"), "")]
+    period_row = [""] + ["AM", "PM"] * len(days)
+    values = [day_row, date_row, period_row, ["Name"], []]
+
+    for row_idx in range(HEADER_ROWS, TOTAL_ROWS):
+        name = NAMES[(row_idx - HEADER_ROWS) % len(NAMES)]
+        rank = rng.choice(RANKS)
+        row = [f"{rank} {name}".strip()] + [""] * (columns - 1)
+
+        # Some rows are blank (hidden/inactive staff in the real sheet)
+        if rng.random() < 0.15:
+            values.append(row[:1])
+            continue
+
+        day_idx = 0
+        while day_idx < len(days):
+            if rng.random() < 0.12:
+                status, _, min_run, max_run = rng.choices(RUNS, weights=weights)[0]
+                run = rng.randint(min_run, max_run)
+                end_idx = min(day_idx + run, len(days)) - 1
+                status = status.format(till=days[end_idx].strftime("%d/%m"))
+                half_day = run == 1 and rng.random() < 0.3
+                for offset in range(day_idx, end_idx + 1):
+                    row[1 + 2 * offset] = status
+                    row[2 + 2 * offset] = "1" if half_day else status
+                day_idx = end_idx + 1
+            else:
+                row[1 + 2 * day_idx] = row[2 + 2 * day_idx] = "1"
+                day_idx += 1
+
+        for day_idx, day in enumerate(days):
+            if day in holidays:
+                row[1 + 2 * day_idx] = row[2 + 2 * day_idx] = "PH"
+
+        # The API drops trailing empty cells
+        while len(row) > 1 and row[-1] == "":
+            row.pop()
+        values.append(row)
+
+    return values
+
+
+def sample_status_strings(values: List[List[str]], limit: int = 2000) -> List[str]:
+    """Collect non-empty status cells from a generated grid."""
+    cells = []
+    for row in values[HEADER_ROWS:]:
+        for cell in row[1:]:
+            if cell:
+                cells.append(cell)
+                if len(cells) >= limit:
+                    return cells
+    return cells
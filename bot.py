@@ -3,7 +3,6 @@
 import asyncio
 import sys
 import os
-import logging
 from dotenv import load_dotenv
 
 # Add the project root to Python's path
@@ -12,16 +11,12 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO
-)
-
 from app.services.bot_handler import BotHandler
+from app.utils.logging_setup import setup_logging
 
 async def main():
     """Run the bot."""
+    setup_logging()
     bot_handler = BotHandler()
     await bot_handler.run()
 
@@ -0,0 +1,52 @@
+"""Shared fixtures for the test suite."""
+from datetime import date, timedelta
+from typing import Dict, List
+
+import pytest
+
+from app.config import settings
+
+
+@pytest.fixture(autouse=True)
+def isolated_settings(monkeypatch, tmp_path):
+    """Read the whole sheet from a single range and keep every file in a temp dir."""
+    monkeypatch.setattr(settings, "google_sheet_range", "Sheet1")
+    monkeypatch.setattr(settings, "google_sheet_range_names", "Sheet1!A1:A40")
+    monkeypatch.setattr(settings, "google_sheet_auto_tabs", False)
+    monkeypatch.setattr(settings, "sheet_window_days", 0)
+    monkeypatch.setattr(settings, "active_staff_file", "")
+    monkeypatch.setattr(settings, "sheet_snapshot_path", str(tmp_path / "sheet_snapshot"))
+    monkeypatch.setattr(settings, "di_list_path", str(tmp_path / "di_list.txt"))
+    monkeypatch.setattr(settings, "attendance_archive_path", "")
+    monkeypatch.setattr(settings, "parade_history_path", "")
+    monkeypatch.setattr(settings, "weekend_days", "5,6")
+    return settings
+
+
+def build_sheet(start: date, rows: Dict[str, List[str]]) -> List[List[str]]:
+    """Build a sheet value grid in the production layout.
+
+    Args:
+        start: Date of the first column pair
+        rows: Staff name to one status string per day, or (AM, PM) pairs
+            joined with "|" for split days; "" leaves both halves blank
+
+    Returns:
+        Rows of cell strings as returned by the Sheets API
+    """
+    days = max(len(statuses) for statuses in rows.values())
+    dates = [start + timedelta(days=offset) for offset in range(days)]
+    values = [
+        ["Day"] + [value for day in dates for value in (day.strftime("%a"), "")],
+        ["Date"] + [value for day in dates for value in (day.strftime("%d/%m/%Y"), "")],
+        [""] + ["AM", "PM"] * days,
+        ["Name"],
+        [],
+    ]
+    for name, statuses in rows.items():
+        row = [name]
+        for status in statuses:
+            am, _, pm = status.partition("|")
+            row += [am, pm if "|" in status else am]
+        values.append(row)
+    return values
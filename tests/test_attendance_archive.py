@@ -0,0 +1,70 @@
+"""Tests for the memory-mapped attendance archive."""
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.staff import StatusType
+from app.services.attendance_archive import AttendanceArchive
+from app.services.google_sheets import GoogleSheetsService
+from benchmarks.stubs import StaticSheetsClient
+from conftest import build_sheet
+
+MONDAY = date(2025, 1, 6)
+DAYS = [MONDAY + timedelta(days=offset) for offset in range(3)]
+
+
+def rosters(staff):
+    values = build_sheet(MONDAY, staff)
+    sheets = GoogleSheetsService(active_staff=None, service=StaticSheetsClient(values))
+    return sheets.get_staff_lists(DAYS)
+
+
+@pytest.fixture
+def archived(tmp_path):
+    staff = {
+        "ME4 Alice Tan": ["1", "OL @ JAPAN", "1"],
+        "ME5 Bob Lim": ["MC", "1|CSE", "1"],
+    }
+    archive = AttendanceArchive(str(tmp_path / "attendance"), capacity=4)
+    for day, roster in rosters(staff).items():
+        archive.append(day, roster)
+    return archive
+
+
+def test_round_trip(archived):
+    monday = archived.get_day(MONDAY)
+    assert monday["Alice Tan"].status_type == StatusType.PRESENT
+    assert monday["Bob Lim"].status_type == StatusType.MC
+
+    tuesday = archived.get_day(DAYS[1])
+    assert tuesday["Alice Tan"].status_type == StatusType.OL
+    assert tuesday["Alice Tan"].location.location == "JAPAN"
+    bob = tuesday["Bob Lim"]
+    assert bob.am_pm_split and (bob.am_status, bob.pm_status) == (StatusType.PRESENT, StatusType.CSE)
+
+    assert [day for day, _ in archived.get_person("Alice Tan", MONDAY, DAYS[2])] == DAYS
+    assert archived.get_range(MONDAY - timedelta(days=7), MONDAY - timedelta(days=1)) == {}
+    assert archived.get_person("Nobody", MONDAY, DAYS[2]) == []
+
+
+def test_reopen_reads_the_same_data(archived):
+    reopened = AttendanceArchive(archived.path)
+    assert reopened.capacity == 4
+    assert reopened.get_range(MONDAY, DAYS[2]) == archived.get_range(MONDAY, DAYS[2])
+
+
+def test_full_archive_grows(archived):
+    extra = {f"ME{rank} Extra {rank}": ["1", "1", "MC"] for rank in range(1, 5)}
+    days = rosters({"ME4 Alice Tan": ["1", "1", "1"], **extra})
+    archived.append(DAYS[2], days[DAYS[2]])
+    assert archived.capacity == 8
+    assert len(archived.staff) == 6
+
+    # Earlier days keep their data after the column files are rewritten
+    reopened = AttendanceArchive(archived.path)
+    assert reopened.capacity == 8
+    assert reopened.get_day(DAYS[1])["Alice Tan"].location.location == "JAPAN"
+    assert reopened.get_day(MONDAY)["Bob Lim"].status_type == StatusType.MC
+    third = reopened.get_day(DAYS[2])
+    assert third["Extra 4"].status_type == StatusType.MC
+    assert "Bob Lim" not in third
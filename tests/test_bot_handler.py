@@ -0,0 +1,84 @@
+"""Tests for BotHandler commands staying responsive while the sheet is slow."""
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.bot_handler import BotHandler
+from app.utils.date_helpers import get_local_date
+from benchmarks.stubs import StaticSheetsClient, StubBot
+from conftest import build_sheet
+
+
+class SlowSheetsClient(StaticSheetsClient):
+    """Sheets client whose reads block until released."""
+
+    def __init__(self, values):
+        super().__init__(values)
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def get(self, spreadsheetId: str = None, range: str = None):
+        request = super().get(spreadsheetId, range)
+        execute = request.execute
+
+        def slow_execute():
+            self.entered.set()
+            self.release.wait(10)
+            return execute()
+
+        request.execute = slow_execute
+        return request
+
+
+class FakeMessage:
+    """Message that records the replies sent to it."""
+
+    def __init__(self):
+        self.replies = []
+
+    async def reply_text(self, text: str, **kwargs) -> None:
+        self.replies.append(text)
+
+
+def fake_update(chat_id: int = 1) -> SimpleNamespace:
+    return SimpleNamespace(effective_chat=SimpleNamespace(id=chat_id), message=FakeMessage())
+
+
+@pytest.fixture
+def bot_handler(isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, "telegram_bot_token", "0:test")
+    monkeypatch.setattr(isolated_settings, "telegram_chat_id", "-1")
+    monkeypatch.setattr(isolated_settings, "telegram_api_base_url", "")
+    monkeypatch.setattr(isolated_settings, "telegram_webhook_url", "")
+    monkeypatch.setattr(isolated_settings, "google_sheets_api_endpoint", "http://127.0.0.1:9")
+    monkeypatch.setattr(isolated_settings, "sheet_watch_interval", 0)
+    handler = BotHandler()
+    handler.google_sheets_service.service = SlowSheetsClient(
+        build_sheet(get_local_date(), {"ME4 Alice Tan": ["1"], "ME5 Bob Lim": ["MC"]})
+    )
+    handler.google_sheets_service._per_thread_http = False
+    handler.telegram_service.bot = StubBot()
+    return handler
+
+
+def test_help_answers_while_send_waits_on_a_slow_sheet(bot_handler):
+    client = bot_handler.google_sheets_service.service
+    context = SimpleNamespace(args=[])
+
+    async def run():
+        send_update, help_update = fake_update(), fake_update(2)
+        send = asyncio.create_task(bot_handler.handle_send(send_update, context))
+        assert await asyncio.to_thread(client.entered.wait, 5)
+
+        await asyncio.wait_for(bot_handler.handle_help(help_update, context), 1)
+        assert "Available commands" in help_update.message.replies[0]
+        assert not send.done()
+
+        client.release.set()
+        await asyncio.wait_for(send, 5)
+        return send_update.message.replies
+
+    assert asyncio.run(run()) == ["✅ Parade state sent to the configured channel."]
+    assert "ME5 Bob Lim \\- MC" in bot_handler.telegram_service.bot.sent[0]
@@ -0,0 +1,53 @@
+"""Tests for parsing the days and ranges given to bot commands."""
+from datetime import date
+
+import pytest
+
+from app.utils import date_helpers
+from app.utils.date_helpers import parse_day_range, parse_past_date
+
+TODAY = date(2026, 10, 19)
+
+
+@pytest.fixture(autouse=True)
+def fixed_today(monkeypatch):
+    monkeypatch.setattr(date_helpers, "get_local_date", lambda timezone=None: TODAY)
+
+
+def test_upcoming_dates_roll_into_next_year():
+    assert parse_day_range("30/09", TODAY) == (date(2027, 9, 30), date(2027, 9, 30))
+    assert parse_day_range("25/10", TODAY) == (date(2026, 10, 25), date(2026, 10, 25))
+    assert parse_day_range("28/12-03/01", date(2026, 12, 20)) == (date(2026, 12, 28), date(2027, 1, 3))
+
+
+def test_past_dates_stay_in_the_past():
+    assert parse_day_range("30/09", TODAY, prefer_past=True) == (date(2026, 9, 30), date(2026, 9, 30))
+    assert parse_day_range("19/10", TODAY, prefer_past=True) == (TODAY, TODAY)
+    assert parse_day_range("25/10", TODAY, prefer_past=True) == (date(2025, 10, 25), date(2025, 10, 25))
+
+
+def test_past_range_within_the_year():
+    assert parse_day_range("25/09-05/10", TODAY, prefer_past=True) == (date(2026, 9, 25), date(2026, 10, 5))
+
+
+def test_past_range_across_new_year():
+    assert parse_day_range("20/12-05/01", date(2026, 1, 10), prefer_past=True) == (
+        date(2025, 12, 20),
+        date(2026, 1, 5),
+    )
+    # The end is the last 05/01 before today, the start the last 20/12 before that
+    assert parse_day_range("20/12-05/01", TODAY, prefer_past=True) == (date(2025, 12, 20), date(2026, 1, 5))
+
+
+def test_explicit_years_are_kept():
+    assert parse_past_date("25/10/2026", TODAY) == date(2026, 10, 25)
+    assert parse_day_range("30/12/2025-02/01/2026", TODAY, prefer_past=True) == (date(2025, 12, 30), date(2026, 1, 2))
+    with pytest.raises(ValueError, match="Range ends before it starts"):
+        parse_day_range("05/10/2026-25/09/2026", TODAY, prefer_past=True)
+
+
+def test_keywords_and_invalid_text():
+    assert parse_day_range("week", TODAY) == (TODAY, date(2026, 10, 25))
+    assert parse_day_range("nextweek", TODAY) == (date(2026, 10, 26), date(2026, 11, 1))
+    with pytest.raises(ValueError):
+        parse_day_range("alice", TODAY, prefer_past=True)
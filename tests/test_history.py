@@ -0,0 +1,155 @@
+"""Tests for run-length encoded status histories and TILL dates filled from them."""
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.history import StatusHistory, StatusSegment
+from app.models.staff import StatusType
+from app.services.google_sheets import GoogleSheetsService
+from benchmarks.stubs import StaticSheetsClient
+from conftest import build_sheet
+
+MONDAY = date(2025, 1, 6)
+
+P, OL, MC = StatusType.PRESENT, StatusType.OL, StatusType.MC
+
+
+def slots(day_statuses):
+    """Expand (status type, location) per day into AM/PM slots."""
+    expanded = []
+    for offset, (am, pm) in enumerate(day_statuses):
+        day = MONDAY + timedelta(days=offset)
+        expanded.append((day, "AM", *am))
+        expanded.append((day, "PM", *pm))
+    return expanded
+
+
+@pytest.fixture
+def history():
+    # Mon P, Tue-Wed OL @ JAPAN, Thu P(AM) MC(PM), Fri MC
+    return StatusHistory.from_slots(
+        slots(
+            [
+                ((P, None), (P, None)),
+                ((OL, "JAPAN"), (OL, "JAPAN")),
+                ((OL, "JAPAN"), (OL, "JAPAN")),
+                ((P, None), (MC, None)),
+                ((MC, None), (MC, None)),
+            ]
+        )
+    )
+
+
+def test_from_slots_compresses_runs(history):
+    assert history.segments == (
+        StatusSegment(P, None, MONDAY, MONDAY),
+        StatusSegment(OL, "JAPAN", date(2025, 1, 7), date(2025, 1, 8)),
+        StatusSegment(P, None, date(2025, 1, 9), date(2025, 1, 9), "AM", "AM"),
+        StatusSegment(MC, None, date(2025, 1, 9), date(2025, 1, 10), "PM", "PM"),
+    )
+
+
+def test_location_change_starts_a_new_run():
+    history = StatusHistory.from_slots(slots([((OL, "JAPAN"), (OL, "JAPAN")), ((OL, "KOREA"), (OL, "KOREA"))]))
+    assert [segment.location for segment in history.segments] == ["JAPAN", "KOREA"]
+
+
+def test_from_slot_values_matches_from_slots(history):
+    expanded = slots(
+        [
+            ((P, None), (P, None)),
+            ((OL, "JAPAN"), (OL, "JAPAN")),
+            ((OL, "JAPAN"), (OL, "JAPAN")),
+            ((P, None), (MC, None)),
+            ((MC, None), (MC, None)),
+        ]
+    )
+    keys = [(day, period) for day, period, _, _ in expanded]
+    values = [(status_type, location) for _, _, status_type, location in expanded]
+    assert StatusHistory.from_slot_values(keys, values).segments == history.segments
+
+
+def test_empty_history():
+    assert len(StatusHistory.from_slots([])) == 0
+    assert len(StatusHistory.from_slot_values([], [])) == 0
+    assert StatusHistory().segment_at(MONDAY) is None
+
+
+def test_segment_at(history):
+    assert history.segment_at(date(2025, 1, 8), "PM").status_type == OL
+    assert history.segment_at(date(2025, 1, 9), "AM").status_type == P
+    assert history.segment_at(date(2025, 1, 9), "PM").status_type == MC
+    assert history.segment_at(date(2025, 1, 11)) is None
+    assert history.segment_at(date(2025, 1, 5), "PM") is None
+
+
+def test_segments_between(history):
+    assert [segment.status_type for segment in history.segments_between(date(2025, 1, 8), date(2025, 1, 9))] == [
+        OL,
+        P,
+        MC,
+    ]
+    assert history.segments_between(date(2025, 2, 1), date(2025, 2, 5)) == []
+
+
+def test_run_end(history):
+    assert history.run_end(date(2025, 1, 7)) == date(2025, 1, 8)
+    assert history.run_end(date(2025, 1, 9), "PM") == date(2025, 1, 10)
+    assert history.run_end(date(2025, 1, 20)) is None
+
+
+def test_format_span(history):
+    assert [segment.format_span() for segment in history.segments] == [
+        "P 06/01",
+        "OL @ JAPAN 07/01-08/01",
+        "P 09/01(AM)",
+        "MC 09/01(PM)-10/01",
+    ]
+
+
+@pytest.fixture
+def sheets():
+    values = build_sheet(
+        MONDAY,
+        {
+            "ME4 Alice Tan": ["1", "OL @ JAPAN", "OL @ JAPAN", "OL @ JAPAN", "OL @ JAPAN", "", "", "OL @ JAPAN", "1"],
+            "ME5 Bob Lim": ["MC", "MC", "1", "1", "1"],
+            "CPT Carl Ng": ["LL TILL 20/01", "1", "1"],
+            "MAJ Dan Ho": ["1", "1|CSE", "CSE", "1"],
+        },
+    )
+    return GoogleSheetsService(active_staff=None, service=StaticSheetsClient(values))
+
+
+def entries(sheets, target_date):
+    return [record.get_parade_state_entry() for record in sheets.get_staff_list(target_date)]
+
+
+def test_till_filled_from_end_of_run(sheets):
+    assert entries(sheets, MONDAY) == [
+        "ME4 Alice Tan - P",
+        "ME5 Bob Lim - MC TILL 07/01",
+        "CPT Carl Ng - LL TILL 20/01",
+        "MAJ Dan Ho - P",
+    ]
+
+
+def test_till_carries_over_the_weekend(sheets):
+    assert entries(sheets, date(2025, 1, 10))[0] == "ME4 Alice Tan - OL @ JAPAN TILL 13/01"
+    assert entries(sheets, date(2025, 1, 13))[0] == "ME4 Alice Tan - OL @ JAPAN"
+
+
+def test_till_follows_the_pm_half(sheets):
+    assert entries(sheets, date(2025, 1, 7))[3] == "MAJ Dan Ho - P(AM), CSE(PM) TILL 08/01"
+
+
+def test_histories_are_rebuilt_per_fetch(sheets):
+    assert entries(sheets, date(2025, 1, 7))[1] == "ME5 Bob Lim - MC"
+    history_count = len(sheets._history_cache)
+    assert history_count == len(sheets.status_index)
+
+    # Edit the grid in place: the next fetch must not reuse the old histories
+    bob = sheets.service.values_grid[6]
+    bob[5] = bob[6] = "MC"
+    assert entries(sheets, date(2025, 1, 7))[1] == "ME5 Bob Lim - MC TILL 08/01"
+    assert len(sheets._history_cache) == history_count
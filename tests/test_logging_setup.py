@@ -0,0 +1,81 @@
+"""Tests for the per-call-site log rate limiter."""
+import pytest
+from loguru import logger
+
+from app.utils import logging_setup
+from app.utils.logging_setup import CallSiteRateLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(logging_setup.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def kept():
+    """Messages reaching a sink that filters like the configured ones, with their suppressed counts."""
+    records = []
+    sink_id = logger.add(
+        lambda message: records.append((message.record["message"], message.record["extra"].get("suppressed"))),
+        filter=CallSiteRateLimiter.filter,
+        level="DEBUG",
+    )
+    yield records
+    logger.remove(sink_id)
+
+
+def log_many(log, count: int, level: str = "INFO") -> None:
+    for number in range(1, count + 1):
+        log.log(level, f"call {number}")
+
+
+def test_limit_then_sampling_per_call_site(clock, kept):
+    log = logger.patch(CallSiteRateLimiter(limit=2, window=10, sample_every=3).patch)
+    log_many(log, 9)
+    # Two within the limit, then every third record past it
+    assert [message for message, _ in kept] == ["call 1", "call 2", "call 5", "call 8"]
+
+    # Another call site has its own budget
+    kept.clear()
+    log.info("other site")
+    assert kept == [("other site", None)]
+
+
+def test_new_window_reports_suppressed_records(clock, kept):
+    log = logger.patch(CallSiteRateLimiter(limit=2, window=10, sample_every=3).patch)
+    log_many(log, 9)
+    kept.clear()
+
+    clock.now += 9.9
+    log_many(log, 1)
+    assert kept == []
+
+    clock.now += 0.1
+    log_many(log, 3)
+    assert kept == [("call 1", 6), ("call 2", None)]
+
+
+def test_sample_every_zero_drops_everything_past_the_limit(clock, kept):
+    log = logger.patch(CallSiteRateLimiter(limit=1, window=10, sample_every=0).patch)
+    log_many(log, 20)
+    assert [message for message, _ in kept] == ["call 1"]
+
+
+def test_errors_and_disabled_limiter_are_never_dropped(clock, kept):
+    log = logger.patch(CallSiteRateLimiter(limit=1, window=10, sample_every=0).patch)
+    log_many(log, 3, level="ERROR")
+    assert len(kept) == 3
+
+    kept.clear()
+    log_many(logger.patch(CallSiteRateLimiter(limit=0, window=10, sample_every=0).patch), 3)
+    assert len(kept) == 3
@@ -0,0 +1,51 @@
+"""Tests for the scheduled parade state run."""
+import asyncio
+from datetime import date
+
+import pytest
+
+from app import main
+from app.services.attendance_archive import AttendanceArchive
+from app.services.google_sheets import GoogleSheetsService
+from app.services.parade_history import ParadeHistory
+from app.services.telegram_service import TelegramService
+from benchmarks.stubs import StaticSheetsClient, StubBot
+from conftest import build_sheet
+
+MONDAY = date(2025, 1, 6)
+TUESDAY = date(2025, 1, 7)
+
+
+@pytest.fixture
+def bot(isolated_settings, monkeypatch, tmp_path):
+    """Point the scheduled run at a sheet with a PH on Tuesday and archive into tmp_path."""
+    monkeypatch.setattr(isolated_settings, "parade_history_path", str(tmp_path / "history.sqlite3"))
+    monkeypatch.setattr(isolated_settings, "attendance_archive_path", str(tmp_path / "attendance"))
+    values = build_sheet(MONDAY, {"ME4 Alice Tan": ["1", "PH"], "ME5 Bob Lim": ["MC", "PH"]})
+    bot = StubBot()
+    monkeypatch.setattr(main, "GoogleSheetsService", lambda: GoogleSheetsService(service=StaticSheetsClient(values)))
+    monkeypatch.setattr(main, "TelegramService", lambda: TelegramService(token="0:test", chat_id="-1", bot=bot))
+    return bot
+
+
+def archived(tmp_path, day):
+    history = ParadeHistory(str(tmp_path / "history.sqlite3"))
+    try:
+        states = history.states_between(day, day)
+    finally:
+        history.close()
+    return states, AttendanceArchive(str(tmp_path / "attendance")).get_day(day)
+
+
+def test_nothing_is_sent_or_archived_on_a_public_holiday(bot, tmp_path):
+    asyncio.run(main.send_parade_state(TUESDAY, working_days_only=True))
+    assert bot.sent == []
+    assert archived(tmp_path, TUESDAY) == ([], {})
+
+
+def test_working_day_is_sent_and_archived(bot, tmp_path):
+    asyncio.run(main.send_parade_state(MONDAY, working_days_only=True))
+    assert len(bot.sent) == 1
+    states, attendance = archived(tmp_path, MONDAY)
+    assert len(states) == 1
+    assert set(attendance) == {"Alice Tan", "Bob Lim"}
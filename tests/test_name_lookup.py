@@ -0,0 +1,92 @@
+"""Tests for the fuzzy staff name lookup."""
+import pytest
+
+from app.services.name_lookup import NameEntry, NameLookupService, normalize, tokens, trigrams
+
+ROSTER = [
+    NameEntry("ME3 Edmund Cheong", 5, ("Edmund",)),
+    NameEntry("ME4 Gin Tay", 6),
+    NameEntry("CPT Jonathan Koe", 7, ("JK",)),
+    NameEntry("MAJ Ng Boon Hwee", 8),
+    NameEntry("ME2 Edwin Tan", 9),
+    NameEntry("LTC Tan Pau Siang", 10),
+]
+
+
+@pytest.fixture
+def lookup():
+    lookup = NameLookupService()
+    assert lookup.update(ROSTER) == len(ROSTER)
+    return lookup
+
+
+def keys(matches):
+    return [match.key for match in matches]
+
+
+def test_normalize_and_tokens():
+    assert normalize("  Tan,  Pau-Siang ") == "tan pau siang"
+    assert tokens("Kumar S/O Raj Raj") == ["kumar", "raj"]
+    assert trigrams("ng") == frozenset({"  n", " ng", "ng "})
+
+
+def test_exact_name_ranks_first(lookup):
+    matches = lookup.search("Edmund Cheong")
+    assert matches[0].key == "ME3 Edmund Cheong"
+    assert matches[0].row == 5
+    assert matches[0].score == 1.0
+
+
+def test_prefix_matches(lookup):
+    matches = lookup.search("edm")
+    assert matches[0].key == "ME3 Edmund Cheong"
+    assert matches[0].score == pytest.approx(0.8)
+    assert all(match.score < 0.8 for match in matches[1:])
+
+
+def test_misspelling(lookup):
+    assert lookup.search("jonathon")[0].key == "CPT Jonathan Koe"
+    assert lookup.search("chong")[0].key == "ME3 Edmund Cheong"
+
+
+def test_shared_surname_ties_prefer_fewer_words(lookup):
+    matches = lookup.search("tan")
+    assert keys(matches[:2]) == ["ME2 Edwin Tan", "LTC Tan Pau Siang"]
+    assert matches[0].score == matches[1].score == 1.0
+
+
+def test_aliases_and_rank_words(lookup):
+    assert keys(lookup.search("jk")) == ["CPT Jonathan Koe"]
+    assert keys(lookup.search("maj")) == ["MAJ Ng Boon Hwee"]
+
+
+def test_no_match(lookup):
+    assert lookup.search("zzzz") == []
+    assert lookup.search("") == []
+    assert lookup.search("a") == []
+
+
+def test_limit_and_min_score(lookup):
+    assert len(lookup.search("me", limit=2)) == 2
+    assert lookup.search("cheung", min_score=0.99) == []
+
+
+def test_update_reindexes_only_changes(lookup):
+    renamed = [entry for entry in ROSTER if entry.key != "ME4 Gin Tay"] + [NameEntry("ME4 Gin Tay", 6, ("Ginny",))]
+    assert lookup.update(renamed) == 1
+    assert keys(lookup.search("ginny")) == ["ME4 Gin Tay"]
+    assert lookup.update(renamed) == 0
+
+
+def test_removed_entries_leave_the_vocabulary(lookup):
+    assert lookup.update([entry for entry in ROSTER if entry.key != "ME3 Edmund Cheong"]) == 1
+    assert len(lookup) == len(ROSTER) - 1
+    assert "ME3 Edmund Cheong" not in keys(lookup.search("edmund"))
+    assert "edmund" not in lookup._token_entries
+    assert not any("edmund" in words for words in lookup._gram_tokens.values())
+
+
+def test_empty_roster_clears_the_index(lookup):
+    assert lookup.update([]) == len(ROSTER)
+    assert len(lookup) == 0
+    assert not lookup._gram_tokens and not lookup._token_entries
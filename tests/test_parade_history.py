@@ -0,0 +1,92 @@
+"""Tests for the parade state archive and its full-text name search."""
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.parade_state import ParadeState
+from app.services.google_sheets import GoogleSheetsService
+from app.services.parade_history import ParadeHistory
+from benchmarks.stubs import StaticSheetsClient
+from conftest import build_sheet
+
+MONDAY = date(2025, 1, 6)
+
+
+@pytest.fixture
+def parade_states():
+    values = build_sheet(
+        MONDAY,
+        {
+            "ME4 Alice Tan": ["1", "OL @ JAPAN", "1"],
+            "ME5 Bob Lim": ["MC", "1", "1"],
+            "CPT Alan Goh": ["1", "1", "CSE"],
+        },
+    )
+    sheets = GoogleSheetsService(active_staff=None, service=StaticSheetsClient(values))
+    days = [MONDAY + timedelta(days=offset) for offset in range(3)]
+    return [ParadeState(report_date=day, staff_list=roster) for day, roster in sheets.get_staff_lists(days).items()]
+
+
+@pytest.fixture
+def history(tmp_path, parade_states):
+    history = ParadeHistory(str(tmp_path / "history.sqlite3"))
+    for parade_state in parade_states:
+        history.record(parade_state, f"Parade State for {parade_state.report_date}")
+    yield history
+    history.close()
+
+
+def test_fts_is_available(history):
+    assert history.fts
+
+
+def test_search_by_name_prefix_newest_first(history):
+    entries = history.search_name("ali")
+    assert [(entry.report_date.day, entry.label, entry.status) for entry in entries] == [
+        (8, "ME4 Alice Tan", "P"),
+        (7, "ME4 Alice Tan", "OL @ JAPAN"),
+        (6, "ME4 Alice Tan", "P"),
+    ]
+
+
+def test_every_word_must_match(history):
+    assert {entry.label for entry in history.search_name("a")} == {"ME4 Alice Tan", "CPT Alan Goh"}
+    assert {entry.label for entry in history.search_name("tan al")} == {"ME4 Alice Tan"}
+    assert history.search_name("alice goh") == []
+
+
+def test_search_matches_labels_not_statuses(history):
+    assert {entry.label for entry in history.search_name("cpt")} == {"CPT Alan Goh"}
+    assert history.search_name("japan") == []
+    assert history.search_name("mc") == []
+
+
+def test_search_ignores_fts_syntax(history):
+    assert history.search_name('"') == []
+    assert history.search_name("bob OR alice") == []
+    assert history.search_name("   ") == []
+
+
+def test_search_limit(history):
+    assert len(history.search_name("a", limit=2)) == 2
+
+
+def test_like_fallback_matches_fts(history):
+    expected = history.search_name("tan")
+    history.fts = False
+    assert history.search_name("tan") == expected
+
+
+def test_sent_state_counts_over_later_draft(history, parade_states):
+    monday = parade_states[0]
+    assert history.mark_sent(f"Parade State for {MONDAY}")
+    # A later draft of the same date with different text does not replace the sent one
+    history.record(monday, "Edited draft")
+    assert history.state_for(MONDAY).text == f"Parade State for {MONDAY}"
+    assert [entry.sent for entry in history.search_name("bob") if entry.report_date == MONDAY] == [True]
+
+
+def test_identical_message_is_stored_once(history, parade_states):
+    state_id = history.state_for(MONDAY).id
+    assert history.record(parade_states[0], f"Parade State for {MONDAY}") == state_id
+    assert len(history.states_between(MONDAY, MONDAY + timedelta(days=2))) == 3
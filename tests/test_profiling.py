@@ -0,0 +1,50 @@
+"""Tests for on-demand profiling of concurrent runs."""
+import asyncio
+import os
+import threading
+
+from app.utils.profiling import Profiler
+
+
+def test_overlapping_runs_are_profiled_one_at_a_time(tmp_path):
+    profiler = Profiler(output_dir=str(tmp_path), sort_key="cumulative")
+    profiler.arm(2)
+    threads = {}
+
+    async def run(name: str, delay: float) -> str:
+        async with profiler.profile(name):
+            await asyncio.sleep(delay)
+            threads[name] = await profiler.to_thread(threading.get_ident)
+        return name
+
+    async def main():
+        first = asyncio.create_task(run("first", 0.05))
+        await asyncio.sleep(0.01)
+        # Starts while the first run is profiled: runs unprofiled instead of failing
+        return await asyncio.gather(first, run("second", 0))
+
+    assert asyncio.run(main()) == ["first", "second"]
+    assert not profiler.running
+    assert profiler.remaining_runs == 1
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in profiler.last_reports)
+    assert all(os.path.basename(path).startswith("first_") for path in profiler.last_reports)
+
+    # Only the profiled run's blocking calls run inline on the event loop thread
+    assert threads["first"] == threading.get_ident()
+    assert threads["second"] != threading.get_ident()
+
+    # The next run is profiled again
+    asyncio.run(run("third", 0))
+    assert profiler.remaining_runs == 0
+    assert os.path.basename(profiler.last_reports[0]).startswith("third_")
+
+
+def test_unarmed_profiler_runs_blocking_calls_in_threads(tmp_path):
+    profiler = Profiler(output_dir=str(tmp_path))
+
+    async def run() -> int:
+        async with profiler.profile("draft"):
+            return await profiler.to_thread(threading.get_ident)
+
+    assert asyncio.run(run()) != threading.get_ident()
+    assert os.listdir(tmp_path) == []
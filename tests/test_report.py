@@ -0,0 +1,114 @@
+"""Tests for rendering parade reports with sheet text escaped for each markup."""
+import csv
+import io
+import re
+from datetime import date
+
+import pytest
+
+from app.models.parade_state import ParadeState
+from app.models.report import (
+    CSV,
+    HTML,
+    MARKDOWN_V2,
+    PLAIN,
+    ParadeReport,
+    ReportRow,
+    escape_html,
+    escape_markdown_v2,
+)
+from app.services.google_sheets import GoogleSheetsService
+from app.services.report_renderer import ReportRenderer
+from benchmarks.stubs import StaticSheetsClient
+from conftest import build_sheet
+
+MONDAY = date(2025, 1, 6)
+SPECIAL = "_*[]()~`>#+-=|{}.!\\"
+
+
+def unescaped_markdown_v2(text: str) -> str:
+    """Drop escaped characters, leaving only markup."""
+    return re.sub(r"\\.", "", text)
+
+
+@pytest.fixture
+def report():
+    return ParadeReport(
+        report_date=MONDAY,
+        rows=(
+            ReportRow(1, "ME3 Tan_Ah (2IC)", "P", "P", "P"),
+            ReportRow(2, "CPT O'Neil *Jr*", "OL @ U.S.A [R&R] TILL 10/01", "OL", "OL", "U.S.A [R&R]", "U.S.A [R&R]"),
+            ReportRow(3, "<b>LTA</b> Lim", "MC", "MC", "MC"),
+        ),
+        am_count=1,
+        pm_count=1,
+        as_of_line="(as of 06/01 08:00, refreshing from Google Sheets)",
+        di_lines=("Today's DI: ME3 Edmund Cheong",),
+    )
+
+
+def test_escape_markdown_v2_escapes_every_special_character():
+    escaped = escape_markdown_v2(SPECIAL)
+    assert escaped == "".join(f"\\{char}" for char in SPECIAL)
+    assert unescaped_markdown_v2(escaped) == ""
+    assert escape_markdown_v2("Alice Tan 1 @ & ' \"") == "Alice Tan 1 @ & ' \""
+
+
+def test_escape_html_escapes_only_markup():
+    assert escape_html("<b>R&R</b> \"O'Neil\"") == "&lt;b&gt;R&amp;R&lt;/b&gt; \"O'Neil\""
+
+
+def test_markdown_v2_leaves_only_the_bold_title_unescaped(report):
+    text = report.to_markdown_v2()
+    assert text.startswith("*Parade State for 06/01/2025*\n")
+    assert unescaped_markdown_v2(text).count("*") == 2
+    assert not re.search(r"[_\[\]()~`>#+\-=|{}.!]", unescaped_markdown_v2(text))
+    assert "2\\. CPT O'Neil \\*Jr\\* \\- OL @ U\\.S\\.A \\[R&R\\] TILL 10/01" in text
+    # Unescaping gives back the plain text
+    assert re.sub(r"\\(.)", r"\1", text) == f"*{report.title}*\n{report.body()}"
+
+
+def test_html_leaves_only_the_bold_title_as_markup(report):
+    text = report.to_html()
+    assert text.startswith("<b>Parade State for 06/01/2025</b>\n")
+    assert re.findall(r"<[^>]*>", text) == ["<b>", "</b>"]
+    assert "3. &lt;b&gt;LTA&lt;/b&gt; Lim - MC" in text
+    assert "[R&amp;R]" in text
+
+
+def test_plain_and_csv_are_not_escaped(report):
+    assert "2. CPT O'Neil *Jr* - OL @ U.S.A [R&R] TILL 10/01" in report.to_plain()
+    rows = list(csv.reader(io.StringIO(report.to_csv())))
+    assert rows[2][2:4] == ["CPT O'Neil *Jr*", "OL @ U.S.A [R&R] TILL 10/01"]
+    assert rows[2][6] == "U.S.A [R&R]"
+
+
+def test_sheet_text_is_escaped_end_to_end():
+    values = build_sheet(MONDAY, {"ME4 Alice Tan": ["OL @ U.S.A (R&R)"], "ME5 Bob_Lim": ["1"]})
+    sheets = GoogleSheetsService(active_staff=None, service=StaticSheetsClient(values))
+    report = ParadeState(report_date=MONDAY, staff_list=sheets.get_staff_list(MONDAY)).to_report()
+    markdown = report.to_markdown_v2()
+    assert "OL @ U\\.S\\.A \\(R&R\\)" in markdown
+    assert "Bob\\_Lim" in markdown
+    assert "OL @ U.S.A (R&amp;R)" in report.to_html()
+
+
+def test_renderer_caches_equal_reports(report):
+    renderer = ReportRenderer(max_entries=2)
+    rebuilt = ParadeReport(
+        report_date=report.report_date,
+        rows=report.rows,
+        am_count=report.am_count,
+        pm_count=report.pm_count,
+        as_of_line=report.as_of_line,
+        di_lines=report.di_lines,
+    )
+    first = renderer.render(report, MARKDOWN_V2)
+    assert renderer.render(rebuilt, MARKDOWN_V2) is first
+    assert renderer.render(report, HTML) == report.to_html()
+    # The least recently used output is evicted
+    renderer.render(report, PLAIN)
+    assert len(renderer._cache) == 2 and (report, MARKDOWN_V2) not in renderer._cache
+    assert renderer.render(report, CSV) == report.to_csv()
+    with pytest.raises(ValueError, match="Unknown parade state format"):
+        renderer.render(report, "pdf")
@@ -0,0 +1,189 @@
+"""Tests for the circuit breakers around the Sheets and Bot API calls."""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httplib2
+import pytest
+
+from app.config import settings
+from app.services.google_sheets import GoogleSheetsService
+from app.services.telegram_service import TelegramService
+from app.utils import resilience
+from app.utils.resilience import CircuitBreaker, CircuitOpenError
+from benchmarks.stubs import StaticSheetsClient, StubBot
+
+
+class Clock:
+    """Stands in for time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    return clock
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("Sheets", failure_threshold=3, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("Sheets", failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_single_probe_after_reset_timeout(clock):
+    breaker = CircuitBreaker("Sheets", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Only one probe at a time
+    assert not breaker.allow()
+
+
+def test_probe_success_closes(clock):
+    breaker = CircuitBreaker("Sheets", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_probe_failure_opens_again(clock):
+    breaker = CircuitBreaker("Sheets", failure_threshold=3, reset_timeout=30)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert "probe in 30s" in breaker.describe()
+
+
+def test_abandoned_probe_can_be_retried(clock):
+    breaker = CircuitBreaker("Sheets", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_abandoned()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_only_one_thread_gets_the_probe(clock):
+    breaker = CircuitBreaker("Sheets", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    barrier = threading.Barrier(8)
+
+    def probe() -> bool:
+        barrier.wait()
+        return breaker.allow()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert sorted(executor.map(lambda _: probe(), range(8))) == [False] * 7 + [True]
+
+
+class HangingBot(StubBot):
+    """Bot whose sendMessage never answers."""
+
+    async def send_message(self, chat_id: str = None, text: str = "", **kwargs) -> None:
+        await asyncio.Event().wait()
+
+
+def test_cancelled_send_releases_the_probe(monkeypatch, clock):
+    monkeypatch.setattr(settings, "circuit_failure_threshold", 1)
+    monkeypatch.setattr(settings, "circuit_reset_timeout", 30)
+    telegram = TelegramService(token="0:test", chat_id="-1", bot=HangingBot())
+    breaker = telegram.breakers["sendMessage"]
+    breaker.record_failure()
+    clock.now += 30
+
+    async def run():
+        probe = asyncio.create_task(telegram.send_message("Parade State"))
+        # The clock fixture freezes time.monotonic, so yield instead of sleeping
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert breaker.state == CircuitBreaker.HALF_OPEN and not breaker.allow()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    asyncio.run(run())
+    # The next send may probe again instead of the breaker staying half-open forever
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+class FailingUpdatesBot(StubBot):
+    """Bot whose getUpdates always fails, e.g. with a webhook set."""
+
+    async def get_updates(self, **kwargs) -> list:
+        raise ConnectionError("Conflict: can't use getUpdates method while webhook is active")
+
+
+def test_get_updates_failures_do_not_block_send_message(monkeypatch):
+    monkeypatch.setattr(settings, "circuit_failure_threshold", 2)
+    bot = FailingUpdatesBot()
+    telegram = TelegramService(token="0:test", chat_id="-1", bot=bot)
+
+    async def run():
+        for _ in range(3):
+            await telegram.fetch_di_list()
+        await telegram.send_message("Parade State")
+
+    asyncio.run(run())
+    assert telegram.breakers["getUpdates"].state == CircuitBreaker.OPEN
+    assert telegram.breakers["sendMessage"].state == CircuitBreaker.CLOSED
+    assert bot.sent == ["Parade State"]
+
+
+class BlockingRequest:
+    """Request that records the HTTP client it ran on, once both workers are busy."""
+
+    def __init__(self, barrier: threading.Barrier):
+        self.barrier = barrier
+
+    def execute(self, http=None):
+        self.barrier.wait(timeout=5)
+        return {"http": http, "thread": threading.current_thread().name}
+
+
+def test_each_worker_thread_has_its_own_http_client():
+    sheets = GoogleSheetsService(active_staff=None, service=StaticSheetsClient([]))
+    sheets._per_thread_http = True
+    barrier = threading.Barrier(2)
+
+    with ThreadPoolExecutor(max_workers=2) as callers:
+        results = list(callers.map(lambda _: sheets._execute(BlockingRequest(barrier)), range(2)))
+
+    assert results[0]["thread"] != results[1]["thread"]
+    assert results[0]["http"] is not results[1]["http"]
+    for result in results:
+        assert isinstance(result["http"], httplib2.Http)
+        assert result["http"].timeout == settings.google_sheets_timeout
@@ -0,0 +1,79 @@
+"""Tests for the whole-sheet lint of status cells."""
+from datetime import date
+
+import pytest
+
+from app.models.staff import StatusType
+from app.services.google_sheets import GoogleSheetsService
+from app.services.sheet_lint import AMBIGUOUS, BAD_DATE, UNRECOGNIZED, classify, lint_cells
+from benchmarks.stubs import StaticSheetsClient
+from conftest import build_sheet
+
+MONDAY = date(2025, 1, 6)
+MAPPINGS = {"1": StatusType.PRESENT, "OFF": StatusType.OIL}
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        # Blanks and values the decoder reads exactly
+        ("", None),
+        ("nan", None),
+        ("1", None),
+        ("OFF", None),
+        ("MC", None),
+        ("PH", None),
+        ("OL @ JAPAN", None),
+        ("MC TILL 10/01", None),
+        # Unknown codes
+        ("XYZ", (UNRECOGNIZED, StatusType.OTHERS, "no status code")),
+        ("CSE/MC", (UNRECOGNIZED, StatusType.OTHERS, "no status code")),
+        ("@ JAPAN", (UNRECOGNIZED, StatusType.OTH, 'no status code in ""')),
+        ("XYZ TILL 10/01", (UNRECOGNIZED, StatusType.OTH, 'no status code in "XYZ"')),
+        # Several codes, or TILL swallowed by the location
+        ("CPE @ SAFTI", (AMBIGUOUS, StatusType.PRESENT, "contains P, CPE")),
+        ("LL MC TILL 10/01", (AMBIGUOUS, StatusType.LL, "contains LL, MC")),
+        ("OL @ JAPAN TILL 10/01", (AMBIGUOUS, StatusType.OL, "TILL after @ is read as part of the location")),
+        # Unreadable TILL dates
+        ("MC TILL 32/01", (BAD_DATE, StatusType.MC, '"32/01" is not DD/MM')),
+        ("MC TILL tmr", (BAD_DATE, StatusType.MC, '"tmr" is not DD/MM')),
+    ],
+)
+def test_classify(value, expected):
+    assert classify(value, MAPPINGS) == expected
+
+
+def test_lint_cells_groups_cells_by_value():
+    date_columns = [(MONDAY, 1), (date(2025, 1, 7), 3)]
+    rows = [
+        ["Name"],
+        ["ME4 Alice Tan", "XYZ", "XYZ", "1", " MC TILL 32/01 "],
+        ["ME5 Bob Lim", "1"],
+        ["Not staff", "XYZ", "XYZ", "XYZ", "XYZ"],
+    ]
+    report = lint_cells(rows, date_columns, {1: "ME4 Alice Tan", 2: "ME5 Bob Lim"}, MAPPINGS)
+
+    # Bob's missing cells are blanks, the row outside staff_rows is not scanned
+    assert report.cells_scanned == 8
+    assert report.distinct_values == 4
+    assert [(issue.kind, issue.value) for issue in report.issues] == [(UNRECOGNIZED, "XYZ"), (BAD_DATE, "MC TILL 32/01")]
+    assert [(cell.a1, cell.period) for cell in report.issues[0].cells] == [("B3", "AM"), ("C3", "PM")]
+    assert report.issues[1].cells[0].day == date(2025, 1, 7)
+
+
+def test_lint_cells_without_staff_or_dates():
+    assert lint_cells([["Name"]], [(MONDAY, 1)], {}, MAPPINGS).cells_scanned == 0
+    assert lint_cells([["Name"], ["Alice"]], [], {1: "Alice"}, MAPPINGS).issues == ()
+
+
+def test_am_pm_mismatch_flags_only_the_bad_half():
+    values = build_sheet(MONDAY, {"ME4 Alice Tan": ["1|XYZ", "MC TILL 99/99|1"], "ME5 Bob Lim": ["", "1"]})
+    report = GoogleSheetsService(active_staff=None, service=StaticSheetsClient(values)).lint()
+
+    assert report.cells_scanned == 8
+    by_value = {issue.value: issue for issue in report.issues}
+    assert set(by_value) == {"XYZ", "MC TILL 99/99"}
+    assert [(cell.name, cell.day, cell.period) for cell in by_value["XYZ"].cells] == [("ME4 Alice Tan", MONDAY, "PM")]
+    assert [(cell.day, cell.period) for cell in by_value["MC TILL 99/99"].cells] == [(date(2025, 1, 7), "AM")]
+    assert by_value["XYZ"].cells[0].a1 == "C6"
+    assert report.format_lines()[1] == 'unrecognized: "XYZ" x1, read as OTHERS (no status code)'
@@ -0,0 +1,94 @@
+"""Tests for the local sheet snapshot."""
+from datetime import date
+
+import pytest
+
+from app.services.google_sheets import GoogleSheetsService
+from app.services.sheet_snapshot import HEADER, SheetSnapshotStore
+from benchmarks.stubs import StaticSheetsClient
+from conftest import build_sheet
+
+VALUES = [["Day", "Mon", ""], ["Date", "06/01/2025", ""], ["", "AM", "PM"], ["Name"], [], ["ME4 Alice Tan", "1", "OL @ JAPAN"]]
+DATE_COLUMNS = [(date(2025, 1, 6), 1)]
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    saved = SheetSnapshotStore(path).save(VALUES, DATE_COLUMNS)
+
+    loaded = SheetSnapshotStore(path).load()
+    assert loaded.values == VALUES
+    assert loaded.date_columns == DATE_COLUMNS
+    assert abs(loaded.fetched_at.timestamp() - saved.fetched_at.timestamp()) < 1e-3
+
+
+def test_unchanged_values_only_update_the_fetch_time(tmp_path):
+    path = tmp_path / "snapshot.bin"
+    store = SheetSnapshotStore(str(path))
+    store.save(VALUES, DATE_COLUMNS)
+    body = path.read_bytes()[HEADER.size:]
+
+    again = store.save([list(row) for row in VALUES], DATE_COLUMNS)
+    assert path.read_bytes()[HEADER.size:] == body
+    assert not (tmp_path / "snapshot.bin.tmp").exists()
+    assert SheetSnapshotStore(str(path)).load().fetched_at == again.fetched_at
+
+
+def test_changed_values_are_rewritten(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    store = SheetSnapshotStore(path)
+    store.save(VALUES, DATE_COLUMNS)
+    changed = VALUES[:-1] + [["ME4 Alice Tan", "MC", "MC"]]
+    store.save(changed, DATE_COLUMNS)
+
+    assert SheetSnapshotStore(path).load().values == changed
+
+
+def test_missing_or_foreign_file_is_ignored(tmp_path):
+    path = tmp_path / "snapshot.bin"
+    assert SheetSnapshotStore(str(path)).load() is None
+    path.write_bytes(b"PSSNAP01" + bytes(64))
+    assert SheetSnapshotStore(str(path)).load() is None
+
+
+class FailingClient:
+    """Sheets client whose every request fails."""
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, **kwargs):
+        return self
+
+    def execute(self):
+        raise ConnectionError("Sheets is down")
+
+
+def offline_sheets():
+    """Sheets service with a snapshot of 06/01-08/01/2025 and no connection."""
+    values = build_sheet(date(2025, 1, 6), {"ME4 Alice Tan": ["1", "MC", "1"]})
+    sheets = GoogleSheetsService(active_staff=None, service=StaticSheetsClient(values))
+    sheets.get_staff_list(date(2025, 1, 6))
+    sheets.service = FailingClient()
+    return sheets
+
+
+def test_fetch_failure_falls_back_to_the_snapshot():
+    sheets = offline_sheets()
+    roster = sheets.get_staff_list(date(2025, 1, 7))
+    assert [record.get_parade_state_entry() for record in roster] == ["ME4 Alice Tan - MC"]
+    assert sheets.data_as_of == sheets.snapshot.fetched_at
+
+
+def test_snapshot_does_not_answer_dates_it_does_not_have():
+    sheets = offline_sheets()
+    with pytest.raises(ConnectionError):
+        sheets.get_staff_list(date(2025, 1, 20))
+    with pytest.raises(LookupError):
+        sheets.get_staff_list(date(2025, 1, 20), from_snapshot=True)
+    with pytest.raises(LookupError):
+        sheets.get_staff_lists([date(2025, 1, 7), date(2025, 1, 20)])
+    assert list(sheets.get_staff_lists([date(2025, 1, 7), date(2025, 1, 8)])) == [date(2025, 1, 7), date(2025, 1, 8)]
@@ -0,0 +1,185 @@
+"""Tests for the watcher that posts edits to today's columns of the sheet."""
+import asyncio
+from datetime import date, timedelta
+from typing import List, Tuple
+
+import pytest
+
+from app.models.staff import StaffRoster
+from app.services.google_sheets import GoogleSheetsService
+from app.services.sheet_watcher import SheetWatcher, roster_changes
+from app.services.work_calendar import WorkCalendar
+from app.utils.resilience import Backoff
+from benchmarks.stubs import StaticSheetsClient
+from conftest import build_sheet
+
+MONDAY = date(2025, 1, 6)
+TUESDAY = MONDAY + timedelta(days=1)
+SATURDAY = MONDAY + timedelta(days=5)
+
+
+class FakeSheets:
+    """Sheet service serving rosters parsed from an editable grid, failing on demand."""
+
+    def __init__(self, values: List[List[str]], holidays=()):
+        self.values = values
+        self.sheets = GoogleSheetsService(active_staff=None, service=StaticSheetsClient(values))
+        self.work_calendar = WorkCalendar(2025, 2025, holidays)
+        self.data_as_of = None
+        self.failures = 0
+        self.reads = 0
+        self.digests = 0
+
+    def day_digest(self, day: date) -> str:
+        self.digests += 1
+        return repr(self.values)
+
+    def get_staff_list(self, day: date):
+        self.reads += 1
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("sheet unavailable")
+        return self.sheets.get_staff_list(day)
+
+    def edit(self, name: str, day: date, am: str, pm: str) -> None:
+        row = next(row for row in self.values if row and row[0] == name)
+        col = 1 + 2 * (day - MONDAY).days
+        row[col:col + 2] = [am, pm]
+
+
+class FakeTelegram:
+    """Telegram service recording posted messages, failing on demand."""
+
+    def __init__(self):
+        self.sent: List[str] = []
+        self.failures = 0
+
+    async def send_message(self, text: str, **kwargs) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("telegram unavailable")
+        self.sent.append(text)
+
+
+class RecordingBackoff(Backoff):
+    """Backoff that remembers each poll outcome and the delay it chose."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.outcomes: List[Tuple[bool, int, float]] = []
+
+    def next_delay(self, failed: bool) -> float:
+        delay = super().next_delay(failed)
+        self.outcomes.append((failed, self.failures, delay))
+        return delay
+
+
+@pytest.fixture
+def sheets():
+    return FakeSheets(
+        build_sheet(
+            MONDAY,
+            {"ME4 Alice Tan": ["1", "1"], "ME5 Bob Lim": ["1", "1"], "CPT Alan Goh": ["MC", "MC"]},
+        ),
+        holidays={TUESDAY},
+    )
+
+
+@pytest.fixture
+def telegram():
+    return FakeTelegram()
+
+
+def watcher(sheets, telegram, today=MONDAY):
+    return SheetWatcher(sheets, telegram, interval=300, max_interval=1800, today=lambda: today)
+
+
+def test_roster_changes(sheets):
+    monday = sheets.sheets.get_staff_list(MONDAY)
+    sheets.edit("ME5 Bob Lim", MONDAY, "1", "OL @ JAPAN")
+    edited = sheets.sheets.get_staff_list(MONDAY)
+    without_alan = StaffRoster(edited.staff[:2])
+
+    assert roster_changes(monday, monday) == []
+    assert [change.format_line() for change in roster_changes(monday, without_alan)] == [
+        "ME5 Bob Lim: P → P(AM), OL @ JAPAN(PM)",
+        "- CPT Alan Goh (no longer listed)",
+    ]
+    assert [change.format_line() for change in roster_changes(without_alan, edited)] == ["+ CPT Alan Goh - MC TILL 07/01"]
+
+
+def test_first_poll_records_and_edits_are_posted(sheets, telegram):
+    watch = watcher(sheets, telegram)
+    assert asyncio.run(watch.poll_once()) is None
+    assert telegram.sent == []
+
+    # Unchanged columns are not read again
+    assert asyncio.run(watch.poll_once()) is None
+    assert sheets.reads == 1
+
+    sheets.edit("ME4 Alice Tan", MONDAY, "MC", "MC")
+    changes = asyncio.run(watch.poll_once())
+    assert [change.format_line() for change in changes] == ["ME4 Alice Tan: P → MC"]
+    assert len(telegram.sent) == 1
+    assert "ME4 Alice Tan: P → MC" in telegram.sent[0]
+    assert "Present: 1/3 (AM), 1/3 (PM)" in telegram.sent[0]
+    assert watch.updates_sent == 1
+
+
+def test_new_day_records_a_new_baseline(sheets, telegram):
+    day = [MONDAY]
+    watch = SheetWatcher(sheets, telegram, interval=300, max_interval=1800, today=lambda: day[0])
+    asyncio.run(watch.poll_once())
+    day[0] = MONDAY + timedelta(days=2)
+    sheets.edit("ME4 Alice Tan", MONDAY, "MC", "MC")
+    assert asyncio.run(watch.poll_once()) is None
+    assert telegram.sent == []
+
+
+@pytest.mark.parametrize("day", [SATURDAY, TUESDAY])
+def test_non_working_days_are_skipped(sheets, telegram, day):
+    watch = watcher(sheets, telegram, today=day)
+    assert asyncio.run(watch.poll_once()) is None
+    assert (sheets.digests, sheets.reads) == (0, 0)
+    assert watch.polls == 1
+
+
+def test_snapshot_only_read_is_a_failure(sheets, telegram):
+    sheets.data_as_of = object()
+    with pytest.raises(RuntimeError, match="only the snapshot"):
+        asyncio.run(watcher(sheets, telegram).poll_once())
+
+
+def test_backoff_while_sheets_or_telegram_fail(sheets, telegram):
+    watch = SheetWatcher(sheets, telegram, interval=0.001, max_interval=0.004, today=lambda: MONDAY)
+    watch.backoff = RecordingBackoff(0.001, 0.004, jitter=0.2)
+    sheets.failures = 3
+    edit_after_polls = 4
+    stop_after_polls = 6
+    poll_once = watch.poll_once
+    stop = asyncio.Event()
+
+    async def poll_and_script():
+        if watch.polls == edit_after_polls:
+            sheets.edit("ME4 Alice Tan", MONDAY, "MC", "MC")
+            telegram.failures = 1
+        try:
+            return await poll_once()
+        finally:
+            if watch.polls == stop_after_polls:
+                stop.set()
+
+    watch.poll_once = poll_and_script
+    asyncio.run(watch.run(stop))
+
+    # Three sheet failures, the baseline, a failed post and its retry
+    assert [(failed, failures) for failed, failures, _ in watch.backoff.outcomes] == [
+        (True, 1), (True, 2), (True, 3), (False, 0), (True, 1), (False, 0),
+    ]
+    for failed, failures, delay in watch.backoff.outcomes:
+        if failed:
+            assert 0.001 <= delay <= min(0.001 * 2 ** failures, 0.004)
+        else:
+            assert 0.0008 <= delay <= 0.0012
+    assert len(telegram.sent) == 1 and "ME4 Alice Tan: P → MC" in telegram.sent[0]
+    assert watch.last_error is None
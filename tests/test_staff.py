@@ -0,0 +1,98 @@
+"""Tests for the compact staff records behind every parade state."""
+import dataclasses
+import re
+from datetime import date
+
+import pytest
+
+from app.models.staff import StaffRecord, StatusBreakdown, StatusRecord, StatusType
+from app.services.google_sheets import GoogleSheetsService
+from benchmarks.stubs import StaticSheetsClient
+from conftest import build_sheet
+
+MONDAY = date(2025, 1, 6)
+OL, MC, P = StatusType.OL, StatusType.MC, StatusType.PRESENT
+CELLS = ["Sch Comd", "OC MECH", "CC", "ME4 Alice Tan", "CPT Alan Goh", "LTC Tan Wei Ming", "Bob Lim"]
+
+
+def baseline_entry(cell: str, status: StatusRecord) -> str:
+    """Parade state entry as formatted before names were resolved by StaffIndex."""
+    name, rank, position = cell, None, None
+    if "Sch Comd" in name or "OC" in name or "CC" in name:
+        position = name
+    else:
+        rank_match = re.match(r"^(ME\d+|LTC|MAJ|CPT|LTA)\s+(.+)$", name)
+        if rank_match:
+            rank, name = rank_match.group(1), rank_match.group(2)
+    if position and any(pos in position for pos in ["Sch Comd", "OC", "CC"]):
+        name_display = position
+    else:
+        name_display = f"{rank} {name}" if rank else name
+    return f"{name_display} - {status.format_status()}"
+
+
+@pytest.mark.parametrize(
+    "record, expected",
+    [
+        (StaffRecord(0, "OC MECH", StatusRecord(StatusType.PRESENT), position="OC MECH"), "OC MECH - P"),
+        (StaffRecord(0, "Alice Tan", StatusRecord(StatusType.MC), rank="ME4"), "ME4 Alice Tan - MC"),
+        (StaffRecord(0, "Bob Lim", StatusRecord(StatusType.PRESENT), position="2IC"), "Bob Lim - P"),
+        (StaffRecord(0, "Bob Lim", StatusRecord(StatusType.PRESENT), rank="CPT", display="Bobby"), "Bobby - P"),
+    ],
+)
+def test_entry_without_display_keeps_the_baseline_format(record, expected):
+    assert record.get_parade_state_entry() == expected
+
+
+def test_sheet_entries_match_the_baseline_format():
+    values = build_sheet(MONDAY, {cell: ["1" if index % 2 else "MC"] for index, cell in enumerate(CELLS)})
+    sheets = GoogleSheetsService(active_staff=None, service=StaticSheetsClient(values))
+    roster = sheets.get_staff_list(MONDAY)
+    assert [record.get_parade_state_entry() for record in roster] == [
+        baseline_entry(cell, record.status) for cell, record in zip(CELLS, roster, strict=True)
+    ]
+
+
+@pytest.fixture
+def breakdown():
+    values = build_sheet(
+        MONDAY,
+        {"ME4 Alice Tan": ["OL @ JAPAN"], "ME5 Bob Lim": ["1|OL @ KOREA"], "CPT Alan Goh": ["MC"], "Dan Ng": ["1"]},
+    )
+    sheets = GoogleSheetsService(active_staff=None, service=StaticSheetsClient(values))
+    return sheets.get_staff_list(MONDAY).breakdown()
+
+
+def test_breakdown_counts_each_period(breakdown):
+    assert dict(breakdown.am) == {OL: 1, MC: 1, P: 2}
+    assert dict(breakdown.pm) == {OL: 2, MC: 1, P: 1}
+    assert dict(breakdown.pm_locations) == {(OL, "JAPAN"): 1, (OL, "KOREA"): 1, (MC, None): 1, (P, None): 1}
+    assert (breakdown.count(OL), breakdown.count(OL, "PM"), breakdown.count(StatusType.CSE)) == (1, 2, 0)
+    assert breakdown.format_lines() == [
+        "OL: 1(AM), 2(PM)",
+        "  @ JAPAN: 1(AM), 1(PM)",
+        "  @ KOREA: 0(AM), 1(PM)",
+        "MC: 1(AM), 1(PM)",
+    ]
+
+
+def test_breakdown_views_are_read_only(breakdown):
+    # Missing keys still read as 0 through the view
+    assert breakdown.am[StatusType.CSE] == 0
+    assert breakdown.am_locations[(OL, "KOREA")] == 0
+    with pytest.raises(TypeError):
+        breakdown.am[OL] = 5
+    with pytest.raises(TypeError):
+        del breakdown.pm_locations[(MC, None)]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        breakdown.am = {}
+    assert StatusBreakdown().am[OL] == 0
+
+
+def test_combine_adds_counts_without_changing_the_inputs(breakdown):
+    combined = StatusBreakdown.combine([breakdown, breakdown, StatusBreakdown()])
+    assert combined.count(OL, "PM") == 4
+    assert combined.pm_locations[(OL, "KOREA")] == 2
+    assert breakdown.count(OL, "PM") == 2
+    with pytest.raises(TypeError):
+        combined.pm[OL] = 0
@@ -0,0 +1,34 @@
+"""Tests for loading the active staff file and resolving it against the sheet."""
+import json
+from datetime import date
+
+from app.services import staff_index
+from app.services.google_sheets import GoogleSheetsService
+from app.services.staff_index import load_active_staff
+from benchmarks.stubs import StaticSheetsClient
+from conftest import build_sheet
+
+MONDAY = date(2025, 1, 6)
+
+
+def test_example_file_loads():
+    active_staff = load_active_staff("active_staff.example.json")
+    assert active_staff[0].name == "Sch Comd"
+    assert active_staff[4].synonyms == ["Alice"]
+
+
+def test_relative_path_is_resolved_against_the_project(tmp_path, monkeypatch):
+    (tmp_path / "staff.json").write_text(json.dumps(["Alice Tan", {"name": "Bob Lim", "synonyms": ["Bob"]}]))
+    monkeypatch.setattr(staff_index, "PROJECT_DIR", str(tmp_path))
+    monkeypatch.chdir("/")
+    assert [staff.name for staff in load_active_staff("staff.json")] == ["Alice Tan", "Bob Lim"]
+
+
+def test_missing_file_lists_every_named_row(tmp_path):
+    assert load_active_staff("") is None
+    assert load_active_staff(str(tmp_path / "missing.json")) is None
+
+    values = build_sheet(MONDAY, {"ME4 Alice Tan": ["1"], "ME5 Bob Lim": ["MC"]})
+    active_staff = load_active_staff(str(tmp_path / "missing.json"))
+    sheets = GoogleSheetsService(active_staff=active_staff, service=StaticSheetsClient(values))
+    assert [staff.name for staff in sheets.get_staff_list(MONDAY)] == ["Alice Tan", "Bob Lim"]
@@ -0,0 +1,117 @@
+"""Tests for the bitset status index behind /who and /whereis."""
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.history import StatusHistory
+from app.models.staff import StatusType
+from app.services.status_index import StatusIndex
+
+MONDAY = date(2025, 1, 6)
+DATES = [MONDAY + timedelta(days=offset) for offset in range(5)]
+
+P, OL, MC, CSE = StatusType.PRESENT, StatusType.OL, StatusType.MC, StatusType.CSE
+
+
+def history(*days):
+    """Build a history from one (AM, PM) pair of (status type, location) per day from Monday."""
+    slots = []
+    for day, (am, pm) in zip(DATES, days):
+        slots.append((day, "AM", *am))
+        slots.append((day, "PM", *pm))
+    return StatusHistory.from_slots(slots)
+
+
+def every_day(status_type, location=None):
+    return [((status_type, location), (status_type, location))] * len(DATES)
+
+
+def histories():
+    return {
+        "Alice": history(((P, None), (P, None)), *every_day(OL, "JAPAN")[:4]),
+        "Bob": history(*every_day(MC)[:2], *every_day(P)[:3]),
+        "Carl": history(*every_day(OL, "KOREA")),
+        "Dan": history(((P, None), (CSE, None)), *every_day(P)[:4]),
+    }
+
+
+@pytest.fixture
+def index():
+    index = StatusIndex()
+    assert index.update(DATES, histories()) == 4
+    return index
+
+
+def test_slot_mask(index):
+    assert index.slot_mask(DATES[1], DATES[2]) == 0b1111 << 2
+    assert index.slot_mask(DATES[1], DATES[2], "AM") == 0b0101 << 2
+    assert index.slot_mask(DATES[1], DATES[2], "PM") == 0b1010 << 2
+    assert index.slot_mask(MONDAY - timedelta(days=7), MONDAY - timedelta(days=1)) == 0
+    # Days beyond the sheet are clipped
+    assert index.slot_mask(DATES[3], DATES[3] + timedelta(days=30)) == 0b1111 << 6
+
+
+def test_who_over_a_range(index):
+    found = index.who(OL, MONDAY, DATES[1])
+    assert [name for name, _ in found] == ["Alice", "Carl"]
+    alice_segments = found[0][1]
+    assert [(segment.location, segment.start, segment.end) for segment in alice_segments] == [
+        ("JAPAN", DATES[1], DATES[4])
+    ]
+    assert [name for name, _ in index.who(OL, MONDAY, MONDAY)] == ["Carl"]
+    assert [name for name, _ in index.who(MC, DATES[2], DATES[4])] == []
+
+
+def test_who_by_location(index):
+    assert [name for name, _ in index.who(OL, MONDAY, DATES[4], location="jap")] == ["Alice"]
+    assert index.keys(OL, "kor") == [(OL, "KOREA")]
+    assert index.who(OL, MONDAY, DATES[4], location="china") == []
+
+
+def test_who_by_period(index):
+    assert [name for name, _ in index.who(CSE, MONDAY, MONDAY, period="PM")] == ["Dan"]
+    assert index.who(CSE, MONDAY, MONDAY, period="AM") == []
+
+
+def test_where(index):
+    am, pm = index.where("Dan", MONDAY)
+    assert (am.status_type, pm.status_type) == (P, CSE)
+    assert index.where("Dan", MONDAY + timedelta(days=30)) == (None, None)
+    assert index.where("Nobody", MONDAY) == (None, None)
+
+
+def test_covers(index):
+    assert index.covers(MONDAY, DATES[4])
+    assert not index.covers(MONDAY - timedelta(days=1), DATES[4])
+    assert not index.covers(DATES[4], DATES[4] + timedelta(days=1))
+    assert not StatusIndex().covers(MONDAY, MONDAY)
+
+
+def test_rebuilt_histories_with_equal_segments_are_not_reindexed(index):
+    assert index.update(DATES, histories()) == 0
+
+    changed = histories()
+    changed["Bob"] = history(*every_day(MC)[:3], *every_day(P)[:2])
+    assert index.update(DATES, changed) == 1
+    assert index.who(MC, DATES[2], DATES[2])[0][0] == "Bob"
+
+
+def test_removed_staff_free_their_bit_and_keys(index):
+    carl_bit = index.staff["Carl"]
+    remaining = {name: value for name, value in histories().items() if name != "Carl"}
+    assert index.update(DATES, remaining) == 1
+    assert index.keys(OL, "korea") == []
+    assert [name for name, _ in index.who(OL, MONDAY, DATES[4])] == ["Alice"]
+
+    # A new staff member takes the freed bit, results stay in parade order
+    with_eve = {"Eve": history(*every_day(OL, "KOREA")), **remaining}
+    assert index.update(DATES, with_eve) == 1
+    assert index.staff["Eve"] == carl_bit
+    assert [name for name, _ in index.who(OL, MONDAY, DATES[4])] == ["Eve", "Alice"]
+
+
+def test_new_dates_rebuild_the_index(index):
+    shifted = [day + timedelta(days=7) for day in DATES]
+    assert index.update(shifted, histories()) == 4
+    assert index.dates == tuple(shifted)
+    assert len(index) == 4
@@ -0,0 +1,82 @@
+"""Tests for reading the DI list from Telegram."""
+import asyncio
+from datetime import date
+
+from telegram import Update
+
+from app.services.telegram_service import TelegramService
+from benchmarks.stubs import StubBot
+
+DI_LIST = "/DI LIST\n20/10/2026: ME3 Edmund Cheong\n21/10/2026: ME4 Gin Tay"
+
+
+class HistoryBot(StubBot):
+    """Bot whose recent updates hold chat messages."""
+
+    def __init__(self, texts):
+        super().__init__()
+        self.texts = texts
+        self.get_updates_calls = 0
+
+    async def get_updates(self, **kwargs) -> list:
+        self.get_updates_calls += 1
+        return [
+            Update.de_json(
+                {
+                    "update_id": update_id,
+                    "message": {"message_id": update_id, "date": 0, "chat": {"id": -1, "type": "group"}, "text": text},
+                },
+                None,
+            )
+            for update_id, text in enumerate(self.texts, 1)
+        ]
+
+
+def test_di_list_from_chat_history():
+    telegram = TelegramService(token="0:test", chat_id="-1", bot=HistoryBot(["hello", DI_LIST]))
+    schedule = asyncio.run(telegram.fetch_di_list())
+    assert schedule.get_di_for_date(date(2026, 10, 20)).name == "Edmund Cheong"
+    assert telegram.cached_duty_schedule is schedule
+
+
+def test_di_list_from_incoming_updates_skips_get_updates():
+    bot = HistoryBot([])
+    telegram = TelegramService(token="0:test", chat_id="-1", bot=bot)
+    telegram.receives_updates = True
+    update = Update.de_json(
+        {"update_id": 1, "message": {"message_id": 1, "date": 0, "chat": {"id": -1, "type": "group"}, "text": DI_LIST}},
+        None,
+    )
+
+    async def run():
+        await telegram.handle_di_message(update, None)
+        return await telegram.fetch_di_list()
+
+    schedule = asyncio.run(run())
+    assert schedule.get_di_for_date(date(2026, 10, 21)).rank == "ME4"
+    assert bot.get_updates_calls == 0
+
+
+def test_other_messages_keep_the_cached_di_list():
+    telegram = TelegramService(token="0:test", chat_id="-1", bot=StubBot())
+    assert telegram.remember_di_list(DI_LIST)
+    assert not telegram.remember_di_list("/draft")
+    assert len(telegram.cached_duty_schedule.schedule) == 2
+
+
+def test_di_list_survives_a_restart(isolated_settings):
+    telegram = TelegramService(token="0:test", chat_id="-1", bot=StubBot())
+    telegram.receives_updates = True
+    assert telegram.remember_di_list(DI_LIST)
+
+    restarted = TelegramService(token="0:test", chat_id="-1", bot=StubBot())
+    restarted.receives_updates = True
+    schedule = asyncio.run(restarted.fetch_di_list())
+    assert schedule.get_di_for_date(date(2026, 10, 20)).name == "Edmund Cheong"
+
+
+def test_di_list_is_not_saved_when_disabled(isolated_settings, monkeypatch, tmp_path):
+    monkeypatch.setattr(isolated_settings, "di_list_path", "")
+    assert TelegramService(token="0:test", chat_id="-1", bot=StubBot()).remember_di_list(DI_LIST)
+    assert len(TelegramService(token="0:test", chat_id="-1", bot=StubBot()).cached_duty_schedule.schedule) == 0
+    assert not (tmp_path / "di_list.txt").exists()
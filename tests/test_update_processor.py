@@ -0,0 +1,94 @@
+"""Tests for per-chat ordering and admission control of incoming updates."""
+import asyncio
+
+from telegram import Update
+
+from app.services.update_processor import ChatOrderedUpdateProcessor
+
+
+def chat_update(update_id: int, chat_id: int) -> Update:
+    return Update.de_json(
+        {
+            "update_id": update_id,
+            "message": {"message_id": update_id, "date": 0, "chat": {"id": chat_id, "type": "group"}, "text": "/help"},
+        },
+        None,
+    )
+
+
+def test_updates_from_one_chat_run_in_order():
+    processor = ChatOrderedUpdateProcessor(workers=4, max_in_flight=8)
+    order = []
+
+    async def handle(name: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+        order.append(name)
+
+    async def run():
+        await asyncio.gather(
+            processor.process_update(chat_update(1, 1), handle("first", 0.05)),
+            processor.process_update(chat_update(2, 1), handle("second", 0)),
+            processor.process_update(chat_update(3, 1), handle("third", 0.01)),
+        )
+
+    asyncio.run(run())
+    assert order == ["first", "second", "third"]
+    assert processor.in_flight == 0
+    assert processor._chat_tails == {}
+
+
+def test_chats_run_concurrently():
+    processor = ChatOrderedUpdateProcessor(workers=2, max_in_flight=4)
+
+    async def run():
+        other_chat_ran = asyncio.Event()
+
+        async def wait_for_other_chat() -> None:
+            await other_chat_ran.wait()
+
+        async def set_event() -> None:
+            other_chat_ran.set()
+
+        # Deadlocks (and times out) if chat 1 held up chat 2
+        await asyncio.wait_for(
+            asyncio.gather(
+                processor.process_update(chat_update(1, 1), wait_for_other_chat()),
+                processor.process_update(chat_update(2, 2), set_event()),
+            ),
+            1,
+        )
+
+    asyncio.run(run())
+    assert processor.peak_in_flight == 2
+
+
+def test_updates_beyond_max_in_flight_are_rejected():
+    rejected = []
+
+    async def on_reject(update: object) -> None:
+        rejected.append(update.update_id)
+
+    processor = ChatOrderedUpdateProcessor(workers=1, max_in_flight=2, on_reject=on_reject)
+    ran = []
+
+    async def run():
+        release = asyncio.Event()
+
+        async def handle(update_id: int) -> None:
+            await release.wait()
+            ran.append(update_id)
+
+        tasks = [
+            asyncio.create_task(processor.process_update(chat_update(update_id, update_id), handle(update_id)))
+            for update_id in (1, 2, 3)
+        ]
+        await asyncio.sleep(0.01)
+        assert processor.running == 1 and processor.waiting == 1
+        release.set()
+        await asyncio.gather(*tasks)
+        await processor.shutdown()
+
+    asyncio.run(run())
+    assert sorted(ran) == [1, 2]
+    assert rejected == [3]
+    assert processor.rejected == 1
@@ -0,0 +1,20 @@
+"""Tests for the working-day calendar built from the PH days of the sheet."""
+from datetime import date
+
+from app.services.google_sheets import GoogleSheetsService
+from benchmarks.stubs import StaticSheetsClient
+from conftest import build_sheet
+
+
+def test_calendar_follows_sheet_edits():
+    # Mon 06/01 - Wed 08/01 2025
+    values = build_sheet(date(2025, 1, 6), {"ME4 Alice Tan": ["1", "PH", "1"], "ME5 Bob Lim": ["1", "PH", ""]})
+    sheets = GoogleSheetsService(active_staff=None, service=StaticSheetsClient(values))
+
+    calendar = sheets.refresh_work_calendar(sheets.get_sheet_data())
+    assert calendar.holidays == {date(2025, 1, 7)}
+    assert sheets.refresh_work_calendar(sheets.get_sheet_data()) is calendar
+
+    for row in values[5:]:
+        row[5] = row[6] = "PH"
+    assert sheets.refresh_work_calendar(sheets.get_sheet_data()).holidays == {date(2025, 1, 7), date(2025, 1, 8)}